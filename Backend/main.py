@@ -1,6 +1,4 @@
 import os
-import sys
-import importlib.util
 import glob
 import queue
 
@@ -12,7 +10,17 @@ os.environ["QT_QPA_PLATFORM"] = "windows"
 
 _cleaned_up = False
 
+from PyQt6.QtCore import QEventLoop
 from ui import main_window
+from utils.animation import get_animator
+from utils.bridge_metrics import get_bridge_metrics
+from utils.camera_controller import get_camera_controller
+from utils.contacts import get_contact_system
+from utils.frame_scheduler import get_frame_scheduler
+from utils.rpc import get_rpc_server
+from utils.script_host import get_script_host
+from utils.spatial_index import get_spatial_index
+from utils.transform_coalescer import get_transform_coalescer
 
 msg_queue = queue.Queue()
 
@@ -44,27 +52,48 @@ def cleanup_blockly_files():
     except Exception as e:
         print(f"清理Blockly文件时出错: {str(e)}")
 
+_frame_scheduler_ready = False
+
+def setup_frame_scheduler():
+    global _frame_scheduler_ready
+    frame_scheduler = get_frame_scheduler()
+    if _frame_scheduler_ready:
+        return frame_scheduler
+
+    script_host = get_script_host()
+    frame_scheduler.process_events = lambda max_ms: main_window.app.processEvents(
+        QEventLoop.ProcessEventsFlag.AllEvents, max_ms)
+    frame_scheduler.is_minimized = main_window.window.isMinimized
+    frame_scheduler.has_active_scripts = script_host.has_active_scripts
+    frame_scheduler.add_update(script_host.tick)
+    camera_controller = get_camera_controller()
+    animator = get_animator()
+    frame_scheduler.add_update(camera_controller.update)
+    frame_scheduler.add_update(animator.update)
+    frame_scheduler.add_frame_end(animator.flush)
+    frame_scheduler.add_frame_end(get_transform_coalescer().flush)
+    frame_scheduler.add_frame_end(get_spatial_index().sync)
+    frame_scheduler.add_frame_end(get_contact_system().update)
+    frame_scheduler.add_frame_end(camera_controller.flush)
+    frame_scheduler.add_frame_end(get_rpc_server().pump)
+    frame_scheduler.add_frame_end(get_bridge_metrics().maybe_dump)
+    _frame_scheduler_ready = True
+    return frame_scheduler
+
 def run(isReload):
     global _cleaned_up
     if not _cleaned_up:
         cleanup_blockly_files()
 
+    frame_scheduler = setup_frame_scheduler()
     if(isReload):
-        for module_name in list(sys.modules.keys()):
-            if 'runScript' in module_name or 'script' in module_name:
-                del sys.modules[module_name]
+        get_script_host().reload()
         print("python hotfix")
-    runscript_spec = importlib.util.find_spec("runScript")
-    if runscript_spec is not None:
-        runScript = importlib.util.module_from_spec(runscript_spec)
-        runscript_spec.loader.exec_module(runScript)
-        runScript.run()
+    frame_scheduler.run_once()
 
     if not msg_queue.empty():
         print(msg_queue.get())
 
-    main_window.app.processEvents()
-
 
 def put_queue(msg):
     msg_queue.put(msg)
@@ -72,10 +101,4 @@ def put_queue(msg):
 if __name__ == '__main__':
      print('python main')
      cleanup_blockly_files()
-     while(True):
-        runscript_spec = importlib.util.find_spec("runScript")
-        if runscript_spec is not None:
-            runScript = importlib.util.module_from_spec(runscript_spec)
-            runscript_spec.loader.exec_module(runScript)
-            runScript.run()
-        main_window.app.processEvents()
+     setup_frame_scheduler().run_forever()
@@ -33,16 +33,11 @@ app = FastMCP(
 )
 
 def call_actor_operation(scene_name: str, actor_name: str, operation: str, x: float, y: float, z: float):
-    data = json.dumps({
-        "sceneName": scene_name,
-        "actorName": actor_name,
-        "Operation": operation,
-        "x": x,
-        "y": y,
-        "z": z
-    })
-    qt_bridge.Actor_Operation(data)
-    return f"Sent {operation}({x}, {y}, {z}) to actor '{actor_name}' in scene '{scene_name}'"
+    if operation not in qt_bridge.PACKED_OPERATIONS:
+        raise ValueError(f"Unknown operation '{operation}'")
+    actor = qt_bridge.scenes.require(scene_name, actor_name)
+    qt_bridge.actor_operation_handles([actor.handle, qt_bridge.PACKED_OPERATIONS.index(operation), x, y, z])
+    return f"Sent {operation}({x}, {y}, {z}) to actor '{actor_name}' (handle {actor.handle}) in scene '{scene_name}'"
 
 @app.tool()
 async def transform_actor(actor_name: str, operation: str, x: float, y: float, z: float, scene_name: str="scene1") -> str:
@@ -68,23 +63,41 @@ async def transform_actor(actor_name: str, operation: str, x: float, y: float, z
 @app.tool()
 async def list_actors(scene_name: str) -> str:
     """
-    List all actor names in a specific scene.
+    List all actors (handle, name, path, tags) in a specific scene.
 
     Args:
         scene_name: Name of the scene
     """
     try:
                                         
-        actor_list = []
-        if scene_name in QtWindow.scene_dict:
-            actor_dict = QtWindow.scene_dict[scene_name]['actor_dict']
-            for actorname in actor_dict:
-                actor_list.append(actorname)
+        actor_list = [actor.info() for actor in qt_bridge.scenes.actors(scene_name)]
         return json.dumps({"scene": scene_name, "actors": actor_list}, indent=2)
     except Exception as e:
         logger.error(f"Error listing actors: {str(e)}")
         return f"Error listing actors: {str(e)}"
 
+
+@app.tool()
+async def find_actors(path: str = "", tag: str = "") -> str:
+    """
+    Find actors in any scene by asset path or by tag.
+
+    Args:
+        path: Asset path the actors were created from
+        tag: Tag the actors carry
+    """
+    try:
+        if path:
+            actors = qt_bridge.scenes.find_by_path(path)
+        elif tag:
+            actors = qt_bridge.scenes.find_by_tag(tag)
+        else:
+            return "Error finding actors: give a path or a tag"
+        return json.dumps([dict(actor.info(), scene=actor.scene.name) for actor in actors], indent=2)
+    except Exception as e:
+        logger.error(f"Error finding actors: {str(e)}")
+        return f"Error finding actors: {str(e)}"
+
 def main():
     app.run()
 
@@ -1,11 +1,9 @@
-import json
-
 from PyQt6.QtCore import Qt, QPoint, QUrl
 from PyQt6.QtGui import QColor, QGuiApplication
 from PyQt6.QtWebChannel import QWebChannel
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from ui.dock_widget import RouteDockWidget, DockCleanupWidget
-from utils.bridge import get_bridge
+from utils.bridge import DockBridge, get_bridge
 from utils.central_manager import CentralManager
 
 
@@ -32,6 +30,9 @@ class BrowserWidget(QWebEngineView):
         self.channel = QWebChannel()
         self.bridge = get_bridge(self.central_manager)
         self.channel.registerObject("pybridge", self.bridge)
+        # The main page gets its own facade too, so RPC replies reach only this page.
+        self.dock_bridge = DockBridge("main", self.bridge.dock_router, parent=self)
+        self.channel.registerObject("dockbridge", self.dock_bridge)
         self.page().setWebChannel(self.channel)
 
     def connect_signals(self):
@@ -105,15 +106,6 @@ class BrowserWidget(QWebEngineView):
     def handle_command_to_main(self, command_name, command_data):
         if command_name == "go_home":
             self.load(self.url)
-            return
-
-        if command_name == "input_event":
-            try:
-                _ = json.loads(command_data) if isinstance(command_data, str) else command_data
-            except Exception:
-                pass
-            return
-        return
 
     def closeEvent(self, event):
         try:
@@ -134,8 +126,10 @@ class BrowserWidget(QWebEngineView):
             try:
                 if hasattr(self, "channel") and self.channel:
                     self.channel.deregisterObject(self.bridge)
+                    self.channel.deregisterObject(self.dock_bridge)
             except Exception:
                 pass
+            self.dock_bridge.close()
             try:
                 if self.page():
                     self.page().setWebChannel(None)
@@ -4,11 +4,13 @@ from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor
 from PyQt6.QtWebChannel import QWebChannel
 from PyQt6.QtWidgets import QDockWidget, QWidget
-from utils.bridge import get_bridge
+from utils.bridge import DockBridge, get_bridge
 from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage, QWebEngineSettings
 
 
 class RouteDockWidget(QDockWidget):
+    DOCK_CONTROL_EVENTS = ("drag", "close", "float", "resize")
+
     def __init__(self, browser, name: str, path: str, CentralManager, Main_Window, isFloat: bool):
         super(RouteDockWidget, self).__init__(name, Main_Window)
         self.Main_Window = Main_Window
@@ -106,6 +108,8 @@ class RouteDockWidget(QDockWidget):
         self.channel = QWebChannel()
         self.bridge = get_bridge(self.centralmanager)
         self.channel.registerObject("pybridge", self.bridge)
+        self.dock_bridge = DockBridge(self.name, self.bridge.dock_router, parent=self)
+        self.channel.registerObject("dockbridge", self.dock_bridge)
                                                         
         try:
             self.browser.page().setWebChannel(self.channel)
@@ -114,23 +118,12 @@ class RouteDockWidget(QDockWidget):
         self.centralmanager.register_dock(self.name, self)
 
     def connect_signals(self) -> None:
-        self.bridge.ai_response.connect(self.send_ai_message_to_js)
-        self.bridge.dock_event.connect(self.dock_event)
+        for event_type in self.DOCK_CONTROL_EVENTS:
+            self.bridge.dock_router.subscribe(self.name, event_type, self.dock_event, parsed=True)
         self.topLevelChanged.connect(self.handle_top_level_change)
         self.destroyed.connect(self.cleanup_resources)
 
-    def dock_event(self, event_type: str, event_data: str) -> None:
-                                           
-        target_ok = True
-        try:
-            data_obj = json.loads(event_data) if isinstance(event_data, str) else (event_data or {})
-            target = data_obj.get("routename")
-            if target is not None and target != self.name:
-                return
-        except Exception:
-                                     
-            return
-
+    def dock_event(self, event_type: str, event_data: str, data_obj) -> None:
         if event_type == "drag" and self.isFloating():
             try:
                 data = data_obj if isinstance(data_obj, dict) else {}
@@ -180,40 +173,24 @@ class RouteDockWidget(QDockWidget):
                 self.browser.update()
 
     def send_message_to_dock(self, json_data: str) -> None:
-        self.bridge.dock_event.emit("dockData", json_data)
+        self.bridge.dock_router.publish("dockData", json_data, routename=self.name)
 
     def send_message_to_main(self, json_data: str) -> None:
-        self.bridge.dock_event.emit("mainData", json_data)
-
-    def send_ai_message_to_js(self, message: str) -> None:
-        try:
-            if not isinstance(message, str):
-                message = str(message)
-            try:
-                json.loads(message)
-                js_code = f"window.receiveAIMessage({message})"
-            except:
-                js_code = f"window.receiveAIMessage({json.dumps({'content': message})})"
-
-            QTimer.singleShot(0, lambda: self.browser.page().runJavaScript(js_code))
-        except Exception as e:
-            print(f"发送消息到JS失败: {str(e)}")
+        self.bridge.dock_router.publish("mainData", json_data)
 
     def cleanup_resources(self) -> None:
         try:
                                                                           
             try:
-                self.bridge.ai_response.disconnect(self.send_ai_message_to_js)
-            except Exception:
-                pass
-            try:
-                self.bridge.dock_event.disconnect(self.dock_event)
+                self.dock_bridge.close()
+                self.bridge.dock_router.unsubscribe(self.name, callback=self.dock_event)
             except Exception:
                 pass
                                                          
             try:
                 if hasattr(self, "channel") and self.channel:
                     self.channel.deregisterObject(self.bridge)
+                    self.channel.deregisterObject(self.dock_bridge)
             except Exception:
                 pass
             try:
@@ -8,7 +8,8 @@ from PyQt6.QtWidgets import QMainWindow, QApplication, QDockWidget
 from ui.browser_widget import BrowserWidget
 from ui.custom_window import CustomWindow
 from ui.render_widget import RenderWidget
-from utils.static_components import scene_dict, url
+from utils.scene_registry import get_scene_registry
+from utils.static_components import url
 
 
 class MainWindow(QMainWindow):
@@ -20,7 +21,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("CoronaEngine")
         self.configure_web_engine()
 
-        self.render_widget = RenderWidget(self, scene_dict)
+        self.render_widget = RenderWidget(self, get_scene_registry())
         self.setCentralWidget(self.render_widget)
 
         self.osd = CustomWindow(self)
@@ -1,5 +1,5 @@
 import os
-from typing import Any, Dict, Optional
+from typing import Optional
 
 from PyQt6.QtCore import QRect, pyqtSignal
 from PyQt6.QtGui import QPainter, QPixmap
@@ -9,7 +9,7 @@ from PyQt6.QtWidgets import QWidget
 class RenderWidget(QWidget):
     geometry_changed = pyqtSignal(QRect)
 
-    def __init__(self, Main_Window, scene_dict: Dict[str, Dict[str, Any]]):
+    def __init__(self, Main_Window, scenes):
         super(RenderWidget, self).__init__()
         self.Main_Window = Main_Window
 
@@ -29,10 +29,7 @@ class RenderWidget(QWidget):
             [10.0, 10.0, 0.0], [-1.0, -1.0, -1.0], [0.0, 1.0, 0.0], 45.0
         )
         print(self.mainscene)
-        scene_dict["mainscene"]={
-            "scene":self.mainscene,
-            "actor_dict":{}
-        }
+        scenes.add_scene("mainscene", self.mainscene)
 
         self.image_path = os.path.join(os.path.dirname(__file__), "background.png")
         self.pixmap: Optional[QPixmap] = None
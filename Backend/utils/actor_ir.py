@@ -0,0 +1,546 @@
+import ast
+import builtins
+import traceback
+
+import numpy as np
+
+from utils.script_optimizer import ENGINE_NAME, WAIT_UNTIL_NAME, optimize_module
+
+OP_END = 0
+OP_YIELD = 1
+OP_WAIT = 2        # a0 = seconds
+OP_WAIT_UNTIL = 3  # a0 = condition
+OP_ADD = 4         # a0 = axis, a1 = amount
+OP_SET = 5         # a0 = axis, a1 = value
+OP_MOVE_TO = 6     # a0..a2 = position
+OP_GLIDE = 7       # a0 = seconds, a1..a3 = target position
+OP_ROTATE = 8      # a0 = axis, a1 = degrees
+OP_JUMP = 9        # a0 = target
+OP_BRANCH = 10     # a0 = condition, a1 = target when the condition is false
+OP_LOOP_INIT = 11  # a0 = register, a1 = count
+OP_LOOP_NEXT = 12  # a0 = register, a1 = loop start
+OP_BROADCAST = 13  # a0 = message
+
+OP_NAMES = {value: name[3:] for name, value in globals().items() if name.startswith("OP_")}
+
+_AXES = {"X": 0, "Y": 1, "Z": 2}
+_SCRIPT_MODULES = {ENGINE_NAME, "corona_engine_fallback", "utils.script_scheduler", "utils.animation"}
+_CONDITION_NODES = (ast.expr_context, ast.operator, ast.unaryop, ast.cmpop, ast.boolop, ast.Attribute, ast.Call,
+                    ast.Constant, ast.BoolOp, ast.UnaryOp, ast.Compare, ast.BinOp, ast.List, ast.Tuple, ast.keyword)
+
+
+class IRUnsupported(Exception):
+    pass
+
+
+class IRProgram:
+    """A compiled actor program: one opcode per instruction plus four float operands."""
+
+    __slots__ = ("ops", "args", "conditions", "messages", "registers")
+
+    def __init__(self, ops, args, conditions, messages, registers):
+        self.ops = ops
+        self.args = args
+        self.conditions = conditions
+        self.messages = messages
+        self.registers = registers
+
+    def __len__(self):
+        return len(self.ops)
+
+    def dump(self) -> str:
+        lines = []
+        for pc, (op, args) in enumerate(zip(self.ops, self.args)):
+            lines.append(f"{pc:4d} {OP_NAMES[int(op)]:<10} {' '.join(f'{a:g}' for a in args)}")
+        return "\n".join(lines)
+
+
+def _number(node) -> float:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return float(node.value)
+    raise IRUnsupported(f"non-constant operand {ast.dump(node)}")
+
+
+def _numbers(args, count):
+    if len(args) == 1 and isinstance(args[0], (ast.List, ast.Tuple)):
+        args = args[0].elts
+    if len(args) != count:
+        raise IRUnsupported(f"expected {count} operands")
+    return [_number(arg) for arg in args]
+
+
+class _IRBuilder:
+    def __init__(self):
+        self.code = []
+        self.conditions = []
+        self.messages = []
+        self.depth = 0
+        self.registers = 0
+
+    def emit(self, op, *args) -> int:
+        self.code.append([op, *args, *([0.0] * (4 - len(args)))])
+        return len(self.code) - 1
+
+    def patch(self, index, slot, value) -> None:
+        self.code[index][slot + 1] = value
+
+    def condition(self, node) -> int:
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name):
+                if child.id != ENGINE_NAME:
+                    raise IRUnsupported(f"condition reads {child.id}")
+            elif not isinstance(child, _CONDITION_NODES):
+                raise IRUnsupported(f"condition uses {type(child).__name__}")
+        lam = ast.Lambda(
+            args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=node,
+        )
+        expression = ast.fix_missing_locations(ast.Expression(ast.copy_location(lam, node)))
+        self.conditions.append(compile(expression, "<blockly:condition>", "eval"))
+        return len(self.conditions) - 1
+
+    def block(self, stmts) -> None:
+        for stmt in stmts:
+            self.statement(stmt)
+
+    def statement(self, stmt) -> None:
+        if isinstance(stmt, ast.Pass):
+            return
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Yield):
+            self.suspend(stmt.value.value)
+        elif isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+            self.engine_call(stmt.value)
+        elif isinstance(stmt, ast.While):
+            self.while_loop(stmt)
+        elif isinstance(stmt, ast.For):
+            self.repeat(stmt)
+        elif isinstance(stmt, ast.If):
+            self.branch(stmt)
+        else:
+            raise IRUnsupported(f"statement {type(stmt).__name__}")
+
+    def suspend(self, value) -> None:
+        if value is None:
+            self.emit(OP_YIELD)
+            return
+        if not (isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.args):
+            raise IRUnsupported("yield of an unknown request")
+        name = value.func.id
+        if name == "glide":
+            self.emit(OP_GLIDE, *_numbers(value.args, 4))
+        elif len(value.args) != 1:
+            raise IRUnsupported(f"yield {name}() with {len(value.args)} arguments")
+        elif name == "wait":
+            self.emit(OP_WAIT, _number(value.args[0]))
+        elif name in ("wait_until", WAIT_UNTIL_NAME) and isinstance(value.args[0], ast.Lambda):
+            self.emit(OP_WAIT_UNTIL, self.condition(value.args[0].body))
+        else:
+            raise IRUnsupported(f"yield {name}()")
+
+    def engine_call(self, call) -> None:
+        func = call.func
+        if call.keywords or not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                                 and func.value.id == ENGINE_NAME):
+            raise IRUnsupported("call outside the engine API")
+        method, args = func.attr, call.args
+        if method in ("Xadd", "Yadd", "Zadd"):
+            self.emit(OP_ADD, _AXES[method[0]], *_numbers(args, 1))
+        elif method in ("Xset", "Yset", "Zset"):
+            self.emit(OP_SET, _AXES[method[0]], *_numbers(args, 1))
+        elif method == "movetoXYZ":
+            self.emit(OP_MOVE_TO, *_numbers(args, 3))
+        elif method == "movetoXYZtime":
+            self.emit(OP_GLIDE, *_numbers(args, 4))
+        elif method in ("rotateX", "rotateY"):
+            self.emit(OP_ROTATE, _AXES[method[-1]], *_numbers(args, 1))
+        elif method == "broadcast" and len(args) == 1 and isinstance(args[0], ast.Constant):
+            self.messages.append(str(args[0].value))
+            self.emit(OP_BROADCAST, len(self.messages) - 1)
+        else:
+            raise IRUnsupported(f"{ENGINE_NAME}.{method}")
+
+    def while_loop(self, stmt) -> None:
+        if stmt.orelse:
+            raise IRUnsupported("while/else")
+        if isinstance(stmt.test, ast.Constant):
+            if not stmt.test.value:
+                return
+            start = len(self.code)
+            self.block(stmt.body)
+            self.emit(OP_JUMP, start)
+            return
+        start = self.emit(OP_BRANCH, self.condition(stmt.test), 0)
+        self.block(stmt.body)
+        self.emit(OP_JUMP, start)
+        self.patch(start, 1, len(self.code))
+
+    def repeat(self, stmt) -> None:
+        it = stmt.iter
+        if (stmt.orelse or not isinstance(stmt.target, ast.Name)
+                or not (isinstance(it, ast.Call) and isinstance(it.func, ast.Name) and it.func.id == "range"
+                        and len(it.args) == 1 and not it.keywords)):
+            raise IRUnsupported("for loop other than repeat N")
+        if any(isinstance(n, ast.Name) and n.id == stmt.target.id for s in stmt.body for n in ast.walk(s)):
+            raise IRUnsupported("loop body reads the loop variable")
+        count = int(_number(it.args[0]))
+        if count <= 0:
+            return
+        register = self.depth
+        self.depth += 1
+        self.registers = max(self.registers, self.depth)
+        self.emit(OP_LOOP_INIT, register, count)
+        start = len(self.code)
+        self.block(stmt.body)
+        self.emit(OP_LOOP_NEXT, register, start)
+        self.depth -= 1
+
+    def branch(self, stmt) -> None:
+        test = self.emit(OP_BRANCH, self.condition(stmt.test), 0)
+        self.block(stmt.body)
+        if stmt.orelse:
+            skip = self.emit(OP_JUMP, 0)
+            self.patch(test, 1, len(self.code))
+            self.block(stmt.orelse)
+            self.patch(skip, 0, len(self.code))
+        else:
+            self.patch(test, 1, len(self.code))
+
+    def program(self) -> IRProgram:
+        code = np.array(self.code, dtype=np.float64).reshape(-1, 5)
+        return IRProgram(code[:, 0].astype(np.int16), np.ascontiguousarray(code[:, 1:]),
+                         self.conditions, self.messages, self.registers)
+
+
+def _entry_point(tree: ast.Module):
+    entry = None
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+            continue
+        if isinstance(stmt, (ast.Import, ast.ImportFrom, ast.Try)):
+            for node in ast.walk(stmt):
+                if isinstance(node, ast.Import) and all(a.name in _SCRIPT_MODULES for a in node.names):
+                    continue
+                if isinstance(node, ast.ImportFrom) and node.module in _SCRIPT_MODULES:
+                    continue
+                if isinstance(node, (ast.Import, ast.ImportFrom)):
+                    raise IRUnsupported("imports outside the script API")
+                if isinstance(node, ast.stmt) and not isinstance(node, ast.Try):
+                    raise IRUnsupported("module-level code")
+            continue
+        if isinstance(stmt, ast.FunctionDef) and entry is None and not stmt.decorator_list:
+            params = [arg.arg for arg in stmt.args.args]
+            if (stmt.name, params) in (("run", []), ("update", ["dt"])):
+                entry = stmt
+                continue
+        raise IRUnsupported(f"module-level {type(stmt).__name__}")
+    if entry is None:
+        raise IRUnsupported("no run()/update(dt)")
+    return entry
+
+
+def build_ir(tree: ast.Module) -> IRProgram:
+    """Compile an (optimized) Blockly script tree to IR; raises IRUnsupported for anything outside it."""
+    entry = _entry_point(tree)
+    builder = _IRBuilder()
+    if entry.name == "update":
+        if any(isinstance(n, ast.Name) and n.id == "dt" for n in ast.walk(entry)):
+            raise IRUnsupported("update() reads dt")
+        builder.block(entry.body)
+        builder.emit(OP_YIELD)
+        builder.emit(OP_JUMP, 0)
+    else:
+        builder.block(entry.body)
+        builder.emit(OP_END)
+    return builder.program()
+
+
+def compile_ir(source: str, filename: str = "<blockly>") -> IRProgram | None:
+    """IR for a generated Blockly script, or None if it needs the Python codegen fallback."""
+    try:
+        return build_ir(optimize_module(ast.parse(source, filename), bind_engine=False))
+    except IRUnsupported:
+        return None
+
+
+def _engine_namespace() -> dict:
+    try:
+        import CoronaEngine
+    except ImportError:
+        from corona_engine_fallback import CoronaEngine
+    return {ENGINE_NAME: CoronaEngine, "__builtins__": builtins}
+
+
+class ActorVM:
+    """Steps every IR actor program together, with actor state held in arrays.
+
+    Transforms are in degrees and reach ``on_transform(key, position, rotation)`` from ``flush()``.
+    Per-tick array overhead makes it slower than plain generators below roughly 1000 actors.
+    """
+
+    def __init__(self, capacity: int = 64, max_ops_per_step: int = 256, namespace: dict | None = None):
+        self.max_ops_per_step = max_ops_per_step
+        self.namespace = namespace
+        self.on_transform = None
+        self.on_broadcast = None
+        self.on_error = None
+        self.time = 0.0
+        self._keys = []
+        self._rows = {}
+        self._free = []
+        self._ops = np.zeros(0, dtype=np.int16)
+        self._args = np.zeros((0, 4), dtype=np.float64)
+        self._conditions = []
+        self._messages = []
+        self._linked = {}
+        self._allocate(capacity, 1)
+
+    def _allocate(self, capacity: int, registers: int) -> None:
+        def grow(name, shape, dtype, fill=0):
+            new = np.full(shape, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                new[tuple(slice(0, n) for n in old.shape)] = old
+            setattr(self, name, new)
+
+        grow("alive", capacity, bool)
+        grow("done", capacity, bool, True)
+        grow("dirty", capacity, bool)
+        grow("pc", capacity, np.int64)
+        grow("wake", capacity, np.float64)
+        grow("waiting", capacity, np.int64, -1)
+        grow("gliding", capacity, bool)
+        grow("glide_start", capacity, np.float64)
+        grow("glide_time", capacity, np.float64, 1.0)
+        grow("glide_from", (capacity, 3), np.float64)
+        grow("glide_to", (capacity, 3), np.float64)
+        grow("positions", (capacity, 3), np.float64)
+        grow("rotations", (capacity, 3), np.float64)
+        grow("registers", (capacity, registers), np.int64)
+
+    def _link(self, program: IRProgram) -> int:
+        linked = self._linked.get(id(program))
+        if linked is not None and linked[0] is program:
+            return linked[1]
+        base, cond_base, msg_base = len(self._ops), len(self._conditions), len(self._messages)
+        args = program.args.copy()
+        ops = program.ops
+        args[ops == OP_JUMP, 0] += base
+        args[ops == OP_BRANCH, 0] += cond_base
+        args[ops == OP_BRANCH, 1] += base
+        args[ops == OP_LOOP_NEXT, 1] += base
+        args[ops == OP_WAIT_UNTIL, 0] += cond_base
+        args[ops == OP_BROADCAST, 0] += msg_base
+        self._ops = np.concatenate([self._ops, ops])
+        self._args = np.concatenate([self._args, args])
+        namespace = self.namespace if self.namespace is not None else _engine_namespace()
+        self._conditions.extend(eval(code, namespace) for code in program.conditions)
+        self._messages.extend(program.messages)
+        if program.registers > self.registers.shape[1]:
+            self._allocate(len(self.alive), program.registers)
+        self._linked[id(program)] = (program, base)
+        return base
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.alive & ~self.done))
+
+    def __contains__(self, key) -> bool:
+        return key in self._rows
+
+    def spawn(self, key, program: IRProgram, position=None, rotation=None) -> int:
+        """Start (or restart) ``program`` for ``key``; an existing actor keeps its transform."""
+        base = self._link(program)
+        row = self._rows.get(key)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+                self._keys[row] = key
+            else:
+                row = len(self._keys)
+                self._keys.append(key)
+                if row >= len(self.alive):
+                    self._allocate(len(self.alive) * 2, self.registers.shape[1])
+            self._rows[key] = row
+            self.positions[row] = 0.0
+            self.rotations[row] = 0.0
+        if position is not None:
+            self.positions[row] = position
+        if rotation is not None:
+            self.rotations[row] = rotation
+        self.alive[row] = True
+        self.done[row] = False
+        self.dirty[row] = True
+        self.pc[row] = base
+        self.wake[row] = 0.0
+        self.waiting[row] = -1
+        self.gliding[row] = False
+        self.registers[row] = 0
+        return row
+
+    def stop(self, key) -> None:
+        row = self._rows.get(key)
+        if row is not None:
+            self.done[row] = True
+            self.gliding[row] = False
+
+    def remove(self, key) -> bool:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        self.alive[row] = False
+        self.done[row] = True
+        self.dirty[row] = False
+        self.gliding[row] = False
+        self._keys[row] = None
+        self._free.append(row)
+        return True
+
+    def clear(self) -> None:
+        for key in list(self._rows):
+            self.remove(key)
+
+    def transform(self, key):
+        row = self._rows[key]
+        return self.positions[row].copy(), self.rotations[row].copy()
+
+    def _fail(self, rows, error, stacktrace) -> None:
+        self.done[rows] = True
+        self.gliding[rows] = False
+        for row in rows:
+            print(f"[ActorVM] 角色 {self._keys[row]} 的脚本出错: {str(error)}")
+            if self.on_error is not None:
+                try:
+                    self.on_error(self._keys[row], error, stacktrace)
+                except Exception:
+                    pass
+
+    def _evaluate(self, indices, rows, cache):
+        result = np.zeros(len(indices), dtype=bool)
+        failed = np.zeros(len(indices), dtype=bool)
+        for index in np.unique(indices):
+            mask = indices == index
+            value = cache.get(index)
+            if value is None:
+                try:
+                    value = bool(self._conditions[index]())
+                except Exception as e:
+                    self._fail(rows[mask], e, traceback.format_exc())
+                    value = cache[index] = Exception
+                else:
+                    cache[index] = value
+            if value is Exception:
+                failed[mask] = True
+            else:
+                result[mask] = value
+        return result, failed
+
+    def _update_glides(self, now: float) -> None:
+        rows = np.flatnonzero(self.gliding)
+        if not rows.size:
+            return
+        frac = np.clip((now - self.glide_start[rows]) / self.glide_time[rows], 0.0, 1.0)
+        start = self.glide_from[rows]
+        self.positions[rows] = start + (self.glide_to[rows] - start) * frac[:, None]
+        self.dirty[rows] = True
+        finished = rows[frac >= 1.0]
+        self.gliding[finished] = False
+        self.pc[finished] += 1
+
+    def step(self, dt: float | None = None) -> int:
+        """Advance every running program by one frame; returns the number of instructions executed."""
+        self.time += 1.0 / 60.0 if dt is None else dt
+        now = self.time
+        self._update_glides(now)
+        cache = {}
+        runnable = self.alive & ~self.done & ~self.gliding & (self.wake <= now)
+        waiting = np.flatnonzero(runnable & (self.waiting >= 0))
+        if waiting.size:
+            ready, failed = self._evaluate(self.waiting[waiting], waiting, cache)
+            runnable[waiting[~ready | failed]] = False
+            resumed = waiting[ready & ~failed]
+            self.waiting[resumed] = -1
+            self.pc[resumed] += 1
+
+        active = np.flatnonzero(runnable)
+        executed = 0
+        for _ in range(self.max_ops_per_step):
+            if not active.size:
+                break
+            executed += active.size
+            pcs = self.pc[active]
+            ops = self._ops[pcs]
+            keep = np.ones(active.size, dtype=bool)
+            for op in np.unique(ops):
+                mask = ops == op
+                rows = active[mask]
+                args = self._args[pcs[mask]]
+                if op == OP_ADD:
+                    self.positions[rows, args[:, 0].astype(np.intp)] += args[:, 1]
+                    self.dirty[rows] = True
+                    self.pc[rows] += 1
+                elif op == OP_SET:
+                    self.positions[rows, args[:, 0].astype(np.intp)] = args[:, 1]
+                    self.dirty[rows] = True
+                    self.pc[rows] += 1
+                elif op == OP_ROTATE:
+                    self.rotations[rows, args[:, 0].astype(np.intp)] += args[:, 1]
+                    self.dirty[rows] = True
+                    self.pc[rows] += 1
+                elif op == OP_MOVE_TO:
+                    self.positions[rows] = args[:, :3]
+                    self.dirty[rows] = True
+                    self.pc[rows] += 1
+                elif op == OP_JUMP:
+                    self.pc[rows] = args[:, 0].astype(np.int64)
+                elif op == OP_LOOP_INIT:
+                    self.registers[rows, args[:, 0].astype(np.intp)] = args[:, 1].astype(np.int64)
+                    self.pc[rows] += 1
+                elif op == OP_LOOP_NEXT:
+                    registers = args[:, 0].astype(np.intp)
+                    self.registers[rows, registers] -= 1
+                    again = self.registers[rows, registers] > 0
+                    self.pc[rows] = np.where(again, args[:, 1].astype(np.int64), self.pc[rows] + 1)
+                elif op == OP_BRANCH:
+                    taken, failed = self._evaluate(args[:, 0].astype(np.intp), rows, cache)
+                    self.pc[rows] = np.where(taken, self.pc[rows] + 1, args[:, 1].astype(np.int64))
+                    keep[np.flatnonzero(mask)[failed]] = False
+                elif op == OP_YIELD:
+                    self.pc[rows] += 1
+                    keep[mask] = False
+                elif op == OP_WAIT:
+                    self.wake[rows] = now + args[:, 0]
+                    self.pc[rows] += 1
+                    keep[mask] = False
+                elif op == OP_WAIT_UNTIL:
+                    self.waiting[rows] = args[:, 0].astype(np.int64)
+                    keep[mask] = False
+                elif op == OP_GLIDE:
+                    self.gliding[rows] = True
+                    self.glide_start[rows] = now
+                    self.glide_time[rows] = np.maximum(args[:, 0], 1e-6)
+                    self.glide_from[rows] = self.positions[rows]
+                    self.glide_to[rows] = args[:, 1:4]
+                    keep[mask] = False
+                elif op == OP_BROADCAST:
+                    for row, message in zip(rows, args[:, 0].astype(np.intp)):
+                        if self.on_broadcast is not None:
+                            self.on_broadcast(self._keys[row], self._messages[message])
+                    self.pc[rows] += 1
+                else:
+                    self.done[rows] = True
+                    keep[mask] = False
+            active = active[keep]
+        return executed
+
+    def flush(self) -> int:
+        """Report changed transforms through ``on_transform`` and clear the dirty flags."""
+        rows = np.flatnonzero(self.dirty & self.alive)
+        if rows.size and self.on_transform is not None:
+            positions = self.positions[rows].tolist()
+            rotations = self.rotations[rows].tolist()
+            for row, position, rotation in zip(rows.tolist(), positions, rotations):
+                try:
+                    self.on_transform(self._keys[row], position, rotation)
+                except Exception as e:
+                    print(f"[ActorVM] 同步角色 {self._keys[row]} 变换失败: {str(e)}")
+        self.dirty[rows] = False
+        return int(rows.size)
@@ -0,0 +1,280 @@
+import sys
+
+import numpy as np
+
+from utils.script_scheduler import wait
+from utils.transform_store import CHANNELS
+
+try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+
+_animator_singleton = None
+
+KINDS = ("actor", "camera", "sun")
+EASINGS = ("linear", "easeIn", "easeOut", "easeInOut", "step")
+LOOPS = ("once", "repeat", "pingpong")
+WIDTH = 6  # camera tracks carry position + forward; actor and sun tracks use the first three
+
+
+def get_animator():
+    global _animator_singleton
+    if _animator_singleton is None:
+        from utils.camera_controller import get_camera_controller
+        from utils.frame_scheduler import get_frame_scheduler
+        from utils.scene_registry import get_scene_registry
+        from utils.transform_coalescer import get_transform_coalescer
+
+        _animator_singleton = Animator(get_scene_registry(), get_transform_coalescer(), get_camera_controller(),
+                                       get_frame_scheduler())
+    return _animator_singleton
+
+
+def glide(seconds, x, y, z):
+    """``yield glide(t, x, y, z)`` in a Blockly script: move its actor to (x, y, z) over t seconds."""
+    module_globals = sys._getframe(1).f_globals
+    get_animator().glide(module_globals["SCENE_NAME"], module_globals["ACTOR_NAME"], seconds, [x, y, z])
+    return wait(seconds)
+
+
+class Animator:
+    """Keyframe tracks for actor transforms, cameras and sun directions, evaluated together once per frame."""
+
+    def __init__(self, scenes, transforms=None, camera=None, frame_scheduler=None, capacity: int = 64,
+                 keys: int = 4):
+        self.scenes = scenes
+        self.transforms = transforms
+        self.camera = camera
+        self.frame_scheduler = frame_scheduler
+        self.time = 0.0
+        self.completed = 0
+        self._targets = []
+        self._ids = []
+        self._rows: dict[int, int] = {}
+        self._by_target: dict[tuple, int] = {}
+        self._free: list[int] = []
+        self._next_id = 1
+        self._active = None
+        self._groups = None
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._start = np.zeros(capacity, dtype=np.float64)
+        self._duration = np.zeros(capacity, dtype=np.float64)
+        self._easing = np.zeros(capacity, dtype=np.int8)
+        self._loop = np.zeros(capacity, dtype=np.int8)
+        self._normalize = np.zeros(capacity, dtype=bool)
+        self._times = np.full((capacity, keys), np.inf)
+        self._values = np.zeros((capacity, keys, WIDTH))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, kind: str, scene_name: str, times, values, actor_name: str | None = None, channel: str = "Move",
+            easing: str = "linear", loop: str = "once", normalize: bool = False, delay: float = 0.0) -> int:
+        """Start a track and return its id; ``times`` ascending seconds, one value per key."""
+        if kind not in KINDS:
+            raise ValueError(f"未知的动画类型: {kind}")
+        if kind == "actor" and (actor_name is None or channel not in CHANNELS):
+            raise ValueError(f"角色动画需要角色名和通道: {actor_name}, {channel}")
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(len(times), -1)
+        if not len(times) or values.shape[0] != len(times) or values.shape[1] > WIDTH:
+            raise ValueError("动画关键帧的时间与数值数量不一致")
+        if np.any(np.diff(times) < 0):
+            raise ValueError("动画关键帧时间必须递增")
+        target = (kind, scene_name, actor_name if kind == "actor" else None, channel if kind == "actor" else None)
+
+        replaced = self._by_target.get(target)
+        if replaced is not None:
+            self.remove(replaced)
+        row = self._free.pop() if self._free else len(self._targets)
+        if row >= len(self._alive):
+            self._grow(len(self._alive) * 2, self._times.shape[1])
+        if len(times) > self._times.shape[1]:
+            self._grow(len(self._alive), len(times))
+        if row == len(self._targets):
+            self._targets.append(target)
+            self._ids.append(0)
+        else:
+            self._targets[row] = target
+        track_id = self._next_id
+        self._next_id += 1
+        self._ids[row] = track_id
+        self._rows[track_id] = row
+        self._by_target[target] = track_id
+
+        self._times[row] = np.inf
+        self._times[row, :len(times)] = times - times[0]
+        self._values[row] = 0.0
+        self._values[row, :len(times), :values.shape[1]] = values
+        self._count[row] = len(times)
+        self._duration[row] = times[-1] - times[0]
+        self._start[row] = self.time + float(delay)
+        self._easing[row] = EASINGS.index(easing)
+        self._loop[row] = LOOPS.index(loop)
+        self._normalize[row] = normalize
+        self._alive[row] = True
+        self._active = None
+        return track_id
+
+    def add_track(self, track: dict) -> int:
+        """``add`` from a JS track object: ``{kind, sceneName, actorName?, channel?, times, values,
+        easing?, loop?, normalize?, delay?}``."""
+        return self.add(track.get("kind", "actor"), track.get("sceneName", "scene1"), track["times"],
+                        track["values"], actor_name=track.get("actorName"), channel=track.get("channel", "Move"),
+                        easing=track.get("easing", "linear"), loop=track.get("loop", "once"),
+                        normalize=bool(track.get("normalize", False)), delay=float(track.get("delay", 0.0)))
+
+    def glide(self, scene_name: str, actor_name: str, seconds: float, position, easing: str = "linear") -> int:
+        start = None
+        actor = self.scenes.resolve(scene_name, actor_name)
+        if actor is not None and self.transforms is not None:
+            start = self.transforms.value(actor.handle, "Move")
+        if start is None:
+            start = [0.0, 0.0, 0.0]
+        return self.add("actor", scene_name, [0.0, max(float(seconds), 0.0)], [start, position],
+                        actor_name=actor_name, easing=easing)
+
+    def remove(self, track_id: int) -> bool:
+        row = self._rows.pop(track_id, None)
+        if row is None:
+            return False
+        target = self._targets[row]
+        if self._by_target.get(target) == track_id:
+            del self._by_target[target]
+        self._targets[row] = None
+        self._ids[row] = 0
+        self._alive[row] = False
+        self._free.append(row)
+        self._active = None
+        return True
+
+    def stop_target(self, kind: str, scene_name: str, actor_name: str | None = None) -> int:
+        """Remove the tracks driving an actor (any channel), a scene's camera or a scene's sun."""
+        doomed = [track_id for (k, scene, actor, _), track_id in self._by_target.items()
+                  if k == kind and scene == scene_name and (actor_name is None or actor == actor_name)]
+        for track_id in doomed:
+            self.remove(track_id)
+        return len(doomed)
+
+    def clear(self) -> None:
+        for track_id in list(self._rows):
+            self.remove(track_id)
+
+    def update(self, dt: float) -> None:
+        self.time += dt
+        if self._rows and self.frame_scheduler is not None:
+            self.frame_scheduler.notify_activity()
+
+    def evaluate(self):
+        """Values of every active track now: ``(rows, values, finished)``, values shaped (n, WIDTH)."""
+        if self._active is None:
+            self._active = np.flatnonzero(self._alive)
+            self._groups = None
+        rows = self._active
+        if not rows.size:
+            return rows, np.zeros((0, WIDTH)), np.zeros(0, dtype=bool)
+        elapsed = self.time - self._start[rows]
+        duration = self._duration[rows]
+        loop = self._loop[rows]
+        safe = np.where(duration > 0.0, duration, 1.0)
+        local = np.where(loop == 1, np.mod(elapsed, safe), elapsed)
+        bounce = np.mod(elapsed, 2.0 * safe)
+        local = np.where(loop == 2, np.where(bounce > safe, 2.0 * safe - bounce, bounce), local)
+        local = np.clip(local, 0.0, duration)
+        finished = (loop == 0) & (elapsed >= duration)
+
+        times = self._times[rows]
+        last = self._count[rows] - 1
+        segment = np.minimum(np.count_nonzero(times <= local[:, None], axis=1) - 1, np.maximum(last - 1, 0))
+        segment = np.maximum(segment, 0)
+        following = np.minimum(segment + 1, last)
+        index = np.arange(rows.size)
+        t0 = times[index, segment]
+        span = times[index, following] - t0
+        u = np.where(span > 0.0, np.clip((local - t0) / np.where(span > 0.0, span, 1.0), 0.0, 1.0), 1.0)
+        easing = self._easing[rows]
+        u = np.select([easing == 1, easing == 2, easing == 3, easing == 4],
+                      [u * u, u * (2.0 - u), u * u * (3.0 - 2.0 * u), np.where(u >= 1.0, 1.0, 0.0)], u)
+        v0 = self._values[rows, segment]
+        values = v0 + (self._values[rows, following] - v0) * u[:, None]
+
+        normalize = self._normalize[rows]
+        if normalize.any():
+            length = np.linalg.norm(values[:, :3], axis=1)
+            scale = np.where(normalize & (length > 0.0), 1.0 / np.where(length > 0.0, length, 1.0), 1.0)
+            values[:, :3] *= scale[:, None]
+        return rows, values, finished
+
+    def flush(self) -> int:
+        rows, values, finished = self.evaluate()
+        if not rows.size:
+            return 0
+        if self._groups is None:
+            self._groups = self._group(rows)
+        actor_groups, others = self._groups
+        if actor_groups and self.transforms is not None:
+            store = self.transforms.store
+            for channel, (indices, store_rows) in actor_groups.items():
+                store.set_many(store_rows, channel, values[indices, :3])
+        for i, (kind, scene_name, _, _) in others:
+            value = values[i].tolist()
+            try:
+                if kind == "camera":
+                    if self.camera is not None:
+                        rig = self.camera.rig(scene_name)
+                        self.camera.set_pose(scene_name, value[:3], value[3:6], rig.up, rig.fov)
+                else:
+                    scene = self.scenes.engine_scene(scene_name)
+                    if scene is not None:
+                        CoronaEngine.Scene.setSunDirection(scene, value[:3])
+            except Exception as e:
+                print(f"[Animator] 应用动画 {kind} 失败: {str(e)}")
+        if finished.any():
+            ids = self._ids
+            for row in rows[finished].tolist():
+                self.remove(ids[row])
+                self.completed += 1
+        return int(rows.size)
+
+    def _group(self, rows):
+        """Split the active rows into transform store rows per channel and the (few) camera/sun targets."""
+        actor_groups: dict[str, tuple[list[int], list[int]]] = {}
+        others = []
+        resolve = self.scenes.resolve
+        for i, row in enumerate(rows.tolist()):
+            target = self._targets[row]
+            kind, scene_name, actor_name, channel = target
+            if kind == "actor":
+                actor = resolve(scene_name, actor_name)
+                if actor is None:
+                    continue
+                indices, handles = actor_groups.setdefault(channel, ([], []))
+                indices.append(i)
+                handles.append(actor.handle)
+            else:
+                others.append((i, target))
+        if self.transforms is not None:
+            store = self.transforms.store
+            actor_groups = {channel: (np.asarray(indices, dtype=np.intp), store.rows(handles))
+                            for channel, (indices, handles) in actor_groups.items()}
+        return actor_groups, others
+
+    def _grow(self, capacity: int, keys: int) -> None:
+        def grow(name, shape, fill):
+            old = getattr(self, name)
+            new = np.full(shape, fill, dtype=old.dtype)
+            new[tuple(slice(0, n) for n in old.shape)] = old
+            setattr(self, name, new)
+
+        for name, fill in (("_alive", False), ("_count", 0), ("_start", 0.0), ("_duration", 0.0), ("_easing", 0),
+                           ("_loop", 0), ("_normalize", False)):
+            grow(name, capacity, fill)
+        grow("_times", (capacity, keys), np.inf)
+        grow("_values", (capacity, keys, WIDTH), 0.0)
+
+    def stats(self) -> dict:
+        return {"tracks": len(self._rows), "completed": self.completed, "time": round(self.time, 3)}
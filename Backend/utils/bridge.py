@@ -1,13 +1,31 @@
 import json
+import math
 import os
-import time
 import traceback
 
-from PyQt6.QtCore import QThread, pyqtSignal, pyqtSlot, QObject
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QObject
 from PyQt6.QtWidgets import QApplication
 from mcp_client import qa_one_sync
+from utils.animation import get_animator
+from utils.bridge_metrics import get_bridge_metrics
+from utils.camera_controller import DELTA_KINDS, get_camera_controller
+from utils.contacts import get_contact_system
 from utils.file_handle import FileHandler
-from utils.static_components import root_dir, scene_dict
+from utils.dock_router import get_dock_router
+from utils.frame_scheduler import get_frame_scheduler
+from utils.input_state import get_input_state
+from utils.key_bindings import get_key_bindings
+from utils.rpc import RpcError, get_rpc_server
+from utils.scene_hierarchy import get_scene_hierarchy
+from utils.scene_registry import get_scene_registry
+from utils.script_compiler import get_script_compiler
+from utils.script_host import get_script_host
+from utils.script_profiler import get_script_profiler
+from utils.script_watchdog import ScriptTimeout
+from utils.spatial_index import get_spatial_index
+from utils.static_components import root_dir
+from utils.transform_coalescer import get_transform_coalescer
+from utils.transform_store import get_transform_store
 
 try:
     import CoronaEngine
@@ -18,6 +36,18 @@ except ImportError:
 
 _bridge_singleton = None
 
+# While bridge metrics are enabled, engine and JSON time inside a slot is booked to that slot.
+_metrics = get_bridge_metrics()
+_metrics.install(globals(), "CoronaEngine", "engine")
+_metrics.install(globals(), "json", "json")
+
+
+def metered_slot(*types, **kwargs):
+    """``pyqtSlot`` whose calls are recorded by the bridge metrics (a flag check when disabled)."""
+    def decorator(func):
+        return pyqtSlot(*types, **kwargs)(_metrics.instrument(func))
+    return decorator
+
 
 def get_bridge(central_manager=None):
     global _bridge_singleton
@@ -30,32 +60,62 @@ def get_bridge(central_manager=None):
     return _bridge_singleton
 
 
-class WorkerThread(QThread):
-    work_finished = pyqtSignal()
-    result_ready = pyqtSignal(object)
+class DockBridge(QObject):
+    """Per-dock QWebChannel object (``dockbridge``) carrying only the events its page subscribed to."""
+
+    dock_event = pyqtSignal(str, str)
+    rpc_reply = pyqtSignal("QVariantMap")
 
-    def __init__(self, func, *args, parent: QObject | None = None, **kwargs):
+    def __init__(self, routename, router=None, parent: QObject | None = None, rpc=None):
         super().__init__(parent)
-        self.func = func
-        self.args = args
-        self.kwargs = kwargs
+        self.routename = routename
+        self.router = router or get_dock_router()
+        self.rpc = rpc or get_rpc_server()
+        self._counts: dict[str, int] = {}
 
-    def run(self):
-        try:
-            result = self.func(*self.args, **self.kwargs)
-            self.result_ready.emit(result)
-        except Exception as e:
-            print(f"Worker thread error: {str(e)}")
-        finally:
-            self.work_finished.emit()
+    @pyqtSlot(str)
+    def subscribe(self, event_type):
+        count = self._counts.get(event_type, 0)
+        if count == 0:
+            self.router.subscribe(self.routename, event_type, self._deliver)
+        self._counts[event_type] = count + 1
+
+    @pyqtSlot(str)
+    def unsubscribe(self, event_type):
+        count = self._counts.get(event_type, 0)
+        if count <= 1:
+            self._counts.pop(event_type, None)
+            if count:
+                self.router.unsubscribe(self.routename, event_type, self._deliver)
+        else:
+            self._counts[event_type] = count - 1
+
+    @pyqtSlot(int, str, "QVariantMap", int)
+    def rpc_call(self, request_id, method, params, timeout_ms):
+        """Start ``method``; the answer comes back as ``rpc_reply({id, ok, result | error})``; 0 ms means no timeout."""
+        self.rpc.call(self, request_id, method, params, self._reply, timeout_ms / 1000.0 if timeout_ms >= 0 else None)
+
+    @pyqtSlot(int)
+    def rpc_cancel(self, request_id):
+        self.rpc.cancel(self, request_id)
+
+    def _reply(self, request_id, response):
+        self.rpc_reply.emit(response)
+
+    def close(self):
+        for event_type in self._counts:
+            self.router.unsubscribe(self.routename, event_type, self._deliver)
+        self._counts.clear()
+        self.rpc.cancel_owner(self)
+
+    def _deliver(self, event_type, event_data, payload):
+        self.dock_event.emit(event_type, event_data)
 
 
 class Bridge(QObject):
     create_route = pyqtSignal(str, str, str, str, object)
     ai_message = pyqtSignal(str)
     remove_route = pyqtSignal(str)
-    ai_response = pyqtSignal(str)
-    dock_event = pyqtSignal(str, str)
     command_to_main = pyqtSignal(str, str)
     key_event = pyqtSignal(str)
     script_dir = os.path.join(root_dir, "CabbageEditor", "Backend", "script")
@@ -63,15 +123,56 @@ class Bridge(QObject):
     os.makedirs(script_dir, exist_ok=True)
     os.makedirs(saves_dir, exist_ok=True)
     obj_dir = ""
+    persist_scripts = os.environ.get("CORONA_PERSIST_SCRIPTS") == "1"
+    metrics_file = os.path.join(root_dir, "CabbageEditor", "bridge_metrics.json")
 
     def __init__(self, central_manager=None):
         super().__init__()
-        self.camera_position = [0.0, 5.0, 10.0]
-        self.camera_forward = [0.0, 1.5, 0.0]
         self.central_manager = central_manager
-        self._workers: set[WorkerThread] = set()
+        self.dock_router = get_dock_router()
+        self.key_bindings = get_key_bindings()
+        self.input_state = get_input_state()
+        self.scenes = get_scene_registry()
+        self.transforms = get_transform_coalescer()
+        self.store = get_transform_store()
+        self.hierarchy = get_scene_hierarchy()
+        self.spatial = get_spatial_index()
+        self.contacts = get_contact_system()
+        self.camera = get_camera_controller()
+        self.animator = get_animator()
+        self.metrics = _metrics
+        if self.metrics.dump_path is None:
+            self.metrics.dump_path = self.metrics_file
+        self.rpc = get_rpc_server()
+        self.rpc.register("import_model", self._rpc_import_model)
+        self.rpc.register("load_scene", self._rpc_load_scene)
+        self.rpc.register("save_scene", self._rpc_save_scene)
+        self.rpc.register("ask_ai", self._rpc_ask_ai, threaded=True, timeout=120.0)
+        script_host = get_script_host()
+        script_host.on_error = self._on_script_error
+        if script_host.vm is not None:
+            script_host.vm.on_transform = self._apply_actor_transform
+        if self.persist_scripts:
+            get_script_compiler().persist_dir = self.script_dir
+
+    def _on_script_error(self, script_name, error, stacktrace):
+        error_response = {
+            "status": "suspended" if isinstance(error, ScriptTimeout) else "error",
+            "script": script_name,
+            "message": str(error),
+            "stacktrace": stacktrace,
+        }
+        self.dock_router.publish("scriptError", json.dumps(error_response))
+
+    def _apply_actor_transform(self, key, position, rotation):
+        actor = self.scenes.resolve(*key)
+        if actor is None:
+            return
+        # Pushed to the engine with the other dirty rows at the frame end; the VM counts in degrees.
+        self.store.set(actor.handle, "Move", position)
+        self.store.set(actor.handle, "Rotate", [math.radians(angle) for angle in rotation])
 
-    @pyqtSlot(str, str, str, str, str)
+    @metered_slot(str, str, str, str, str)
     def add_dock_widget(self, routename, routepath, position="left", floatposition="None", size=None):
         try:
             if isinstance(size, str):
@@ -80,39 +181,49 @@ class Bridge(QObject):
             size = None
         self.create_route.emit(routename, routepath, position, floatposition, size)
 
-    @pyqtSlot(str)
+    @metered_slot(str)
     def remove_dock_widget(self, routename):
         self.remove_route.emit(routename)
 
-    @pyqtSlot(str, str)
+    @metered_slot(str, str)
     def create_actor(self, scene_name, obj_path):
-        name = os.path.basename(obj_path)
-        object = CoronaEngine.Actor(obj_path)
-        scene_dict[scene_name]["actor_dict"][name] = {
-            "actor": object,
-            "path": obj_path
-        }
+        self._create_actor({"sceneName": scene_name, "path": obj_path})
 
-    @pyqtSlot()
-    def remove_actor(self):
-        scene_dict["mainscene"] = {
-            "scene": None,
-            "actor_dict": {}
-        }
+    def _create_actor(self, data):
+        obj_path = data["path"]
+        scene_name = data["sceneName"]
+        self.scenes.require_scene(scene_name)
+        actor = self.scenes.add_actor(scene_name, obj_path, CoronaEngine.Actor(obj_path), tags=data.get("tags", ()))
+        self.store.add(actor.handle)
+        return actor
 
-    @pyqtSlot(str)
+    @metered_slot()
+    def remove_actor(self):
+        for actor in self.scenes.remove_scene("mainscene"):
+            self._forget_actor(actor)
+        self.scenes.add_scene("mainscene")
+
+    def _forget_actor(self, actor):
+        """Drop what other systems keep for an actor that left the registry."""
+        self.hierarchy.forget(actor.handle)
+        self.transforms.discard(actor.handle)
+        self.contacts.forget(actor.handle)
+        self.animator.stop_target("actor", actor.scene.name, actor.name)
+        self._remove_actor_script(actor.scene.name, actor.name)
+
+    @metered_slot(str)
     def create_scene(self, data):
-        scene_name = json.loads(data).get("sceneName")
-        if scene_name not in scene_dict:
-            scene_dict[scene_name] = {
-                "scene": CoronaEngine.Scene(),
-                "actor_dict": {}
-            }
+        self._create_scene(json.loads(data))
+
+    def _create_scene(self, data):
+        scene_name = data.get("sceneName")
+        if scene_name not in self.scenes:
+            self.scenes.add_scene(scene_name, CoronaEngine.Scene())
         else:
             print(f"场景已存在: {scene_name}")
 
 
-    @pyqtSlot(str, str)
+    @metered_slot(str, str)
     def send_message_to_dock(self, routename, json_data):
         try:
             self.central_manager.send_json_to_dock(routename, json_data)
@@ -121,100 +232,149 @@ class Bridge(QObject):
         except Exception as e:
             print(f"发送消息失败: {str(e)}")
 
-    @pyqtSlot(str)
-    def send_message_to_ai(self, ai_message: str):
-        def ai_work() -> str:
-            try:
-                msg_data = json.loads(ai_message)
-                query = msg_data.get("message", "")
-                response_text = qa_one_sync(query=query)
-                final_response = {
-                    "type": "ai_response",
-                    "content": response_text,
-                    "status": "success",
-                    "timestamp": int(time.time()),
-                }
-                return json.dumps(final_response)
-            except Exception as e:
-                error_response = {
-                    "type": "error",
-                    "content": str(e),
-                    "status": "error",
-                    "timestamp": int(time.time()),
-                }
-                return json.dumps(error_response)
-
-        worker = WorkerThread(ai_work, parent=self)
-        worker.result_ready.connect(self.ai_response.emit)
-        worker.finished.connect(worker.deleteLater)
-        worker.finished.connect(lambda: self._workers.discard(worker))
-        self._workers.add(worker)
-        worker.start()
-
-    @pyqtSlot(str, str)
+    def _ask_ai(self, query):
+        return qa_one_sync(query=query)
+
+    @metered_slot(str, str)
     def open_file_dialog(self, sceneName, file_type="model"):
-        file_handler = FileHandler()
         if file_type == "model":
-            _, file_path = file_handler.open_file("选择模型文件", "3D模型文件 (*.obj *.fbx *.dae)")
-            if file_path:
-                try:
-                    print(f"选择的模型文件路径: {file_path}")
-                    name = os.path.basename(file_path)
-                    object = CoronaEngine.Actor(file_path)
-                    scene_dict[sceneName]["actor_dict"][name] = {
-                        "actor": object,
-                        "path": file_path
-                    }
-                    response = {
-                        "name": name,
-                        "path": file_path,
-                    }
-                    self.dock_event.emit("actorCreated", json.dumps(response))
-                except Exception as e:
-                    print(f"创建角色失败: {str(e)}")
+            try:
+                response = self._import_model(sceneName)
+                if response is not None:
+                    self.dock_router.publish("actorCreated", json.dumps(response))
+            except Exception as e:
+                print(f"创建角色失败: {str(e)}")
         elif file_type == "scene":
-            content, file_path = file_handler.open_file("选择场景文件", "场景文件 (*.json)")
-            if file_path:
-                try:
-                    scene_dict[sceneName]["actor_dict"] = {}
-                    scene_data = json.loads(content)
-                    actors = []
-                    for actor in scene_data.get("actors", []):
-                        path = actor.get("path")
-                        if path:
-                            actor_obj = CoronaEngine.Actor(path)
-                            name = os.path.basename(path)
-                            scene_dict[sceneName]["actor_dict"][name] = {
-                                "name": name,
-                                "actor": actor_obj,
-                                "path": path
-                            }
-                            actors.append({
-                                "name": name,
-                                "path": path
-                            })
-                    self.dock_event.emit("sceneLoaded", json.dumps({"actors": actors}))
-                except Exception as e:
-                    print(f"加载场景失败: {str(e)}")
-                    error_response = {"type": "error", "message": str(e)}
-                    self.dock_event.emit("sceneError", json.dumps(error_response))
-
-    @pyqtSlot(str, str)
+            try:
+                response = self._load_scene(sceneName)
+                if response is not None:
+                    self.dock_router.publish("sceneLoaded", json.dumps(response))
+            except Exception as e:
+                print(f"加载场景失败: {str(e)}")
+                error_response = {"type": "error", "message": str(e)}
+                self.dock_router.publish("sceneError", json.dumps(error_response))
+
+    def _import_model(self, sceneName):
+        """Ask for a model file and add it to the scene; ``{"name", "path"}``, or None if cancelled."""
+        _, file_path = FileHandler().open_file("选择模型文件", "3D模型文件 (*.obj *.fbx *.dae)")
+        if not file_path:
+            return None
+        print(f"选择的模型文件路径: {file_path}")
+        actor = self._create_actor({"sceneName": sceneName, "path": file_path})
+        return {"name": actor.name, "path": file_path, "handle": actor.handle}
+
+    def _load_scene(self, sceneName):
+        """Ask for a scene file and replace the scene's actors; ``{"actors": [...]}``, or None if cancelled."""
+        content, file_path = FileHandler().open_file("选择场景文件", "场景文件 (*.json)")
+        if not file_path:
+            return None
+        scene_data = json.loads(content)
+        self.scenes.require_scene(sceneName)
+        for actor in self.scenes.clear_scene(sceneName):
+            self._forget_actor(actor)
+        actors = []
+        for item in scene_data.get("actors", []):
+            path = item.get("path")
+            if path:
+                actor = self._create_actor({"sceneName": sceneName, "path": path, "tags": item.get("tags", ())})
+                actors.append({
+                    "name": actor.name,
+                    "path": path,
+                    "handle": actor.handle
+                })
+        return {"actors": actors}
+
+    # RPC handlers (see utils.rpc): called as handler(params, token), the return value is the result.
+    def _rpc_import_model(self, params, token):
+        return self._import_model(params.get("sceneName", "scene1"))
+
+    def _rpc_load_scene(self, params, token):
+        return self._load_scene(params.get("sceneName", "scene1"))
+
+    def _rpc_save_scene(self, params, token):
+        save_path = self._save_scene(params.get("scene") or {})
+        return {"filepath": save_path} if save_path else None
+
+    def _rpc_ask_ai(self, params, token):
+        query = params.get("message", "")
+        if not query:
+            raise RpcError("消息不能为空")
+        return {"content": self._ask_ai(query)}
+
+    @metered_slot(str, str)
     def send_message_to_main(self, command_name, command_data):
+        get_frame_scheduler().notify_activity()
         try:
-            try:
-                self.command_to_main.emit(command_name, command_data)
-            except Exception:
-                pass
-            key_text = self._extract_key_text(command_name, command_data)
-            if key_text:
+            if command_name == "input_event":
+                # Folded into the polled input state once per frame instead of fanned out.
+                self.input_state.feed(command_data)
+                if self.key_bindings.active and '"keydown"' in command_data:
+                    try:
+                        self._dispatch_key_binding(json.loads(command_data))
+                    except ValueError:
+                        pass
+                elif '"mousedown"' in command_data:
+                    try:
+                        self._pick_from_input(json.loads(command_data))
+                    except ValueError:
+                        pass
+            else:
                 try:
-                    self.key_event.emit(key_text)
+                    self.command_to_main.emit(command_name, command_data)
                 except Exception:
                     pass
+            if self.receivers(self.key_event) > 0:
+                key_text = self._extract_key_text(command_name, command_data)
+                if key_text:
+                    try:
+                        self.key_event.emit(key_text)
+                    except Exception:
+                        pass
         except Exception as e:
             print(f"send_message_to_main failed: {str(e)}")
 
+    @metered_slot("QVariantMap")
+    def send_input_event(self, payload):
+        """Structured ``input_event``: the JS object arrives as a dict, no JSON string round trip."""
+        get_frame_scheduler().notify_activity()
+        self.input_state.feed(payload)
+        if self.key_bindings.active and payload.get("type") == "keydown":
+            self._dispatch_key_binding(payload)
+        elif payload.get("type") == "mousedown":
+            self._pick_from_input(payload)
+
+    def _pick_from_input(self, payload):
+        """Left click in the view: publish ``actorPicked`` for the actor under the cursor, if any."""
+        if payload.get("button") != 0 or not payload.get("viewWidth") or not payload.get("viewHeight"):
+            return
+        picked = self._pick(payload.get("sceneName") or self.input_state.scene_name or "scene1",
+                            payload.get("clientX", 0.0), payload.get("clientY", 0.0),
+                            payload["viewWidth"], payload["viewHeight"])
+        if picked:
+            self.dock_router.publish("actorPicked", json.dumps(picked))
+
+    def _pick(self, scene_name, x, y, width, height):
+        if scene_name not in self.scenes:
+            return {}
+        origin, direction = self.camera.ray(scene_name, float(x), float(y), float(width), float(height))
+        hit = self.spatial.raycast(scene_name, origin, direction)
+        if hit is None:
+            return {}
+        actor = self.scenes.actor(hit[0])
+        return {"sceneName": scene_name, "handle": actor.handle, "name": actor.name, "distance": hit[1]}
+
+    def _dispatch_key_binding(self, payload):
+        key = payload.get("key")
+        if payload.get("kind") != "keyboard" or payload.get("type") != "keydown" or not isinstance(key, str):
+            return
+        self.key_bindings.dispatch_key(
+            key,
+            ctrl=bool(payload.get("ctrlKey")),
+            alt=bool(payload.get("altKey")),
+            shift=bool(payload.get("shiftKey")),
+            meta=bool(payload.get("metaKey")),
+        )
+
     def _extract_key_text(self, command_name, command_data):
         try:
             if not command_data:
@@ -268,118 +428,410 @@ class Bridge(QObject):
             return None
         return None
 
-    @pyqtSlot(str, str)
+    @metered_slot(str, str)
     def actor_delete(self, sceneName, actorName):
         try:
-            if actorName not in scene_dict[sceneName]["actor_dict"]:
-                print(f"当前场景中的角色列表: {list(scene_dict[sceneName]['actor_dict'].keys())}")
-                raise ValueError(f"角色 '{actorName}' 不在场景 '{sceneName}' 中")
-            del scene_dict[sceneName]["actor_dict"][actorName]
-            print(f"成功移除角色: {actorName}")
+            self._actor_delete({"sceneName": sceneName, "actorName": actorName})
         except Exception as e:
             print(f"Actor delete failed: {str(e)}")
             return str(e)
 
-    @pyqtSlot(str)
+    def _actor_delete(self, data):
+        sceneName = data.get("sceneName")
+        actorName = data.get("actorName")
+        actor = self.scenes.resolve(sceneName, actorName)
+        if actor is None:
+            print(f"当前场景中的角色列表: {self.scenes.actor_names(sceneName)}")
+            raise ValueError(f"角色 '{actorName}' 不在场景 '{sceneName}' 中")
+        self.scenes.remove_actor(actor.handle)
+        self._forget_actor(actor)
+        print(f"成功移除角色: {actorName}")
+
+    @metered_slot(str)
     def actor_operation(self, data):
         try:
-            Actor_data = json.loads(data)
-            sceneName = Actor_data.get("sceneName")
-            actorName = Actor_data.get("actorName")
-            Operation = Actor_data.get("Operation")
-            x = float(Actor_data.get("x", 0.0))
-            y = float(Actor_data.get("y", 0.0))
-            z = float(Actor_data.get("z", 0.0))
-            match Operation:
-                case "Scale":
-                    CoronaEngine.Actor.scale(scene_dict[sceneName]["actor_dict"][actorName]["actor"], [x, y, z])
-                case "Move":
-                    CoronaEngine.Actor.move(scene_dict[sceneName]["actor_dict"][actorName]["actor"], [x, y, z])
-                case "Rotate":
-                    CoronaEngine.Actor.rotate(scene_dict[sceneName]["actor_dict"][actorName]["actor"], [x, y, z])
+            self._actor_operation(json.loads(data))
         except Exception as e:
             print(f"Actor transform error: {str(e)}")
             return
 
-    @pyqtSlot(str)
+    def _actor_operation(self, Actor_data):
+        sceneName = Actor_data.get("sceneName")
+        actorName = Actor_data.get("actorName")
+        Operation = Actor_data.get("Operation")
+        x = float(Actor_data.get("x", 0.0))
+        y = float(Actor_data.get("y", 0.0))
+        z = float(Actor_data.get("z", 0.0))
+        if Operation not in ("Scale", "Move", "Rotate"):
+            raise ValueError(f"未知的角色操作: {Operation}")
+        actor = self.scenes.require(sceneName, actorName)
+        # Applied once per frame by the transform coalescer: absolute values replace each other,
+        # relative ones (per-keypress steps) add up.
+        if Actor_data.get("relative"):
+            self.transforms.offset(actor.handle, Operation, [x, y, z])
+        else:
+            self.transforms.submit(actor.handle, Operation, [x, y, z])
+        get_frame_scheduler().notify_activity()
+
+    @metered_slot(str)
     def camera_move(self, data):
         try:
-            move_data = json.loads(data)
-            sceneName = move_data.get("sceneName", "scene1")
-            position = move_data.get("position", [0.0, 5.0, 10.0])
-            forward = move_data.get("forward", [0.0, 1.5, 0.0])
-            up = move_data.get("up", [0.0, -1.0, 0.0])
-            fov = float(move_data.get("fov", 45.0))
-            CoronaEngine.Scene.setCamera(scene_dict[sceneName]["scene"], position, forward, up, fov)
+            self._camera_move(json.loads(data))
         except Exception as e:
             print(f"摄像头移动错误: {str(e)}")
 
-    @pyqtSlot(str)
+    def _camera_move(self, move_data):
+        sceneName = move_data.get("sceneName", "scene1")
+        position = move_data.get("position", [0.0, 5.0, 10.0])
+        forward = move_data.get("forward", [0.0, 1.5, 0.0])
+        up = move_data.get("up", [0.0, -1.0, 0.0])
+        fov = float(move_data.get("fov", 45.0))
+        self.scenes.require_scene(sceneName)
+        # Applied at the frame end by the camera controller, at most one setCamera per frame.
+        self.animator.stop_target("camera", sceneName)
+        self.camera.set_pose(sceneName, position, forward, up, fov)
+
+    @metered_slot(str)
     def sun_direction(self, data):
         try:
-            sun_data = json.loads(data)
-            sceneName = sun_data.get("sceneName", "scene1")
-            px = float(sun_data.get("px", 1.0))
-            py = float(sun_data.get("py", 1.0))
-            pz = float(sun_data.get("pz", 1.0))
-            direction = [px, py, pz]
-            CoronaEngine.Scene.setSunDirection(scene_dict[sceneName]["scene"], direction)
+            self._sun_direction(json.loads(data))
+        except Exception as e:
+            error_response = {"type": "error", "message": str(e)}
+            self.dock_router.publish("sunDirectionError", json.dumps(error_response))
+
+    def _sun_direction(self, sun_data):
+        sceneName = sun_data.get("sceneName", "scene1")
+        px = float(sun_data.get("px", 1.0))
+        py = float(sun_data.get("py", 1.0))
+        pz = float(sun_data.get("pz", 1.0))
+        direction = [px, py, pz]
+        self.animator.stop_target("sun", sceneName)
+        CoronaEngine.Scene.setSunDirection(self.scenes.require_scene(sceneName).engine, direction)
+
+    BATCH_OPERATIONS = {
+        "actor_operation": _actor_operation,
+        "actor_delete": _actor_delete,
+        "camera_move": _camera_move,
+        "create_actor": _create_actor,
+        "create_scene": _create_scene,
+        "sun_direction": _sun_direction,
+    }
+
+    @metered_slot(str, result=str)
+    def apply_batch(self, data):
+        """Apply a JSON array of ``{"op": ..., **payload}`` items in order.
+
+        Returns a JSON array with one ``{"ok": true}`` or ``{"ok": false, "error": ...}`` per item.
+        """
+        try:
+            operations = json.loads(data)
+            if not isinstance(operations, list):
+                raise ValueError("批处理数据必须是数组")
+        except ValueError as e:
+            print(f"批处理解析失败: {str(e)}")
+            return json.dumps([{"ok": False, "error": str(e)}])
+        get_frame_scheduler().notify_activity()
+        return json.dumps(self._apply_operations(operations))
+
+    def _apply_operations(self, operations):
+        results = []
+        operations_table = self.BATCH_OPERATIONS
+        for item in operations:
+            try:
+                operation = operations_table.get(item.get("op"))
+                if operation is None:
+                    raise ValueError(f"未知的批处理操作: {item.get('op')}")
+                operation(self, item)
+                results.append({"ok": True})
+            except Exception as e:
+                results.append({"ok": False, "error": str(e)})
+        return results
+
+    @metered_slot("QVariantList", result="QVariantList")
+    def apply_batch_items(self, operations):
+        """``apply_batch`` for a JS array of objects; returns the status list without JSON strings."""
+        get_frame_scheduler().notify_activity()
+        return self._apply_operations(operations)
+
+    # Structured variants of the hot slots: QWebChannel hands over the JS object as a dict, so there
+    # is no JSON.stringify in JS and no json.loads here.
+    @metered_slot("QVariantMap")
+    def actor_operation_map(self, data):
+        try:
+            self._actor_operation(data)
+        except Exception as e:
+            print(f"Actor transform error: {str(e)}")
+
+    @metered_slot("QVariantMap")
+    def camera_move_map(self, data):
+        try:
+            self._camera_move(data)
+        except Exception as e:
+            print(f"摄像头移动错误: {str(e)}")
+
+    @metered_slot("QVariantMap")
+    def sun_direction_map(self, data):
+        try:
+            self._sun_direction(data)
         except Exception as e:
             error_response = {"type": "error", "message": str(e)}
-            self.dock_event.emit("sunDirectionError", json.dumps(error_response))
+            self.dock_router.publish("sunDirectionError", json.dumps(error_response))
+
+    # Positional encodings for vector-heavy messages.
+    PACKED_OPERATIONS = ("Move", "Rotate", "Scale")
+
+    @metered_slot("QVariantList")
+    def actor_operation_packed(self, values):
+        """``[sceneName, actorName, op, x, y, z, ...]`` with op 0/1/2 = Move/Rotate/Scale; repeats."""
+        try:
+            operations = self.PACKED_OPERATIONS
+            submit = self.transforms.submit
+            require = self.scenes.require
+            for i in range(0, len(values) - 5, 6):
+                submit(require(values[i], values[i + 1]).handle, operations[int(values[i + 2])],
+                       [float(values[i + 3]), float(values[i + 4]), float(values[i + 5])])
+            get_frame_scheduler().notify_activity()
+        except Exception as e:
+            print(f"Actor transform error: {str(e)}")
+
+    @metered_slot("QVariantList")
+    def actor_operation_handles(self, values):
+        """``[handle, op, x, y, z, ...]``: ``actor_operation_packed`` for actors resolved once by handle."""
+        try:
+            operations = self.PACKED_OPERATIONS
+            submit = self.transforms.submit
+            lookup = self.scenes.actor
+            for i in range(0, len(values) - 4, 5):
+                handle = int(values[i])
+                if lookup(handle) is None:
+                    raise ValueError(f"角色句柄 {handle} 不存在")
+                submit(handle, operations[int(values[i + 1])],
+                       [float(values[i + 2]), float(values[i + 3]), float(values[i + 4])])
+            get_frame_scheduler().notify_activity()
+        except Exception as e:
+            print(f"Actor transform error: {str(e)}")
+
+    BULK_OPERATIONS = {"translate": "translate", "rotate": "rotate", "scale": "scale_by"}
+
+    @metered_slot("QVariantMap", result=int)
+    def transform_actors(self, data):
+        """``{op, x, y, z}`` applied to ``handles`` or every actor matching ``tag``/``path``/``sceneName``.
+
+        ``op`` is ``translate``/``rotate`` (added) or ``scale`` (multiplied); returns the count, or -1.
+        """
+        try:
+            operation = self.BULK_OPERATIONS.get(data.get("op"))
+            if operation is None:
+                raise ValueError(f"未知的批量变换: {data.get('op')}")
+            delta = [float(data.get("x", 0.0)), float(data.get("y", 0.0)), float(data.get("z", 0.0))]
+            if data.get("handles") is not None:
+                handles = [int(h) for h in data["handles"] if self.scenes.actor(int(h)) is not None]
+            else:
+                handles = [actor.handle for actor in self._find_actors(data)]
+            count = getattr(self.store, operation)(delta, self.store.rows(handles))
+            get_frame_scheduler().notify_activity()
+            return count
+        except Exception as e:
+            print(f"批量变换失败: {str(e)}")
+            return -1
+
+    @metered_slot("QVariantMap", result="QVariantList")
+    def find_actors(self, query):
+        """Actors matching ``{sceneName?, actorName?, path?, tag?}`` as ``{handle, name, path, tags}``."""
+        try:
+            found = []
+            for actor in self._find_actors(query):
+                info = actor.info()
+                parent = self.scenes.actor(self.hierarchy.parent_of(actor.handle))
+                info["parent"] = parent.name if parent is not None else ""
+                found.append(info)
+            return found
+        except Exception as e:
+            print(f"查找角色失败: {str(e)}")
+            return []
+
+    @metered_slot("QVariantMap", result=bool)
+    def set_parent(self, data):
+        """``{sceneName, actorName, parentName, keepWorld?}``: link an actor under another ('' detaches)."""
+        try:
+            scene_name = data.get("sceneName", "scene1")
+            actor = self.scenes.require(scene_name, data.get("actorName"))
+            parent_name = data.get("parentName")
+            parent = self.scenes.require(scene_name, parent_name).handle if parent_name else None
+            self.hierarchy.attach(actor.handle, parent, keep_world=bool(data.get("keepWorld", True)))
+            get_frame_scheduler().notify_activity()
+            return True
+        except Exception as e:
+            print(f"设置父角色失败: {str(e)}")
+            return False
+
+    @metered_slot("QVariantMap", result="QVariantMap")
+    def pick_actor(self, query):
+        """Actor under pixel ``{sceneName, x, y, width, height}``: ``{sceneName, handle, name, distance}`` or ``{}``."""
+        try:
+            return self._pick(query.get("sceneName", "scene1"), query.get("x", 0.0), query.get("y", 0.0),
+                              query.get("width", 0.0), query.get("height", 0.0))
+        except Exception as e:
+            print(f"拾取角色失败: {str(e)}")
+            return {}
+
+    def _find_actors(self, query):
+        scene_name = query.get("sceneName")
+        if query.get("actorName"):
+            actor = self.scenes.resolve(scene_name or "scene1", query["actorName"])
+            actors = [actor] if actor is not None else []
+        elif query.get("path"):
+            actors = self.scenes.find_by_path(query["path"])
+        elif query.get("tag"):
+            actors = self.scenes.find_by_tag(query["tag"])
+        else:
+            actors = self.scenes.actors(scene_name or "scene1")
+        return [actor for actor in actors if scene_name is None or actor.scene.name == scene_name]
+
+    @metered_slot("QVariantList")
+    def camera_move_packed(self, values):
+        """``[sceneName, px, py, pz, fx, fy, fz, ux, uy, uz, fov]``."""
+        try:
+            v = [float(x) for x in values[1:11]]
+            self.scenes.require_scene(values[0])
+            self.animator.stop_target("camera", values[0])
+            self.camera.set_pose(values[0], v[0:3], v[3:6], v[6:9], v[9])
+        except Exception as e:
+            print(f"摄像头移动错误: {str(e)}")
+
+    # Camera navigation: compact input for the backend camera controller instead of full states.
+    @metered_slot("QVariantList")
+    def camera_input(self, values):
+        """``[sceneName, right, up, forward, yaw]``: axes of the held keys, sent when they change."""
+        try:
+            self.animator.stop_target("camera", values[0])
+            self.camera.set_intent(values[0], *(float(x) for x in values[1:5]))
+        except Exception as e:
+            print(f"摄像头移动错误: {str(e)}")
+
+    @metered_slot("QVariantList")
+    def camera_delta(self, values):
+        """``[sceneName, kind, a, b]`` with kind 0/1/2 = look/pan/zoom (pixels, pixels, wheel notches)."""
+        try:
+            b = float(values[3]) if len(values) > 3 else 0.0
+            self.animator.stop_target("camera", values[0])
+            self.camera.add_delta(values[0], DELTA_KINDS[int(values[1])], float(values[2]), b)
+        except Exception as e:
+            print(f"摄像头移动错误: {str(e)}")
+
+    @metered_slot(str, str)
+    def camera_mode(self, sceneName, mode):
+        try:
+            self.camera.set_mode(sceneName, mode)
+        except Exception as e:
+            print(f"摄像头模式错误: {str(e)}")
+
+    # Animation tracks: the frontend submits a whole track once, the animator samples it every frame.
+    @metered_slot("QVariantMap", result=int)
+    def animate(self, track):
+        """Start a track (see ``Animator.add_track``); returns its id, or -1 if it was rejected."""
+        try:
+            self.scenes.require_scene(track.get("sceneName", "scene1"))
+            track_id = self.animator.add_track(track)
+            get_frame_scheduler().notify_activity()
+            return track_id
+        except Exception as e:
+            print(f"动画创建失败: {str(e)}")
+            return -1
 
-    @pyqtSlot(str, int)
+    @metered_slot(int)
+    def stop_animation(self, track_id):
+        self.animator.remove(track_id)
+
+    @metered_slot(str, str, str)
+    def stop_animations(self, kind, sceneName, actorName=""):
+        self.animator.stop_target(kind, sceneName, actorName or None)
+
+    @metered_slot(str, int)
     def execute_python_code(self, code, index):
+        # Scripts are bound to an actor now; without a scene and actor name one cannot run here.
+        message = "execute_python_code 已停用，请改用 execute_actor_script(sceneName, actorName, code)"
+        print(f"[ERROR] {message}")
+        error_response = {"status": "error", "sceneName": "", "actorName": str(index), "message": message,
+                          "stacktrace": ""}
+        self.dock_router.publish("scriptError", json.dumps(error_response))
+
+    @metered_slot(str, str, str)
+    def execute_actor_script(self, scene_name, actor_name, code):
         try:
-            filename = f"blockly_code.py"
-            filepath = os.path.join(self.script_dir, filename)
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(code)
-
-            run_script_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "runScript.py"
-            )
-            script_files = []
-            for f in os.listdir(self.script_dir):
-                if f.startswith("blockly_code") and f.endswith(".py"):
-                    script_files.append(f.replace(".py", ""))
-            run_script_content = ""
-            for script in script_files:
-                run_script_content += f"import script.{script}\n"
-
-            run_script_content += "\ndef run():\n"
-            for script in script_files:
-                run_script_content += f"    script.{script}.run()\n"
-
-            with open(run_script_path, "w", encoding="utf-8") as f:
-                f.write(run_script_content)
-            print(f"[DEBUG] 脚本文件创建成功: {filepath}")
-            print(f"[DEBUG] runScript.py创建/覆盖成功: {run_script_path}")
+            script_host = get_script_host()
+            script_host.publish(scene_name, actor_name, code)
+            get_frame_scheduler().notify_activity()
+            module_name = script_host.slot_module_name(scene_name, actor_name)
+            get_script_compiler().persist(module_name.rsplit(".", 1)[-1] + ".py", code)
         except Exception as e:
             print(f"[ERROR] 执行Python代码时出错: {str(e)}")
             error_response = {
                 "status": "error",
+                "sceneName": scene_name,
+                "actorName": actor_name,
                 "message": str(e),
                 "stacktrace": traceback.format_exc(),
             }
-            self.dock_event.emit("scriptError", json.dumps(error_response))
+            self.dock_router.publish("scriptError", json.dumps(error_response))
 
-    @pyqtSlot(str)
-    def scene_save(self, data):
+    def _remove_actor_script(self, scene_name, actor_name):
+        script_host = get_script_host()
+        if script_host.remove(scene_name, actor_name) and self.persist_scripts:
+            module_name = script_host.slot_module_name(scene_name, actor_name)
+            filepath = os.path.join(self.script_dir, module_name.rsplit(".", 1)[-1] + ".py")
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+
+    @metered_slot(bool)
+    def set_script_profiling(self, enabled):
+        profiler = get_script_profiler()
+        if enabled and not profiler.enabled:
+            profiler.reset()
+        profiler.enable(enabled)
+
+    @metered_slot(bool)
+    def set_bridge_metrics(self, enabled):
+        if enabled and not self.metrics.enabled:
+            self.metrics.reset()
+        self.metrics.enable(enabled)
+
+    @metered_slot(result=str)
+    def bridge_metrics(self):
+        """Per-slot calls, payload bytes, p50/p95/p99 latency and engine/JSON time, as JSON."""
+        return json.dumps(self.metrics.snapshot())
+
+    @metered_slot()
+    def request_script_profile(self):
         try:
-            scene_data = json.loads(data)
-            file_handler = FileHandler()
+            snapshot = get_script_profiler().snapshot()
+            snapshot["transforms"] = self.transforms.stats()
+            snapshot["transform_store"] = self.store.stats()
+            snapshot["spatial"] = self.spatial.stats()
+            snapshot["contacts"] = self.contacts.stats()
+            snapshot["hierarchy"] = self.hierarchy.stats()
+            snapshot["camera"] = self.camera.stats()
+            snapshot["animation"] = self.animator.stats()
+            snapshot["rpc"] = self.rpc.stats()
+            snapshot["scenes"] = self.scenes.stats()
+            self.dock_router.publish("scriptProfile", json.dumps(snapshot))
+        except Exception as e:
+            print(f"[ERROR] 获取脚本性能数据失败: {str(e)}")
 
-            content = json.dumps(scene_data, indent=4)
-            save_path = file_handler.save_file(content, "保存场景文件", "场景文件 (*.json)")
+    @metered_slot(str)
+    def scene_save(self, data):
+        try:
+            save_path = self._save_scene(json.loads(data))
             if save_path:
                 print(f"[DEBUG] 场景保存成功: {save_path}")
-                self.dock_event.emit(
+                self.dock_router.publish(
                     "sceneSaved", json.dumps({"status": "success", "filepath": save_path})
                 )
             else:
                 print("[DEBUG] 场景保存失败")
-                self.dock_event.emit(
+                self.dock_router.publish(
                     "sceneSaved", json.dumps({"status": "error", "filepath": save_path})
                 )
         except Exception as e:
@@ -388,13 +840,17 @@ class Bridge(QObject):
                 "status": "error",
                 "message": str(e)
             }
-            self.dock_event.emit("sceneError", json.dumps(error_response))
+            self.dock_router.publish("sceneError", json.dumps(error_response))
 
-    @pyqtSlot()
+    def _save_scene(self, scene_data):
+        content = json.dumps(scene_data, indent=4)
+        return FileHandler().save_file(content, "保存场景文件", "场景文件 (*.json)")
+
+    @metered_slot()
     def close_process(self):
         QApplication.quit()
         os._exit(0)
 
-    @pyqtSlot(str, str)
+    @metered_slot(str, str)
     def forward_dock_event(self, event_type, event_data):
-        self.dock_event.emit(event_type, event_data)
+        self.dock_router.publish(event_type, event_data)
@@ -0,0 +1,231 @@
+import functools
+import json
+import math
+import os
+import threading
+import time
+import types
+
+_bridge_metrics_singleton = None
+
+SUB_BUCKETS = 4  # histogram buckets per power of two (about 19% wide)
+
+
+def get_bridge_metrics():
+    global _bridge_metrics_singleton
+    if _bridge_metrics_singleton is None:
+        _bridge_metrics_singleton = BridgeMetrics(enabled=os.environ.get("CORONA_BRIDGE_METRICS") == "1",
+                                                  dump_path=os.environ.get("CORONA_BRIDGE_METRICS_FILE"))
+    return _bridge_metrics_singleton
+
+
+def _bucket(seconds: float) -> int:
+    mantissa, exponent = math.frexp(seconds * 1e6)
+    return exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+
+def _bucket_upper_us(bucket: int) -> float:
+    exponent, sub = divmod(bucket, SUB_BUCKETS)
+    return math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), exponent)
+
+
+def _payload_size(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (bool, int, float)):
+        return 8
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class SlotStats:
+    __slots__ = ("calls", "bytes_in", "bytes_out", "total", "engine", "json", "max", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.total = 0.0
+        self.engine = 0.0
+        self.json = 0.0
+        self.max = 0.0
+        self.histogram: dict[int, int] = {}
+
+    def percentile_ms(self, fraction: float) -> float:
+        """Upper bound of the histogram bucket holding the given fraction of calls."""
+        rank = fraction * self.calls
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return _bucket_upper_us(bucket) / 1000.0
+        return 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "total_ms": round(self.total * 1000.0, 3),
+            "engine_ms": round(self.engine * 1000.0, 3),
+            "json_ms": round(self.json * 1000.0, 3),
+            "p50_ms": round(self.percentile_ms(0.50), 4),
+            "p95_ms": round(self.percentile_ms(0.95), 4),
+            "p99_ms": round(self.percentile_ms(0.99), 4),
+            "max_ms": round(self.max * 1000.0, 4),
+        }
+
+
+class BridgeMetrics:
+    """Per-slot call counts, payload sizes and latency histograms for the Qt bridge, while ``enabled``."""
+
+    def __init__(self, enabled: bool = False, dump_path: str | None = None, dump_interval: float = 5.0,
+                 clock=time.perf_counter):
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.clock = clock
+        self._slots: dict[str, SlotStats] = {}
+        self._started = clock()
+        self._last_dump = clock()
+        self._thread = None
+        self._engine = 0.0
+        self._json = 0.0
+        self._installed = []
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        for namespace, name, target, proxy in self._installed:
+            namespace[name] = proxy if enabled else target
+
+    def reset(self) -> None:
+        self._slots.clear()
+        self._started = self.clock()
+
+    def instrument(self, func, name: str | None = None):
+        name = name or func.__name__
+        metrics = self
+
+        @functools.wraps(func)
+        def slot(*args):
+            if not metrics.enabled or metrics._thread is not None:
+                return func(*args)
+            return metrics._call(name, func, args)
+
+        return slot
+
+    def _call(self, name, func, args):
+        clock = self.clock
+        self._thread = threading.get_ident()
+        self._engine = self._json = 0.0
+        start = clock()
+        try:
+            result = func(*args)
+        finally:
+            elapsed = clock() - start
+            self._thread = None
+            stats = self._slots.get(name)
+            if stats is None:
+                stats = self._slots[name] = SlotStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.engine += self._engine
+            stats.json += self._json
+            if elapsed > stats.max:
+                stats.max = elapsed
+            bucket = _bucket(elapsed) if elapsed > 0.0 else 0
+            stats.histogram[bucket] = stats.histogram.get(bucket, 0) + 1
+            stats.bytes_in += sum(_payload_size(arg) for arg in args[1:])
+        stats.bytes_out += _payload_size(result)
+        return result
+
+    def meter(self, target, category: str):
+        """Proxy for a module or class whose calls are booked to ``category`` (``engine``/``json``)."""
+        return _Metered(target, "_" + category, self)
+
+    def install(self, namespace: dict, name: str, category: str) -> None:
+        """Bind ``namespace[name]`` to its ``meter`` proxy while enabled and to the plain object otherwise."""
+        target = namespace[name]
+        proxy = self.meter(target, category)
+        self._installed.append((namespace, name, target, proxy))
+        namespace[name] = proxy if self.enabled else target
+
+    def snapshot(self) -> dict:
+        slots = {name: stats.snapshot() for name, stats in self._slots.items()}
+        return {
+            "enabled": self.enabled,
+            "seconds": round(self.clock() - self._started, 3),
+            "slots": dict(sorted(slots.items(), key=lambda item: item[1]["total_ms"], reverse=True)),
+        }
+
+    def maybe_dump(self) -> bool:
+        if not self.enabled or self.dump_path is None:
+            return False
+        now = self.clock()
+        if now - self._last_dump < self.dump_interval:
+            return False
+        self._last_dump = now
+        return self.dump()
+
+    def dump(self, path: str | None = None) -> bool:
+        path = path or self.dump_path
+        if path is None:
+            return False
+        try:
+            temp_path = path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, path)
+            return True
+        except OSError as e:
+            print(f"[BridgeMetrics] 写入性能数据失败: {str(e)}")
+            return False
+
+
+class _Metered:
+    """Attribute proxy that books calls made inside an instrumented slot to that slot."""
+
+    def __init__(self, target, field, metrics):
+        self._target = target
+        self._field = field
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if isinstance(value, type) and not issubclass(value, BaseException):
+            wrapped = _MeteredClass(value, self._field, self._metrics)
+        elif callable(value) and not isinstance(value, (type, types.ModuleType)):
+            wrapped = _timed(value, self._field, self._metrics)
+        else:
+            return value
+        setattr(self, name, wrapped)
+        return wrapped
+
+
+class _MeteredClass(_Metered):
+    def __call__(self, *args, **kwargs):
+        metrics = self._metrics
+        if not metrics.enabled or metrics._thread != threading.get_ident():
+            return self._target(*args, **kwargs)
+        start = metrics.clock()
+        try:
+            return self._target(*args, **kwargs)
+        finally:
+            setattr(metrics, self._field, getattr(metrics, self._field) + metrics.clock() - start)
+
+
+def _timed(func, field, metrics):
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        if not metrics.enabled or metrics._thread != threading.get_ident():
+            return func(*args, **kwargs)
+        start = metrics.clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            setattr(metrics, field, getattr(metrics, field) + metrics.clock() - start)
+    return call
@@ -0,0 +1,277 @@
+import math
+
+from utils.frame_scheduler import get_frame_scheduler
+
+try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+
+_camera_controller_singleton = None
+
+MODES = ("fly", "orbit", "pan")
+DELTA_KINDS = ("look", "pan", "zoom")
+_EPSILON = 1e-4
+
+
+def get_camera_controller():
+    global _camera_controller_singleton
+    if _camera_controller_singleton is None:
+        from utils.scene_registry import get_scene_registry
+
+        _camera_controller_singleton = CameraController(get_scene_registry(), get_frame_scheduler())
+    return _camera_controller_singleton
+
+
+class CameraRig:
+    """Camera state of one scene: a target point seen from ``distance`` at ``yaw``/``pitch`` (radians)."""
+
+    __slots__ = ("mode", "target", "yaw", "pitch", "distance", "goal_target", "goal_yaw", "goal_pitch",
+                 "goal_distance", "intent", "velocity", "yaw_rate", "up", "fov", "pose", "dirty")
+
+    def __init__(self, position=(0.0, 5.0, 10.0), target=(0.0, 1.5, 0.0), up=(0.0, -1.0, 0.0), fov=45.0):
+        self.mode = "fly"
+        self.intent = [0.0, 0.0, 0.0, 0.0]
+        self.velocity = [0.0, 0.0, 0.0]
+        self.yaw_rate = 0.0
+        self.up = list(up)
+        self.fov = float(fov)
+        self.pose = None
+        self.dirty = False
+        offset = [position[i] - target[i] for i in range(3)]
+        self.distance = math.sqrt(sum(c * c for c in offset)) or 1.0
+        self.yaw = math.atan2(offset[0], offset[2])
+        self.pitch = math.asin(max(-1.0, min(1.0, offset[1] / self.distance)))
+        self.target = list(target)
+        self.settle()
+
+    def settle(self) -> None:
+        self.goal_target = list(self.target)
+        self.goal_yaw = self.yaw
+        self.goal_pitch = self.pitch
+        self.goal_distance = self.distance
+
+    def forward(self) -> list[float]:
+        cos_pitch = math.cos(self.pitch)
+        return [-cos_pitch * math.sin(self.yaw), -math.sin(self.pitch), -cos_pitch * math.cos(self.yaw)]
+
+    def right(self) -> list[float]:
+        return [math.cos(self.yaw), 0.0, -math.sin(self.yaw)]
+
+    def position(self) -> list[float]:
+        forward = self.forward()
+        return [self.target[i] - forward[i] * self.distance for i in range(3)]
+
+    def moving(self) -> bool:
+        return bool(any(self.intent) or any(abs(v) > _EPSILON for v in self.velocity)
+                    or abs(self.yaw_rate) > _EPSILON or abs(self.goal_yaw - self.yaw) > _EPSILON
+                    or abs(self.goal_pitch - self.pitch) > _EPSILON
+                    or abs(self.goal_distance - self.distance) > _EPSILON
+                    or any(abs(self.goal_target[i] - self.target[i]) > _EPSILON for i in range(3)))
+
+
+class CameraController:
+    """Moves scene cameras from held-key axes and one-shot deltas; ``setCamera`` at most once per frame."""
+
+    def __init__(self, scenes, frame_scheduler=None):
+        self.scenes = scenes
+        self.frame_scheduler = frame_scheduler
+        self.rigs: dict[str, CameraRig] = {}
+        self.move_speed = 6.0
+        self.turn_speed = math.radians(60.0)
+        self.look_sensitivity = math.radians(0.25)
+        self.pan_sensitivity = 0.002
+        self.zoom_step = 0.9
+        self.acceleration = 12.0
+        self.damping = 6.0
+        self.smoothing = 14.0
+        self.min_distance = 0.5
+        self.max_distance = 500.0
+        self.pitch_limit = math.radians(89.0)
+        self.inputs = 0
+        self.updates = 0
+        self.engine_calls = 0
+
+    def rig(self, scene_name: str) -> CameraRig:
+        rig = self.rigs.get(scene_name)
+        if rig is None:
+            rig = self.rigs[scene_name] = CameraRig()
+        return rig
+
+    def set_mode(self, scene_name: str, mode: str) -> None:
+        if mode not in MODES:
+            raise ValueError(f"未知的摄像机模式: {mode}")
+        self.rig(scene_name).mode = mode
+
+    def set_intent(self, scene_name: str, right: float, up: float, forward: float, yaw: float = 0.0) -> None:
+        """Axes of the keys held now, each in -1..1; zero them all when the keys are released."""
+        rig = self.rig(scene_name)
+        rig.intent = [float(right), float(up), float(forward), float(yaw)]
+        self._input()
+
+    def add_delta(self, scene_name: str, kind: str, a: float, b: float = 0.0) -> None:
+        """One-shot input: ``look`` or ``pan`` (pixels dx, dy), or ``zoom`` (wheel notches, positive is in)."""
+        rig = self.rig(scene_name)
+        if kind == "look":
+            rig.goal_yaw -= float(a) * self.look_sensitivity
+            rig.goal_pitch = self._clamp_pitch(rig.goal_pitch + float(b) * self.look_sensitivity)
+        elif kind == "pan":
+            right = rig.right()
+            forward = rig.forward()
+            up = _cross(right, forward)
+            scale = self.pan_sensitivity * rig.goal_distance
+            for i in range(3):
+                rig.goal_target[i] += (-float(a) * right[i] + float(b) * up[i]) * scale
+        elif kind == "zoom":
+            if rig.mode == "fly":
+                forward = rig.forward()
+                step = float(a) * self.move_speed * 0.1
+                for i in range(3):
+                    rig.goal_target[i] += forward[i] * step
+            else:
+                rig.goal_distance = min(self.max_distance, max(
+                    self.min_distance, rig.goal_distance * self.zoom_step ** float(a)))
+        else:
+            raise ValueError(f"未知的摄像机输入: {kind}")
+        self._input()
+
+    def set_pose(self, scene_name: str, position, forward, up=(0.0, -1.0, 0.0), fov: float = 45.0) -> None:
+        rig = self.rig(scene_name)
+        length = math.sqrt(sum(float(c) * float(c) for c in forward))
+        if length > _EPSILON:
+            direction = [float(c) / length for c in forward]
+            rig.yaw = math.atan2(-direction[0], -direction[2])
+            rig.pitch = self._clamp_pitch(math.asin(max(-1.0, min(1.0, -direction[1]))))
+            rig.target = [float(position[i]) + direction[i] * rig.distance for i in range(3)]
+        rig.settle()
+        rig.velocity = [0.0, 0.0, 0.0]
+        rig.yaw_rate = 0.0
+        rig.up = [float(c) for c in up]
+        rig.fov = float(fov)
+        rig.pose = (list(position), list(forward))
+        rig.dirty = True
+        self._input()
+
+    def update(self, dt: float) -> None:
+        moving = False
+        for rig in self.rigs.values():
+            if rig.moving():
+                self._step(rig, dt)
+                moving = True
+        if moving:
+            self.updates += 1
+            if self.frame_scheduler is not None:
+                self.frame_scheduler.notify_activity()
+
+    def _step(self, rig: CameraRig, dt: float) -> None:
+        accelerate = 1.0 - math.exp(-self.acceleration * dt)
+        damp = 1.0 - math.exp(-self.damping * dt)
+        follow = 1.0 - math.exp(-self.smoothing * dt)
+        right_axis, up_axis, forward_axis, yaw_axis = rig.intent
+
+        # Held keys accelerate towards full speed; released keys let the velocity glide out.
+        rate = accelerate if yaw_axis else damp
+        rig.yaw_rate += (yaw_axis * self.turn_speed - rig.yaw_rate) * rate
+        if rig.mode == "orbit":
+            goals = (0.0, 0.0, 0.0)
+            rig.goal_yaw += right_axis * self.turn_speed * dt
+            rig.goal_pitch = self._clamp_pitch(rig.goal_pitch + up_axis * self.turn_speed * dt)
+            rig.goal_distance = min(self.max_distance, max(
+                self.min_distance, rig.goal_distance * math.exp(-forward_axis * dt)))
+        else:
+            goals = (right_axis * self.move_speed, up_axis * self.move_speed, forward_axis * self.move_speed)
+        for i in range(3):
+            rate = accelerate if goals[i] else damp
+            rig.velocity[i] += (goals[i] - rig.velocity[i]) * rate
+        rig.goal_yaw += rig.yaw_rate * dt
+
+        eye = rig.position() if rig.mode == "fly" else None
+        rig.yaw += (rig.goal_yaw - rig.yaw) * follow
+        rig.pitch += (rig.goal_pitch - rig.pitch) * follow
+        rig.distance += (rig.goal_distance - rig.distance) * follow
+        if eye is not None:
+            # Fly turns around the eye, so the target swings with the view direction.
+            forward = rig.forward()
+            shift = [eye[i] + forward[i] * rig.distance - rig.target[i] for i in range(3)]
+            for i in range(3):
+                rig.target[i] += shift[i]
+                rig.goal_target[i] += shift[i]
+
+        if any(rig.velocity):
+            right = rig.right()
+            if rig.mode == "fly":
+                forward = rig.forward()
+                forward = [forward[0], 0.0, forward[2]]
+                length = math.sqrt(forward[0] * forward[0] + forward[2] * forward[2]) or 1.0
+                forward = [forward[0] / length, 0.0, forward[2] / length]
+                up = (0.0, 1.0, 0.0)
+            else:
+                forward = rig.forward()
+                up = _cross(right, forward)
+            vx, vy, vz = rig.velocity
+            for i in range(3):
+                rig.goal_target[i] += (right[i] * vx + up[i] * vy + forward[i] * vz) * dt
+        for i in range(3):
+            rig.target[i] += (rig.goal_target[i] - rig.target[i]) * follow
+        rig.pose = None
+        rig.dirty = True
+
+    def ray(self, scene_name: str, x: float, y: float, width: float, height: float):
+        """World-space ``(origin, direction)`` through pixel ``x``, ``y`` of a ``width`` x ``height`` view."""
+        rig = self.rig(scene_name)
+        if rig.pose is not None:
+            origin, forward = [float(c) for c in rig.pose[0]], [float(c) for c in rig.pose[1]]
+        else:
+            origin, forward = rig.position(), rig.forward()
+        length = math.sqrt(sum(c * c for c in forward)) or 1.0
+        forward = [c / length for c in forward]
+        right = _cross(forward, rig.up)
+        length = math.sqrt(sum(c * c for c in right)) or 1.0
+        right = [c / length for c in right]
+        up = _cross(right, forward)
+        half_height = math.tan(math.radians(rig.fov) / 2.0)
+        half_width = half_height * (width / height if height else 1.0)
+        sx = (2.0 * float(x) / width - 1.0) * half_width if width else 0.0
+        sy = (1.0 - 2.0 * float(y) / height) * half_height if height else 0.0
+        return origin, [forward[i] + right[i] * sx + up[i] * sy for i in range(3)]
+
+    def flush(self) -> int:
+        calls = 0
+        for scene_name, rig in self.rigs.items():
+            if not rig.dirty:
+                continue
+            rig.dirty = False
+            scene = self.scenes.engine_scene(scene_name)
+            if scene is None:
+                continue
+            if rig.pose is not None:
+                position, forward = rig.pose
+            else:
+                position, forward = rig.position(), rig.forward()
+            try:
+                CoronaEngine.Scene.setCamera(scene, position, forward, rig.up, rig.fov)
+                calls += 1
+            except Exception as e:
+                print(f"摄像头移动错误: {str(e)}")
+        self.engine_calls += calls
+        return calls
+
+    def _clamp_pitch(self, pitch: float) -> float:
+        return max(-self.pitch_limit, min(self.pitch_limit, pitch))
+
+    def _input(self) -> None:
+        self.inputs += 1
+        if self.frame_scheduler is not None:
+            self.frame_scheduler.notify_activity()
+
+    def stats(self) -> dict:
+        return {
+            "inputs": self.inputs,
+            "updates": self.updates,
+            "engine_calls": self.engine_calls,
+            "moving": sum(1 for rig in self.rigs.values() if rig.moving()),
+        }
+
+
+def _cross(a, b) -> list[float]:
+    return [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
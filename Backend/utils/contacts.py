@@ -0,0 +1,239 @@
+import inspect
+import sys
+import traceback
+
+import numpy as np
+
+from utils.script_scheduler import get_script_scheduler
+
+_contact_system_singleton = None
+
+EVENTS = ("begin", "stay", "end")
+
+
+def get_contact_system():
+    global _contact_system_singleton
+    if _contact_system_singleton is None:
+        from utils.spatial_index import get_spatial_index
+
+        _contact_system_singleton = ContactSystem(get_spatial_index())
+    return _contact_system_singleton
+
+
+def on_contact(event: str = "begin", other: str = ""):
+    """Decorator for Blockly scripts: ``@on_contact("begin", "cube.obj")`` runs the function with the
+    other actor's name when this script's actor starts touching ``cube.obj`` (any actor if empty).
+    """
+    module_globals = sys._getframe(1).f_globals
+    owner = module_globals.get("__name__")
+    scene_name, actor_name = module_globals["SCENE_NAME"], module_globals["ACTOR_NAME"]
+
+    def decorator(handler):
+        get_contact_system().bind(scene_name, actor_name, event, handler, other=other, owner=owner)
+        return handler
+
+    return decorator
+
+
+class ContactSystem:
+    """Begin/stay/end contact events, diffed each frame from the rows the spatial index re-binned."""
+
+    def __init__(self, index, scheduler=None):
+        self.index = index
+        self.store = index.store
+        self.scenes = index.scenes
+        self._scheduler = scheduler
+        self.on_error = None
+        self.watchdog = None
+        self.contacts: dict[int, set[int]] = {}
+        self._handlers: dict[int, list[tuple[str, str, object, object]]] = {}
+        self._by_owner: dict[object, list[tuple[int, tuple]]] = {}
+        self._stay: dict[int, int] = {}  # actor handle -> number of stay handlers
+        self.pairs = 0
+        self.began = 0
+        self.ended = 0
+        self.tested = 0
+        self.dispatched = 0
+
+    @property
+    def scheduler(self):
+        if self._scheduler is None:
+            self._scheduler = get_script_scheduler()
+        return self._scheduler
+
+    # Subscriptions
+    def bind(self, scene_name: str, actor_name: str, event: str, handler, other: str = "", owner=None) -> int:
+        """Call ``handler(other_name)`` on ``event`` for an actor; returns the actor handle."""
+        if event not in EVENTS:
+            raise ValueError(f"未知的碰撞事件: {event}")
+        actor = self.scenes.require(scene_name, actor_name)
+        entry = (event, other, owner, handler)
+        self._handlers.setdefault(actor.handle, []).append(entry)
+        self._by_owner.setdefault(owner, []).append((actor.handle, entry))
+        if event == "stay":
+            self._stay[actor.handle] = self._stay.get(actor.handle, 0) + 1
+        return actor.handle
+
+    def unbind_owner(self, owner) -> int:
+        entries = self._by_owner.pop(owner, ())
+        for handle, entry in entries:
+            handlers = self._handlers.get(handle)
+            if handlers is None:
+                continue
+            try:
+                handlers.remove(entry)
+            except ValueError:
+                continue
+            if not handlers:
+                del self._handlers[handle]
+            if entry[0] == "stay":
+                self._stay[handle] -= 1
+                if not self._stay[handle]:
+                    del self._stay[handle]
+        return len(entries)
+
+    def forget(self, handle: int) -> int:
+        """End every contact of an actor that left the scene; returns how many ended."""
+        touching = self.contacts.pop(handle, None)
+        if not touching:
+            return 0
+        for other in touching:
+            partners = self.contacts.get(other)
+            if partners is not None:
+                partners.discard(handle)
+                if not partners:
+                    del self.contacts[other]
+            self._dispatch(other, "end", handle)
+        self.pairs -= len(touching)
+        self.ended += len(touching)
+        return len(touching)
+
+    def touching(self, handle: int) -> tuple[int, ...]:
+        return tuple(self.contacts.get(handle, ()))
+
+    # Per frame
+    def update(self) -> int:
+        """Diff the contacts of the actors moved this frame and dispatch events; returns the changes."""
+        changes = 0
+        rows = self.index.moved_rows
+        if rows.size:
+            changes = self._refresh(rows)
+        for handle in list(self._stay):
+            for other in list(self.contacts.get(handle, ())):
+                self._dispatch(handle, "stay", other)
+        return changes
+
+    def _refresh(self, rows) -> int:
+        index = self.index
+        handles = self.store.handles
+        indexed = index.scene[rows] != 0
+        for row in rows[~indexed].tolist():
+            handle = int(index.row_handle[row])
+            if handle not in self.store:
+                self.forget(handle)
+        live = rows[indexed]
+        if not live.size:
+            return 0
+        first, second = self._candidate_pairs(live)
+        self.tested += len(first)
+        now = {handle: set() for handle in handles[live].tolist()}
+        if first:
+            a = np.fromiter(first, dtype=np.intp, count=len(first))
+            b = np.fromiter(second, dtype=np.intp, count=len(second))
+            hit = (index.lo[a] <= index.hi[b]).all(axis=1) & (index.hi[a] >= index.lo[b]).all(axis=1)
+            for x, y in zip(handles[a[hit]].tolist(), handles[b[hit]].tolist()):
+                now[x].add(y)
+        began, ended = set(), set()
+        empty = frozenset()
+        for handle, touching in now.items():
+            before = self.contacts.get(handle, empty)
+            if touching == before:
+                continue
+            for other in touching - before:
+                began.add((handle, other) if handle < other else (other, handle))
+            for other in before - touching:
+                ended.add((handle, other) if handle < other else (other, handle))
+        for x, y in ended:
+            for a, b in ((x, y), (y, x)):
+                partners = self.contacts.get(a)
+                if partners is not None:
+                    partners.discard(b)
+                    if not partners:
+                        del self.contacts[a]
+        for x, y in began:
+            self.contacts.setdefault(x, set()).add(y)
+            self.contacts.setdefault(y, set()).add(x)
+        self.pairs += len(began) - len(ended)
+        self.began += len(began)
+        self.ended += len(ended)
+        for event, pairs in (("end", ended), ("begin", began)):
+            for x, y in pairs:
+                self._dispatch(x, event, y)
+                self._dispatch(y, event, x)
+        return len(began) + len(ended)
+
+    def _candidate_pairs(self, live) -> tuple[list[int], list[int]]:
+        """Rows sharing a grid cell with each moved row, as two parallel lists."""
+        index = self.index
+        grids = index._grids
+        first, second = [], []
+        for row, scene, c0, c1 in zip(live.tolist(), index.scene[live].tolist(), index.cell_lo[live].tolist(),
+                                      index.cell_hi[live].tolist()):
+            grid = grids[scene]
+            if row in grid.oversized:
+                found = set(index._candidates(grid, c0, c1).tolist())
+            else:
+                found = set(grid.oversized)
+                cells = grid.cells
+                for x in range(c0[0], c1[0] + 1):
+                    for y in range(c0[1], c1[1] + 1):
+                        for z in range(c0[2], c1[2] + 1):
+                            members = cells.get((x, y, z))
+                            if members:
+                                found |= members
+            found.discard(row)
+            if found:
+                first.extend([row] * len(found))
+                second.extend(found)
+        return first, second
+
+    def _dispatch(self, handle: int, event: str, other: int) -> None:
+        handlers = self._handlers.get(handle)
+        if not handlers:
+            return
+        other_name = None
+        for kind, wanted, owner, handler in list(handlers):
+            if kind != event:
+                continue
+            if other_name is None:
+                actor = self.scenes.actor(other)
+                other_name = actor.name if actor is not None else ""
+            if wanted and wanted != other_name:
+                continue
+            self.dispatched += 1
+            try:
+                if inspect.isgeneratorfunction(handler):
+                    self.scheduler.spawn(handler, other_name, name=f"{owner}:contact_{event}", owner=owner)
+                else:
+                    handler(other_name)
+            except Exception as e:
+                if self.on_error is None:
+                    print(f"[ContactSystem] 碰撞事件 {event} 的处理函数出错: {str(e)}")
+                    continue
+                try:
+                    self.on_error(owner, e, traceback.format_exc())
+                except Exception:
+                    pass
+            finally:
+                if self.watchdog is not None and self.watchdog.fired is not None:
+                    self.watchdog.settle()
+
+    def stats(self) -> dict:
+        return {
+            "contacts": self.pairs,
+            "began": self.began,
+            "ended": self.ended,
+            "tested": self.tested,
+            "dispatched": self.dispatched,
+            "subscribed": len(self._handlers),
+        }
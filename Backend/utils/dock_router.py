@@ -0,0 +1,87 @@
+import json
+
+_dock_router_singleton = None
+
+
+def get_dock_router():
+    global _dock_router_singleton
+    if _dock_router_singleton is None:
+        _dock_router_singleton = DockRouter()
+    return _dock_router_singleton
+
+
+class DockRouter:
+    """Delivers dock events to the docks subscribed to them."""
+
+    def __init__(self):
+        self._by_type: dict[str, dict[str, list[tuple[object, bool]]]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.parsed = 0
+
+    def subscribe(self, routename: str, event_type: str, callback, parsed: bool = False) -> None:
+        routes = self._by_type.setdefault(event_type, {})
+        routes.setdefault(routename, []).append((callback, parsed))
+
+    def unsubscribe(self, routename: str, event_type: str | None = None, callback=None) -> None:
+        event_types = [event_type] if event_type is not None else list(self._by_type)
+        for name in event_types:
+            routes = self._by_type.get(name)
+            if not routes or routename not in routes:
+                continue
+            if callback is None:
+                del routes[routename]
+            else:
+                remaining = [entry for entry in routes[routename] if entry[0] != callback]
+                if remaining:
+                    routes[routename] = remaining
+                else:
+                    del routes[routename]
+            if not routes:
+                del self._by_type[name]
+
+    def subscribers(self, event_type: str) -> list[str]:
+        return list(self._by_type.get(event_type, ()))
+
+    def publish(self, event_type: str, event_data: str, routename: str | None = None) -> int:
+        self.published += 1
+        routes = self._by_type.get(event_type)
+        if not routes:
+            return 0
+        payload = None
+        if routename is None and isinstance(event_data, str) and '"routename"' in event_data:
+            payload = self._parse(event_data)
+            if isinstance(payload, dict):
+                routename = payload.get("routename")
+        if routename is not None:
+            entries = routes.get(routename)
+            if not entries:
+                return 0
+            targets = [entries]
+        else:
+            targets = list(routes.values())
+        delivered = 0
+        for entries in targets:
+            for callback, wants_payload in list(entries):
+                if wants_payload and payload is None:
+                    payload = self._parse(event_data)
+                try:
+                    callback(event_type, event_data, payload)
+                except Exception as e:
+                    print(f"[DockRouter] 分发 {event_type} 失败: {str(e)}")
+                delivered += 1
+        self.delivered += delivered
+        return delivered
+
+    def _parse(self, event_data):
+        if not isinstance(event_data, str):
+            return event_data or {}
+        self.parsed += 1
+        try:
+            return json.loads(event_data)
+        except ValueError:
+            return {}
+
+    def stats(self) -> dict:
+        return {"published": self.published, "delivered": self.delivered, "parsed": self.parsed,
+                "subscriptions": sum(len(routes) for routes in self._by_type.values())}
@@ -0,0 +1,132 @@
+import statistics
+import time
+from collections import deque
+
+from utils.script_watchdog import ScriptTimeout
+
+_frame_scheduler_singleton = None
+
+
+def get_frame_scheduler():
+    global _frame_scheduler_singleton
+    if _frame_scheduler_singleton is None:
+        _frame_scheduler_singleton = FrameScheduler()
+    return _frame_scheduler_singleton
+
+
+class FrameScheduler:
+    """Paced frame loop with a fixed-timestep update phase."""
+
+    def __init__(self, target_fps: float = 60.0, fixed_dt: float = 1.0 / 60.0, idle_fps: float = 10.0,
+                 idle_after: float = 2.0, events_slice_ms: int = 4, max_updates_per_frame: int = 5,
+                 clock=time.perf_counter, sleep=time.sleep):
+        self.target_fps = target_fps
+        self.fixed_dt = fixed_dt
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+        self.events_slice_ms = events_slice_ms
+        self.max_updates_per_frame = max_updates_per_frame
+        self.clock = clock
+        self.sleep = sleep
+
+        self.process_events = None
+        self.is_minimized = None
+        self.has_active_scripts = None
+        self._updates = []
+        self._frame_end = []
+
+        self.running = False
+        self.frame_count = 0
+        self._accumulator = 0.0
+        self._last_frame = None
+        self._last_activity = clock()
+        self._frame_times: deque[float] = deque(maxlen=600)
+        self._cpu_start = None
+        self._wall_start = None
+
+    def add_update(self, callback) -> None:
+        """Register callback(dt), called once per fixed step."""
+        self._updates.append(callback)
+
+    def add_frame_end(self, callback) -> None:
+        """Register callback(), called once per frame after the update phase."""
+        self._frame_end.append(callback)
+
+    def notify_activity(self) -> None:
+        self._last_activity = self.clock()
+
+    def is_idle(self) -> bool:
+        if self.is_minimized is not None and self.is_minimized():
+            return True
+        if self.has_active_scripts is not None and self.has_active_scripts():
+            return False
+        return self.clock() - self._last_activity > self.idle_after
+
+    def frame_interval(self) -> float:
+        return 1.0 / (self.idle_fps if self.is_idle() else self.target_fps)
+
+    def run_once(self) -> int:
+        """Run a single frame and return the number of fixed update steps taken."""
+        now = self.clock()
+        if self._last_frame is None:
+            self._last_frame = now - self.fixed_dt
+            self._cpu_start = time.process_time()
+            self._wall_start = now
+        elapsed = now - self._last_frame
+        self._last_frame = now
+        self._frame_times.append(elapsed)
+        self.frame_count += 1
+
+        if self.process_events is not None:
+            self.process_events(self.events_slice_ms)
+
+        fixed_dt = self.fixed_dt
+        self._accumulator += elapsed
+        steps = 0
+        while self._accumulator >= fixed_dt and steps < self.max_updates_per_frame:
+            for callback in self._updates:
+                try:
+                    callback(fixed_dt)
+                except ScriptTimeout:
+                    pass
+            self._accumulator -= fixed_dt
+            steps += 1
+        if steps == self.max_updates_per_frame and self._accumulator > fixed_dt:
+            self._accumulator = fixed_dt
+
+        for callback in self._frame_end:
+            try:
+                callback()
+            except ScriptTimeout:
+                pass
+        return steps
+
+    def run_forever(self) -> None:
+        self.running = True
+        while self.running:
+            frame_start = self.clock()
+            self.run_once()
+            remaining = self.frame_interval() - (self.clock() - frame_start)
+            if remaining > 0:
+                self.sleep(remaining)
+
+    def stop(self) -> None:
+        self.running = False
+
+    def stats(self) -> dict:
+        """Frame pacing over the last frames: fps, mean/p99 frame time, jitter (stdev) and CPU use."""
+        samples = list(self._frame_times)
+        if len(samples) < 2:
+            return {"frames": self.frame_count}
+        ordered = sorted(samples)
+        mean = statistics.fmean(samples)
+        wall = self.clock() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        return {
+            "frames": self.frame_count,
+            "fps": 1.0 / mean if mean > 0 else 0.0,
+            "mean_ms": mean * 1000.0,
+            "p99_ms": ordered[int(len(ordered) * 0.99) - 1] * 1000.0,
+            "jitter_ms": statistics.pstdev(samples) * 1000.0,
+            "cpu_percent": 100.0 * cpu / wall if wall > 0 else 0.0,
+        }
@@ -0,0 +1,172 @@
+import json
+
+from utils.key_bindings import normalize_key
+
+_input_state_singleton = None
+
+BUTTON_MASKS = (1, 4, 2, 8, 16)  # MouseEvent.button -> MouseEvent.buttons bit
+
+
+def get_input_state():
+    global _input_state_singleton
+    if _input_state_singleton is None:
+        _input_state_singleton = InputState()
+    return _input_state_singleton
+
+
+def _is_move(command_data) -> bool:
+    if isinstance(command_data, dict):
+        return command_data.get("type") == "mousemove"
+    return '"mousemove"' in command_data
+
+
+class InputState:
+    """Polled keyboard/mouse state for Blockly scripts, folded from the queued input events once per tick."""
+
+    def __init__(self):
+        self.frame = 0
+        self.x = 0.0
+        self.y = 0.0
+        self.dx = 0.0
+        self.dy = 0.0
+        self.wheel_x = 0.0
+        self.wheel_y = 0.0
+        self.buttons = 0
+        self.scene_name = None
+        self._has_cursor = False
+        self._pressed: set[str] = set()
+        self._went_down: set[str] = set()
+        self._went_up: set[str] = set()
+        self._clicked = 0
+        self._queue: list[str] = []
+        self._names: dict[str, str] = {}
+
+    def feed(self, command_data) -> None:
+        """Queue one event: the raw JSON string, or the already decoded dict from a structured slot."""
+        self._queue.append(command_data)
+
+    def clear(self) -> None:
+        """Release everything, e.g. when the window loses focus."""
+        self._queue.clear()
+        self._went_up.update(self._pressed)
+        self._pressed.clear()
+        self.buttons = 0
+
+    def begin_frame(self) -> None:
+        self.frame += 1
+        self.dx = self.dy = 0.0
+        self.wheel_x = self.wheel_y = 0.0
+        self._clicked = 0
+        if self._went_down:
+            self._went_down.clear()
+        if self._went_up:
+            self._went_up.clear()
+        if self._queue:
+            queue, self._queue = self._queue, []
+            last = len(queue) - 1
+            for i, command_data in enumerate(queue):
+                # Only the last of a run of mouse moves matters: position and buttons are absolute.
+                if i < last and _is_move(command_data) and _is_move(queue[i + 1]):
+                    continue
+                if isinstance(command_data, dict):
+                    self.apply(command_data)
+                    continue
+                try:
+                    payload = json.loads(command_data)
+                except (TypeError, ValueError):
+                    continue
+                if isinstance(payload, dict):
+                    self.apply(payload)
+
+    def apply(self, payload: dict) -> None:
+        kind = payload.get("type")
+        if kind == "mousemove":
+            self._move(payload)
+        elif kind == "keydown":
+            key = self._name(payload.get("key"))
+            if key and key not in self._pressed:
+                self._pressed.add(key)
+                self._went_down.add(key)
+        elif kind == "keyup":
+            key = self._name(payload.get("key"))
+            if key:
+                self._pressed.discard(key)
+                self._went_up.add(key)
+        elif kind == "mousedown":
+            self._move(payload)
+            mask = self._button_mask(payload)
+            self.buttons |= mask
+            self._clicked |= mask
+        elif kind == "mouseup":
+            self._move(payload)
+            self.buttons &= ~self._button_mask(payload)
+        elif kind == "wheel":
+            self.wheel_x += payload.get("deltaX") or 0.0
+            self.wheel_y += payload.get("deltaY") or 0.0
+        elif kind == "blur":
+            self.clear()
+        scene_name = payload.get("sceneName")
+        if scene_name:
+            self.scene_name = scene_name
+
+    def _move(self, payload: dict) -> None:
+        x = payload.get("clientX")
+        if x is not None:
+            y = payload.get("clientY", self.y)
+            if self._has_cursor:
+                self.dx += x - self.x
+                self.dy += y - self.y
+            self._has_cursor = True
+            self.x, self.y = x, y
+        buttons = payload.get("buttons")
+        if buttons is not None:
+            self.buttons = buttons
+
+    @staticmethod
+    def _button_mask(payload: dict) -> int:
+        button = payload.get("button", 0)
+        return BUTTON_MASKS[button] if 0 <= button < len(BUTTON_MASKS) else 0
+
+    def _name(self, key) -> str | None:
+        if not isinstance(key, str) or not key:
+            return None
+        name = self._names.get(key)
+        if name is None:
+            name = self._names[key] = normalize_key(key)
+        return name
+
+    def key_down(self, key) -> bool:
+        name = self._name(str(key))
+        return name in self._pressed or name in self._went_down
+
+    def key_up(self, key) -> bool:
+        return not self.key_down(key)
+
+    def key_pressed(self, key) -> bool:
+        """True only in the frame the key went down."""
+        return self._name(str(key)) in self._went_down
+
+    def key_released(self, key) -> bool:
+        """True only in the frame the key came up."""
+        return self._name(str(key)) in self._went_up
+
+    def any_key_down(self) -> bool:
+        return bool(self._pressed or self._went_down)
+
+    def mouse_down(self, button: int | None = None) -> bool:
+        held = self.buttons | self._clicked
+        if button is None:
+            return held != 0
+        return bool(held & BUTTON_MASKS[button]) if 0 <= button < len(BUTTON_MASKS) else False
+
+    def mouse_up(self, button: int | None = None) -> bool:
+        return not self.mouse_down(button)
+
+    def mouse_position(self) -> tuple[float, float]:
+        return self.x, self.y
+
+    def mouse_delta(self) -> tuple[float, float]:
+        return self.dx, self.dy
+
+    def wheel_delta(self) -> tuple[float, float]:
+        return self.wheel_x, self.wheel_y
@@ -0,0 +1,154 @@
+import inspect
+import sys
+import traceback
+
+from utils.script_scheduler import get_script_scheduler
+
+_key_bindings_singleton = None
+
+MODIFIER_ORDER = ("ctrl", "alt", "shift", "meta")
+_MODIFIER_ALIASES = {
+    "ctrl": "ctrl", "control": "ctrl", "ctl": "ctrl",
+    "alt": "alt", "option": "alt", "opt": "alt",
+    "shift": "shift",
+    "meta": "meta", "cmd": "meta", "command": "meta", "win": "meta", "super": "meta",
+}
+_KEY_ALIASES = {
+    " ": "space", "spacebar": "space", "esc": "escape", "return": "enter",
+    "up": "arrowup", "down": "arrowdown", "left": "arrowleft", "right": "arrowright",
+    "del": "delete", "plus": "+",
+}
+
+
+def get_key_bindings():
+    global _key_bindings_singleton
+    if _key_bindings_singleton is None:
+        _key_bindings_singleton = KeyBindings()
+    return _key_bindings_singleton
+
+
+def normalize_key(text: str) -> str:
+    """Canonical form of a key or combo: ``"Ctrl+Alt+K"`` -> ``"ctrl+alt+k"``, ``" "`` -> ``"space"``."""
+    if text in ("+", " "):
+        return _KEY_ALIASES.get(text, text)
+    parts = [part.strip() for part in text.split("+")]
+    if text.endswith("+"):
+        parts[-1] = "+"
+    modifiers = set()
+    key = ""
+    for part in parts:
+        lowered = part.lower()
+        modifier = _MODIFIER_ALIASES.get(lowered)
+        if modifier is not None:
+            modifiers.add(modifier)
+        elif part:
+            key = _KEY_ALIASES.get(lowered, lowered)
+    return combo_key(key, *(m in modifiers for m in MODIFIER_ORDER)) if key else "+".join(
+        m for m in MODIFIER_ORDER if m in modifiers)
+
+
+def combo_key(key: str, ctrl: bool = False, alt: bool = False, shift: bool = False, meta: bool = False) -> str:
+    """Build the canonical combo for an already-normalised key and modifier flags."""
+    if not (ctrl or alt or shift or meta):
+        return key
+    prefix = ("ctrl+" if ctrl else "") + ("alt+" if alt else "") + ("shift+" if shift else "") + \
+        ("meta+" if meta else "")
+    return prefix + key
+
+
+def on_key(*keys):
+    """Decorator for Blockly scripts: ``@on_key("A")`` binds the function to key A."""
+    owner = sys._getframe(1).f_globals.get("__name__")
+
+    def decorator(handler):
+        bindings = get_key_bindings()
+        for key in keys:
+            bindings.bind(key, handler, owner=owner)
+        return handler
+
+    return decorator
+
+
+class KeyBindings:
+    """Maps normalised keys and combos to script handlers."""
+
+    def __init__(self, scheduler=None):
+        self._scheduler = scheduler
+        self.on_error = None
+        self.watchdog = None
+        self._bindings: dict[str, list[tuple[object, object]]] = {}
+        self._by_owner: dict[object, list[tuple[str, object]]] = {}
+
+    @property
+    def scheduler(self):
+        if self._scheduler is None:
+            self._scheduler = get_script_scheduler()
+        return self._scheduler
+
+    @property
+    def active(self) -> bool:
+        return bool(self._bindings)
+
+    def __contains__(self, key: str) -> bool:
+        return normalize_key(key) in self._bindings
+
+    def bind(self, key: str, handler, owner=None) -> str:
+        combo = normalize_key(key)
+        entry = (owner, handler)
+        self._bindings.setdefault(combo, []).append(entry)
+        self._by_owner.setdefault(owner, []).append((combo, entry))
+        return combo
+
+    def unbind_owner(self, owner) -> int:
+        entries = self._by_owner.pop(owner, ())
+        for combo, entry in entries:
+            handlers = self._bindings.get(combo)
+            if handlers is None:
+                continue
+            try:
+                handlers.remove(entry)
+            except ValueError:
+                continue
+            if not handlers:
+                del self._bindings[combo]
+        return len(entries)
+
+    def clear(self) -> None:
+        self._bindings.clear()
+        self._by_owner.clear()
+
+    def dispatch_key(self, key: str, ctrl: bool = False, alt: bool = False, shift: bool = False,
+                     meta: bool = False) -> int:
+        """Run the handlers bound to a DOM ``KeyboardEvent.key``; returns how many ran."""
+        lowered = key.lower()
+        base = _KEY_ALIASES.get(lowered, lowered)
+        handlers = self._bindings.get(combo_key(base, ctrl, alt, shift, meta))
+        if handlers is None and shift and not (ctrl or alt or meta):
+            handlers = self._bindings.get(base)
+        if not handlers:
+            return 0
+        return self.dispatch_handlers(base, handlers)
+
+    def dispatch(self, combo: str) -> int:
+        handlers = self._bindings.get(normalize_key(combo))
+        return self.dispatch_handlers(combo, handlers) if handlers else 0
+
+    def dispatch_handlers(self, combo: str, handlers) -> int:
+        for owner, handler in list(handlers):
+            try:
+                if inspect.isgeneratorfunction(handler):
+                    self.scheduler.spawn(handler, name=f"{owner}:{combo}", owner=owner)
+                else:
+                    handler()
+            except Exception as e:
+                if self.on_error is None:
+                    print(f"[KeyBindings] 按键 {combo} 的处理函数出错: {str(e)}")
+                    continue
+                try:
+                    self.on_error(owner, e, traceback.format_exc())
+                except Exception:
+                    pass
+            finally:
+                if self.watchdog is not None and self.watchdog.fired is not None:
+                    self.watchdog.settle()
+        return len(handlers)
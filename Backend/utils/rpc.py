@@ -0,0 +1,193 @@
+import math
+import queue
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+_rpc_server_singleton = None
+
+
+def get_rpc_server():
+    global _rpc_server_singleton
+    if _rpc_server_singleton is None:
+        from utils.frame_scheduler import get_frame_scheduler
+
+        _rpc_server_singleton = RpcServer(wake=get_frame_scheduler().notify_activity)
+    return _rpc_server_singleton
+
+
+class RpcError(Exception):
+    pass
+
+
+class CancelToken:
+    """Handed to every RPC handler; long handlers poll ``cancelled`` and give up early."""
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class RpcRequest:
+    __slots__ = ("owner", "id", "method", "reply", "token", "deadline", "future")
+
+    def __init__(self, owner, request_id, method, reply, deadline):
+        self.owner = owner
+        self.id = request_id
+        self.method = method
+        self.reply = reply
+        self.token = CancelToken()
+        self.deadline = deadline
+        self.future = None
+
+
+class RpcServer:
+    """Request/response calls from the web pages, answered only to the page that asked."""
+
+    def __init__(self, max_workers: int = 4, default_timeout: float = 30.0, wake=None, clock=time.monotonic):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.wake = wake
+        self.clock = clock
+        self._methods: dict[str, tuple[object, bool, float | None]] = {}
+        self._pending: dict[tuple[object, int], RpcRequest] = {}
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._executor = None
+        self.calls = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+    def register(self, name: str, handler, threaded: bool = False, timeout: float | None = None) -> None:
+        self._methods[name] = (handler, threaded, timeout)
+
+    def method(self, name: str | None = None, threaded: bool = False, timeout: float | None = None):
+        def decorator(handler):
+            self.register(name or handler.__name__, handler, threaded, timeout)
+            return handler
+        return decorator
+
+    def methods(self) -> list[str]:
+        return sorted(self._methods)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def call(self, owner, request_id: int, method: str, params, reply, timeout: float | None = None) -> None:
+        self.calls += 1
+        entry = self._methods.get(method)
+        if entry is None:
+            self.failed += 1
+            reply(request_id, {"id": request_id, "ok": False, "error": f"未知的 RPC 方法: {method}"})
+            return
+        handler, threaded, method_timeout = entry
+        if timeout is None:
+            timeout = method_timeout if method_timeout is not None else self.default_timeout
+        key = (owner, request_id)
+        previous = self._pending.pop(key, None)
+        if previous is not None:
+            previous.token.cancel()
+        request = RpcRequest(owner, request_id, method, reply, self.clock() + timeout if timeout > 0 else math.inf)
+        params = params if params is not None else {}
+        self._pending[key] = request
+        if not threaded:
+            try:
+                result = handler(params, request.token)
+            except Exception as e:
+                self._finish(request, False, self._error(method, e))
+            else:
+                self._finish(request, True, result)
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rpc")
+        request.future = self._executor.submit(self._run, request, handler, params)
+
+    def _run(self, request: RpcRequest, handler, params) -> None:
+        if request.token.cancelled:
+            return
+        try:
+            outcome = (True, handler(params, request.token))
+        except Exception as e:
+            outcome = (False, self._error(request.method, e))
+        self._done.put((request, *outcome))
+        if self.wake is not None:
+            self.wake()
+
+    def _error(self, method: str, error: Exception) -> str:
+        if not isinstance(error, RpcError):
+            print(f"[RPC] {method} 失败: {str(error)}")
+            traceback.print_exc()
+        return str(error)
+
+    def _finish(self, request: RpcRequest, ok: bool, value) -> bool:
+        key = (request.owner, request.id)
+        if self._pending.get(key) is not request:
+            return False
+        del self._pending[key]
+        if ok:
+            self.completed += 1
+            response = {"id": request.id, "ok": True, "result": value}
+        else:
+            self.failed += 1
+            response = {"id": request.id, "ok": False, "error": value}
+        try:
+            request.reply(request.id, response)
+        except Exception as e:
+            print(f"[RPC] 回复 {request.method} 失败: {str(e)}")
+        return True
+
+    def cancel(self, owner, request_id: int) -> bool:
+        request = self._pending.pop((owner, request_id), None)
+        if request is None:
+            return False
+        self._drop(request)
+        return True
+
+    def cancel_owner(self, owner) -> int:
+        doomed = [key for key in self._pending if key[0] is owner]
+        for key in doomed:
+            self._drop(self._pending.pop(key))
+        return len(doomed)
+
+    def _drop(self, request: RpcRequest) -> None:
+        request.token.cancel()
+        if request.future is not None:
+            request.future.cancel()
+        self.cancelled += 1
+
+    def pump(self) -> int:
+        """Deliver finished threaded calls and expire overdue ones; returns the number of replies."""
+        replies = 0
+        while True:
+            try:
+                request, ok, value = self._done.get_nowait()
+            except queue.Empty:
+                break
+            replies += self._finish(request, ok, value)
+        if self._pending:
+            now = self.clock()
+            for request in [r for r in self._pending.values() if r.deadline <= now]:
+                request.token.cancel()
+                if request.future is not None:
+                    request.future.cancel()
+                if self._finish(request, False, f"RPC {request.method} 超时"):
+                    self.failed -= 1
+                    self.timeouts += 1
+                    replies += 1
+        return replies
+
+    def shutdown(self) -> None:
+        for key in list(self._pending):
+            self._drop(self._pending.pop(key))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "completed": self.completed, "failed": self.failed, "timeouts": self.timeouts,
+                "cancelled": self.cancelled, "pending": len(self._pending)}
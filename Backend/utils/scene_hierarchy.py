@@ -0,0 +1,280 @@
+import numpy as np
+
+_scene_hierarchy_singleton = None
+
+
+def get_scene_hierarchy():
+    global _scene_hierarchy_singleton
+    if _scene_hierarchy_singleton is None:
+        from utils.transform_store import get_transform_store
+
+        store = get_transform_store()
+        _scene_hierarchy_singleton = SceneHierarchy(store)
+        store.hierarchy = _scene_hierarchy_singleton
+    return _scene_hierarchy_singleton
+
+
+class SceneHierarchy:
+    """Parent/child links between actors; store rows of linked actors hold local transforms."""
+
+    def __init__(self, store):
+        self.store = store
+        self.scenes = store.scenes
+        self.parent = np.full(0, -1, dtype=np.intp)
+        self.linked = np.zeros(0, dtype=bool)  # rows with a parent
+        self.world = np.zeros((0, 4, 4))
+        self.local = np.zeros((0, 4, 4))  # cached local matrices, rebuilt only for written rows
+        self.world_position = np.zeros((0, 3))
+        self.world_rotation = np.zeros((0, 3))
+        self.world_scale = np.zeros((0, 3))
+        self.children: dict[int, set[int]] = {}
+        self._levels: list[np.ndarray] | None = []
+        self._tree_rows = np.zeros(0, dtype=np.intp)
+        self._relinked: set[int] = set()
+        self.updates = 0
+        self.recomputed = 0
+        self._ensure(len(store.alive))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.linked))
+
+    def _ensure(self, capacity: int) -> None:
+        if capacity <= len(self.parent):
+            return
+        for name, fill in (("parent", -1), ("linked", False), ("world", 0.0), ("local", 0.0), ("world_position", 0.0),
+                           ("world_rotation", 0.0), ("world_scale", 1.0)):
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    # Links
+    def attach(self, child: int, parent: int | None, keep_world: bool = True) -> None:
+        """Make ``parent`` the parent of ``child`` (None detaches it); ``keep_world`` keeps it in place."""
+        store = self.store
+        child_actor = self.scenes.actor(child)
+        if child_actor is None:
+            raise ValueError(f"角色 {child} 不存在")
+        self._ensure(len(store.alive))
+        row = store.row(child)
+        parent_row = -1
+        if parent is not None:
+            parent_actor = self.scenes.actor(parent)
+            if parent_actor is None:
+                raise ValueError(f"角色 {parent} 不存在")
+            if parent_actor.scene is not child_actor.scene:
+                raise ValueError(f"角色 '{child_actor.name}' 和 '{parent_actor.name}' 不在同一场景")
+            parent_row = store.row(parent)
+            self._ensure(len(store.alive))
+            ancestor = parent_row
+            while ancestor != -1:
+                if ancestor == row:
+                    raise ValueError(f"不能把 '{child_actor.name}' 挂到它自己的子角色 '{parent_actor.name}' 下")
+                ancestor = int(self.parent[ancestor])
+        old_parent = int(self.parent[row])
+        if old_parent == parent_row:
+            return
+        if keep_world:
+            local = self._world_of(row)
+            if parent_row != -1:
+                local = np.linalg.inv(self._world_of(parent_row)) @ local
+            position, rotation, scale = _decompose(local[None])
+            store.position[row], store.rotation[row], store.scale[row] = position[0], rotation[0], scale[0]
+        if old_parent != -1:
+            siblings = self.children[old_parent]
+            siblings.discard(row)
+            if not siblings:
+                del self.children[old_parent]
+        self.parent[row] = parent_row
+        self.linked[row] = parent_row != -1
+        if parent_row != -1:
+            self.children.setdefault(parent_row, set()).add(row)
+        else:
+            # Back at the root its world transform is its local one again.
+            store.dirty[row] = True
+            store.dirty_rows[row] = True
+            store.moved[row] = True
+        self._relinked.add(row)
+        if parent_row != -1:
+            self._relinked.add(parent_row)  # a new root needs its world matrix cached
+        self._levels = None
+
+    def detach(self, child: int, keep_world: bool = True) -> None:
+        self.attach(child, None, keep_world)
+
+    def forget(self, handle: int) -> None:
+        """Unlink an actor that is leaving the scene; its children stay where they are, at the root."""
+        row = self.store._rows.get(handle)
+        if row is None or row >= len(self.parent):
+            return
+        for child in list(self.children.get(row, ())):
+            self.detach(int(self.store.handles[child]))
+        if self.parent[row] != -1:
+            self.detach(handle, keep_world=False)
+
+    def parent_of(self, handle: int) -> int | None:
+        row = self.store._rows.get(handle)
+        if row is None or row >= len(self.parent) or self.parent[row] == -1:
+            return None
+        return int(self.store.handles[self.parent[row]])
+
+    def children_of(self, handle: int) -> list[int]:
+        row = self.store._rows.get(handle)
+        rows = sorted(self.children.get(row, ())) if row is not None else []
+        return self.store.handles[rows].tolist() if rows else []
+
+    def descendants(self, handle: int) -> list[int]:
+        row = self.store._rows.get(handle)
+        found, stack = [], [row] if row is not None else []
+        while stack:
+            for child in self.children.get(stack.pop(), ()):
+                found.append(child)
+                stack.append(child)
+        return self.store.handles[found].tolist() if found else []
+
+    def world_matrix(self, handle: int) -> np.ndarray:
+        """Current world matrix of an actor, composed from the local transforms up its chain."""
+        return self._world_of(self.store.row(handle))
+
+    def _world_of(self, row: int) -> np.ndarray:
+        store = self.store
+        chain = []
+        while row != -1:
+            chain.append(row)
+            row = int(self.parent[row]) if row < len(self.parent) else -1
+        rows = np.asarray(chain, dtype=np.intp)
+        matrices = _compose(store.position[rows], store.rotation[rows], store.scale[rows])
+        world = matrices[-1]
+        for matrix in matrices[-2::-1]:
+            world = world @ matrix
+        return world
+
+    def _tree_levels(self) -> list[np.ndarray]:
+        """Rows of every tree grouped by depth: roots (rows with children but no parent) first."""
+        if self._levels is None:
+            level = [row for row in self.children if self.parent[row] == -1]
+            levels = []
+            while level:
+                levels.append(np.asarray(level, dtype=np.intp))
+                level = [child for row in level for child in self.children.get(row, ())]
+            self._levels = levels
+            self._tree_rows = np.concatenate(levels) if levels else np.zeros(0, dtype=np.intp)
+        return self._levels
+
+    # Per frame
+    def update(self) -> int:
+        """Recompute the world transforms of dirty subtrees; returns the number of child rows recomputed."""
+        store = self.store
+        self._ensure(len(store.alive))
+        levels = self._tree_levels()
+        size = store._size
+        relinked = [row for row in self._relinked if row < size]
+        self._relinked.clear()
+        if not levels:
+            return 0
+        own = store.dirty_rows[:size].copy()  # local transform written: rebuild its matrix
+        own[relinked] = True
+        if not own[self._tree_rows].any():
+            return 0
+        self.updates += 1
+        moved = own.copy()
+        turned = store.dirty[:size, 1] | store.dirty[:size, 2]
+        turned[relinked] = True
+        parent, world, local = self.parent, self.world, self.local
+        spun, shifted = [], []
+        for depth, rows in enumerate(levels):
+            if depth:
+                moved[rows] |= moved[parent[rows]]
+                turned[rows] |= turned[parent[rows]]
+            rows = rows[moved[rows]]
+            if not rows.size:
+                continue
+            rebuild = rows[own[rows]]
+            if rebuild.size:
+                local[rebuild] = _compose(store.position[rebuild], store.rotation[rebuild], store.scale[rebuild])
+            if not depth:
+                world[rows] = local[rows]
+                continue
+            # Only rows under a rotation or scale change need the full product; the rest just move.
+            spin = turned[rows]
+            full, shift = rows[spin], rows[~spin]
+            if full.size:
+                world[full] = world[parent[full]] @ local[full]
+                spun.append(full)
+            if shift.size:
+                outer = world[parent[shift]]
+                world[shift, :3, 3] = (outer[:, :3, :3] @ local[shift, :3, 3, None])[:, :, 0] + outer[:, :3, 3]
+                shifted.append(shift)
+        count = 0
+        if shifted:
+            rows = np.concatenate(shifted)
+            self.world_position[rows] = world[rows, :3, 3]
+            store.dirty[rows, 0] = True
+            store.dirty_rows[rows] = True
+            store.moved[rows] = True
+            count += rows.size
+        if spun:
+            rows = np.concatenate(spun)
+            values = _decompose(world[rows])
+            changed = np.zeros((rows.size, 3), dtype=bool)
+            for column, (array, value) in enumerate(zip((self.world_position, self.world_rotation,
+                                                         self.world_scale), values)):
+                changed[:, column] = ~np.isclose(array[rows], value).all(axis=1)
+                array[rows] = value
+            if relinked:
+                # A re-linked row's engine transform was its old local one: push every channel.
+                changed |= np.isin(rows, relinked)[:, None]
+            store.dirty[rows] |= changed
+            store.dirty_rows[rows] |= changed.any(axis=1)
+            store.moved[rows] |= changed[:, 0] | changed[:, 2]
+            count += rows.size
+        self.recomputed += count
+        return count
+
+    def override(self, rows: np.ndarray, column: int, values: np.ndarray) -> np.ndarray:
+        """Replace the local values of child rows in ``values`` (one per row) with their world values."""
+        linked = self.linked
+        inside = rows[rows < len(linked)]
+        mask = linked[inside]
+        if mask.any():
+            array = (self.world_position, self.world_rotation, self.world_scale)[column]
+            values[:len(inside)][mask] = array[inside[mask]]
+        return values
+
+    def stats(self) -> dict:
+        return {"children": len(self), "parents": len(self.children), "depth": len(self._tree_levels()),
+                "updates": self.updates, "recomputed": self.recomputed}
+
+
+def _compose(position, rotation, scale) -> np.ndarray:
+    """``(n, 4, 4)`` matrices T * Rz * Ry * Rx * S from ``(n, 3)`` position, Euler rotation and scale."""
+    cos, sin = np.cos(rotation), np.sin(rotation)
+    cx, cy, cz = cos.T
+    sx, sy, sz = sin.T
+    matrices = np.zeros((len(position), 4, 4))
+    rotation_part = matrices[:, :3, :3]
+    rotation_part[:, 0, 0] = cy * cz
+    rotation_part[:, 0, 1] = sx * sy * cz - cx * sz
+    rotation_part[:, 0, 2] = cx * sy * cz + sx * sz
+    rotation_part[:, 1, 0] = cy * sz
+    rotation_part[:, 1, 1] = sx * sy * sz + cx * cz
+    rotation_part[:, 1, 2] = cx * sy * sz - sx * cz
+    rotation_part[:, 2, 0] = -sy
+    rotation_part[:, 2, 1] = sx * cy
+    rotation_part[:, 2, 2] = cx * cy
+    rotation_part *= scale[:, None, :]
+    matrices[:, :3, 3] = position
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def _decompose(matrices) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Position, Euler rotation and (positive) scale of ``(n, 4, 4)`` matrices; inverse of ``_compose``."""
+    basis = matrices[:, :3, :3]
+    scale = np.linalg.norm(basis, axis=1)
+    rotation = basis / np.where(scale == 0.0, 1.0, scale)[:, None, :]
+    euler = np.empty((len(matrices), 3))
+    euler[:, 0] = np.arctan2(rotation[:, 2, 1], rotation[:, 2, 2])
+    euler[:, 1] = np.arcsin(np.clip(-rotation[:, 2, 0], -1.0, 1.0))
+    euler[:, 2] = np.arctan2(rotation[:, 1, 0], rotation[:, 0, 0])
+    return matrices[:, :3, 3].copy(), euler, scale
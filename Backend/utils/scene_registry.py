@@ -0,0 +1,199 @@
+import os
+
+_scene_registry_singleton = None
+
+
+def get_scene_registry():
+    global _scene_registry_singleton
+    if _scene_registry_singleton is None:
+        _scene_registry_singleton = SceneRegistry()
+    return _scene_registry_singleton
+
+
+class Scene:
+    __slots__ = ("handle", "name", "engine", "actors", "suffixes")
+
+    def __init__(self, handle: int, name: str, engine):
+        self.handle = handle
+        self.name = name
+        self.engine = engine
+        self.actors: dict[str, Actor] = {}
+        self.suffixes: dict[str, int] = {}  # next numeric suffix to try per duplicated name
+
+
+class Actor:
+    __slots__ = ("handle", "scene", "name", "path", "engine", "tags")
+
+    def __init__(self, handle: int, scene: Scene, name: str, path: str, engine, tags: frozenset):
+        self.handle = handle
+        self.scene = scene
+        self.name = name
+        self.path = path
+        self.engine = engine
+        self.tags = tags
+
+    def info(self) -> dict:
+        return {"handle": self.handle, "name": self.name, "path": self.path, "tags": sorted(self.tags)}
+
+
+_NO_TAGS = frozenset()
+
+
+class SceneRegistry:
+    """Scenes and actors of the editor, addressed by integer handles that are never reused."""
+
+    def __init__(self):
+        self._scenes: dict[str, Scene] = {}
+        self._actors: dict[int, Actor] = {}
+        self._by_path: dict[str, dict[int, Actor]] = {}  # insertion-ordered, so queries come back in handle order
+        self._by_tag: dict[str, dict[int, Actor]] = {}
+        self._tag_sets: dict[frozenset, frozenset] = {}  # actors with the same tags share one frozenset
+        self._next_handle = 1
+
+    def __contains__(self, scene_name) -> bool:
+        return scene_name in self._scenes
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    # Scenes
+    def add_scene(self, name: str, engine=None) -> Scene:
+        scene = self._scenes.get(name)
+        if scene is None:
+            scene = self._scenes[name] = Scene(self._take_handle(), name, engine)
+        elif engine is not None:
+            scene.engine = engine
+        return scene
+
+    def scene(self, name: str) -> Scene | None:
+        return self._scenes.get(name)
+
+    def require_scene(self, name: str) -> Scene:
+        scene = self._scenes.get(name)
+        if scene is None:
+            raise ValueError(f"场景 '{name}' 不存在")
+        return scene
+
+    def engine_scene(self, name: str):
+        scene = self._scenes.get(name)
+        return scene.engine if scene is not None else None
+
+    def scene_names(self) -> list[str]:
+        return list(self._scenes)
+
+    def remove_scene(self, name: str) -> list[Actor]:
+        """Drop a scene and its actors; returns the removed actors."""
+        removed = self.clear_scene(name)
+        self._scenes.pop(name, None)
+        return removed
+
+    def clear_scene(self, name: str) -> list[Actor]:
+        """Remove every actor of a scene but keep the scene; returns the removed actors."""
+        scene = self._scenes.get(name)
+        if scene is None:
+            return []
+        removed = list(scene.actors.values())
+        for actor in removed:
+            self._unindex(actor)
+        scene.actors = {}
+        scene.suffixes = {}
+        return removed
+
+    # Actors
+    def add_actor(self, scene_name: str, path: str, engine=None, name: str | None = None, tags=()) -> Actor:
+        scene = self.require_scene(scene_name)
+        name = self._unique_name(scene, name or os.path.basename(path))
+        actor = Actor(self._take_handle(), scene, name, path, engine, self._intern(tags))
+        scene.actors[name] = actor
+        self._actors[actor.handle] = actor
+        self._by_path.setdefault(path, {})[actor.handle] = actor
+        for tag in actor.tags:
+            self._by_tag.setdefault(tag, {})[actor.handle] = actor
+        return actor
+
+    def actor(self, handle: int) -> Actor | None:
+        return self._actors.get(handle)
+
+    def resolve(self, scene_name: str, actor_name: str) -> Actor | None:
+        scene = self._scenes.get(scene_name)
+        return scene.actors.get(actor_name) if scene is not None else None
+
+    def require(self, scene_name: str, actor_name: str) -> Actor:
+        actor = self.resolve(scene_name, actor_name)
+        if actor is None:
+            raise ValueError(f"角色 '{actor_name}' 不在场景 '{scene_name}' 中")
+        return actor
+
+    def actors(self, scene_name: str) -> list[Actor]:
+        scene = self._scenes.get(scene_name)
+        return list(scene.actors.values()) if scene is not None else []
+
+    def actor_names(self, scene_name: str) -> list[str]:
+        scene = self._scenes.get(scene_name)
+        return list(scene.actors) if scene is not None else []
+
+    def remove_actor(self, handle: int) -> Actor | None:
+        actor = self._actors.get(handle)
+        if actor is None:
+            return None
+        del actor.scene.actors[actor.name]
+        self._unindex(actor)
+        return actor
+
+    def find_by_path(self, path: str) -> list[Actor]:
+        return list(self._by_path.get(path, {}).values())
+
+    def find_by_tag(self, tag: str) -> list[Actor]:
+        return list(self._by_tag.get(tag, {}).values())
+
+    def tag(self, handle: int, *tags: str) -> None:
+        actor = self._actors[handle]
+        actor.tags = self._intern(actor.tags.union(tags))
+        for tag in tags:
+            self._by_tag.setdefault(tag, {})[handle] = actor
+
+    def untag(self, handle: int, *tags: str) -> None:
+        actor = self._actors[handle]
+        actor.tags = self._intern(actor.tags.difference(tags))
+        for tag in tags:
+            self._discard(self._by_tag, tag, handle)
+
+    def _intern(self, tags) -> frozenset:
+        if not tags:
+            return _NO_TAGS
+        tags = frozenset(tags)
+        return self._tag_sets.setdefault(tags, tags)
+
+    def _take_handle(self) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        return handle
+
+    @staticmethod
+    def _unique_name(scene: Scene, name: str) -> str:
+        if name not in scene.actors:
+            return name
+        stem, ext = os.path.splitext(name)
+        n = scene.suffixes.get(name, 2)
+        while f"{stem}_{n}{ext}" in scene.actors:
+            n += 1
+        scene.suffixes[name] = n + 1
+        return f"{stem}_{n}{ext}"
+
+    def _unindex(self, actor: Actor) -> None:
+        del self._actors[actor.handle]
+        self._discard(self._by_path, actor.path, actor.handle)
+        for tag in actor.tags:
+            self._discard(self._by_tag, tag, actor.handle)
+
+    @staticmethod
+    def _discard(index: dict, key, handle: int) -> None:
+        actors = index.get(key)
+        if actors is not None:
+            actors.pop(handle, None)
+            if not actors:
+                del index[key]
+
+    def stats(self) -> dict:
+        return {"scenes": len(self._scenes), "actors": len(self._actors), "paths": len(self._by_path),
+                "tags": len(self._by_tag)}
@@ -0,0 +1,122 @@
+import ast
+import hashlib
+import os
+import threading
+import types
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.script_optimizer import optimize_module
+
+_script_compiler_singleton = None
+
+
+def get_script_compiler():
+    global _script_compiler_singleton
+    if _script_compiler_singleton is None:
+        _script_compiler_singleton = ScriptCompiler()
+    return _script_compiler_singleton
+
+
+def source_hash(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def with_filename(code, filename: str):
+    """``code`` (and the code objects nested in it) rebound to ``filename``; other results pass through."""
+    if not isinstance(code, types.CodeType) or code.co_filename == filename:
+        return code
+    consts = tuple(with_filename(const, filename) for const in code.co_consts)
+    return code.replace(co_filename=filename, co_consts=consts)
+
+
+class ScriptCompiler:
+    """Compiles Blockly sources to code objects on a background thread, cached by source hash."""
+
+    def __init__(self, cache_size: int = 256, persist_dir: str | None = None, optimizer=optimize_module):
+        self.cache_size = cache_size
+        self.persist_dir = persist_dir
+        self.optimizer = optimizer
+        self._cache: OrderedDict[str, object] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="script-compiler")
+        return self._executor
+
+    def cached(self, digest: str):
+        with self._lock:
+            code = self._cache.get(digest)
+            if code is not None:
+                self._cache.move_to_end(digest)
+            return code
+
+    def _store(self, digest: str, code) -> None:
+        with self._lock:
+            self._cache[digest] = code
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def compile(self, source: str, filename: str, digest: str | None = None):
+        """Compile synchronously, going through the cache."""
+        digest = digest or source_hash(source)
+        code = self.cached(digest)
+        if code is None:
+            code = self._compile(source, filename)
+            self._store(digest, code)
+        return with_filename(code, filename)
+
+    def _compile(self, source: str, filename: str):
+        tree = ast.parse(source, filename)
+        if self.optimizer is not None:
+            try:
+                return compile(self.optimizer(tree), filename, "exec", dont_inherit=True)
+            except Exception as e:
+                print(f"[ScriptCompiler] 优化 {filename} 失败，按原样编译: {str(e)}")
+                tree = ast.parse(source, filename)
+        return compile(tree, filename, "exec", dont_inherit=True)
+
+    def compile_ir(self, source: str, filename: str, digest: str | None = None):
+        """Compile to an actor IR program when the script fits the IR, otherwise to a code object."""
+        digest = digest or source_hash(source)
+        key = "ir:" + digest
+        result = self.cached(key)
+        if result is None:
+            from utils.actor_ir import compile_ir
+
+            result = compile_ir(source, filename)
+            if result is None:
+                result = self.compile(source, filename, digest)
+            self._store(key, result)
+        return with_filename(result, filename)
+
+    def submit(self, source: str, filename: str, digest: str | None = None, ir: bool = False) -> Future:
+        """Compile on the worker thread; the future resolves to the code object (or, with ``ir``,
+        possibly an IR program) or raises SyntaxError."""
+        digest = digest or source_hash(source)
+        code = self.cached("ir:" + digest if ir else digest)
+        if code is not None:
+            future = Future()
+            future.set_result(with_filename(code, filename))
+            return future
+        return self._get_executor().submit(self.compile_ir if ir else self.compile, source, filename, digest)
+
+    def persist(self, filename: str, source: str) -> Future | None:
+        if not self.persist_dir:
+            return None
+        path = os.path.join(self.persist_dir, filename)
+
+        def write() -> str:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            return path
+
+        return self._get_executor().submit(write)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
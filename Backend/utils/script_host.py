@@ -0,0 +1,345 @@
+import hashlib
+import inspect
+import linecache
+import os
+import re
+import sys
+import traceback
+import types
+
+from utils.input_state import get_input_state
+from utils.key_bindings import get_key_bindings
+from utils.script_compiler import get_script_compiler, source_hash
+from utils.script_profiler import get_script_profiler
+from utils.script_scheduler import get_script_scheduler
+from utils.script_watchdog import ScriptTimeout, get_script_watchdog
+
+_script_host_singleton = None
+
+
+def get_script_host():
+    global _script_host_singleton
+    if _script_host_singleton is None:
+        vm = None
+        # CORONA_ACTOR_IR=1 only pays off above roughly 1000 actors; below that the VM is slower.
+        if os.environ.get("CORONA_ACTOR_IR") == "1":
+            from utils.actor_ir import ActorVM
+
+            vm = ActorVM()
+        from utils.contacts import get_contact_system
+
+        _script_host_singleton = ScriptHost(vm=vm, profiler=get_script_profiler(), watchdog=get_script_watchdog(),
+                                            key_bindings=get_key_bindings(), input_state=get_input_state(),
+                                            contacts=get_contact_system())
+    return _script_host_singleton
+
+
+def slot_module_name(scene_name: str, actor_name: str, package: str = "script") -> str:
+    """Stable, import-safe module name for the script slot of (scene_name, actor_name)."""
+    digest = hashlib.sha1(f"{scene_name}\0{actor_name}".encode("utf-8")).hexdigest()[:8]
+    readable = re.sub(r"\W", "_", f"{scene_name}_{actor_name}")[:48]
+    return f"{package}.blockly_code_{readable}_{digest}"
+
+
+class ScriptSlot:
+    __slots__ = ("key", "module_name", "filename", "source", "digest", "code", "module", "frame_calls", "version",
+                 "failed")
+
+    def __init__(self, key, module_name):
+        self.key = key
+        self.module_name = module_name
+        self.filename = f"<blockly:{key[0]}/{key[1]}>"
+        self.source = None
+        self.digest = None
+        self.code = None
+        self.module = None
+        self.frame_calls = []
+        self.version = 0
+        self.failed = False
+
+
+class ScriptHost:
+    """Runs one Blockly script module per actor and keeps it loaded between frames.
+
+    Modules may define ``init()``, ``update(dt)``, ``run()`` (a generator runs as a task) and ``dispose()``.
+    """
+
+    VM_PROFILE_NAME = "<actor-ir>"
+
+    def __init__(self, package: str = "script", scheduler=None, compiler=None, vm=None, profiler=None,
+                 watchdog=None, key_bindings=None, input_state=None, contacts=None):
+        self.package = package
+        self.profiler = profiler
+        self.watchdog = watchdog
+        self.compiler = compiler or get_script_compiler()
+        self.scheduler = scheduler or get_script_scheduler()
+        self.scheduler.on_error = self._on_task_error
+        self.scheduler.watchdog = watchdog
+        self.vm = vm
+        if vm is not None:
+            vm.on_error = self._on_vm_error
+        self.key_bindings = key_bindings
+        self.input_state = input_state
+        if key_bindings is not None:
+            key_bindings.on_error = self._report
+            key_bindings.watchdog = watchdog
+        self.contacts = contacts
+        if contacts is not None:
+            contacts.on_error = self._report
+            contacts.watchdog = watchdog
+        self.on_error = None
+        self.generation = 0
+        self._slots: dict[tuple[str, str], ScriptSlot] = {}
+        self._by_module: dict[str, ScriptSlot] = {}
+        self._framed: dict[tuple[str, str], ScriptSlot] = {}
+        self._dirty: set[tuple[str, str]] = set()
+        self._pending: dict[tuple[str, str], tuple[int, object]] = {}
+
+    def slot_module_name(self, scene_name: str, actor_name: str) -> str:
+        return slot_module_name(scene_name, actor_name, self.package)
+
+    def publish(self, scene_name: str, actor_name: str, source: str) -> ScriptSlot:
+        key = (scene_name, actor_name)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = ScriptSlot(key, self.slot_module_name(scene_name, actor_name))
+            self._slots[key] = slot
+            self._by_module[slot.module_name] = slot
+        digest = source_hash(source)
+        if digest == slot.digest and not slot.failed and key not in self._pending:
+            return slot
+        slot.source = source
+        slot.digest = digest
+        slot.version += 1
+        self.generation += 1
+        future = self.compiler.submit(source, slot.filename, digest, ir=self.vm is not None)
+        self._pending[key] = (slot.version, future)
+        return slot
+
+    def remove(self, scene_name: str, actor_name: str) -> bool:
+        slot = self._slots.pop((scene_name, actor_name), None)
+        if slot is None:
+            return False
+        self._by_module.pop(slot.module_name, None)
+        self._dirty.discard(slot.key)
+        self._pending.pop(slot.key, None)
+        self._unload(slot)
+        if self.vm is not None:
+            self.vm.remove(slot.key)
+        linecache.cache.pop(slot.filename, None)
+        return True
+
+    def remove_scene(self, scene_name: str) -> int:
+        keys = [key for key in self._slots if key[0] == scene_name]
+        for key in keys:
+            self.remove(*key)
+        return len(keys)
+
+    def reload(self) -> None:
+        self._dirty.update(key for key, slot in self._slots.items() if slot.code is not None)
+
+    def slots(self) -> list[tuple[str, str]]:
+        return list(self._slots.keys())
+
+    def _report(self, name: str, error: BaseException, stacktrace: str) -> None:
+        slot = self._by_module.get(name)
+        if slot is not None:
+            slot.failed = True
+        if isinstance(error, ScriptTimeout) and not error.args and self.watchdog is not None:
+            error = ScriptTimeout(f"运行超过 {self.watchdog.budget_for(name) * 1000:.0f} ms 预算，已挂起")
+        print(f"[ScriptHost] 脚本 {name} 出错: {str(error)}")
+        if self.on_error is not None:
+            try:
+                self.on_error(name, error, stacktrace)
+            except Exception:
+                pass
+
+    def _on_task_error(self, task, error, stacktrace) -> None:
+        self._report(task.owner or task.name, error, stacktrace)
+
+    def _on_vm_error(self, key, error, stacktrace) -> None:
+        slot = self._slots.get(key)
+        self._report(slot.module_name if slot is not None else str(key), error, stacktrace)
+
+    def _unload(self, slot: ScriptSlot) -> None:
+        if self.vm is not None:
+            self.vm.stop(slot.key)
+        self.scheduler.cancel_owner(slot.module_name)
+        if self.key_bindings is not None:
+            self.key_bindings.unbind_owner(slot.module_name)
+        if self.contacts is not None:
+            self.contacts.unbind_owner(slot.module_name)
+        module = slot.module
+        if module is not None:
+            dispose = getattr(module, "dispose", None)
+            if callable(dispose):
+                try:
+                    dispose()
+                except Exception as e:
+                    self._report(slot.module_name, e, traceback.format_exc())
+                finally:
+                    if self.watchdog is not None and self.watchdog.fired is not None:
+                        self.watchdog.settle()
+        sys.modules.pop(slot.module_name, None)
+        slot.module = None
+        slot.frame_calls = []
+        self._framed.pop(slot.key, None)
+
+    def _exec(self, slot: ScriptSlot):
+        module = types.ModuleType(slot.module_name)
+        module.__file__ = slot.filename
+        module.SCENE_NAME, module.ACTOR_NAME = slot.key
+        linecache.cache[slot.filename] = (len(slot.source), None, slot.source.splitlines(True), slot.filename)
+        sys.modules[slot.module_name] = module
+        try:
+            exec(slot.code, module.__dict__)
+        except BaseException:
+            sys.modules.pop(slot.module_name, None)
+            if self.key_bindings is not None:
+                self.key_bindings.unbind_owner(slot.module_name)
+            if self.contacts is not None:
+                self.contacts.unbind_owner(slot.module_name)
+            raise
+        finally:
+            if self.watchdog is not None and self.watchdog.fired is not None:
+                self.watchdog.settle()
+        return module
+
+    def _start(self, slot: ScriptSlot) -> None:
+        name = slot.module_name
+        module = slot.module
+        init = getattr(module, "init", None)
+        if callable(init):
+            try:
+                init()
+            except Exception as e:
+                self._report(name, e, traceback.format_exc())
+                return
+            finally:
+                if self.watchdog is not None and self.watchdog.fired is not None:
+                    self.watchdog.settle()
+
+        update = getattr(module, "update", None)
+        run = getattr(module, "run", None)
+        if callable(update):
+            slot.frame_calls.append(self._frame_call(update))
+        if callable(run):
+            if inspect.isgeneratorfunction(run):
+                self.scheduler.spawn(run, name=name, owner=name)
+            elif update is None:
+                slot.frame_calls.append(self._frame_call(run))
+        if slot.frame_calls:
+            self._framed[slot.key] = slot
+
+    def _collect_compiled(self) -> None:
+        for key, (version, future) in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[key]
+            slot = self._slots.get(key)
+            if slot is None or slot.version != version:
+                continue
+            try:
+                slot.code = future.result()
+            except Exception as e:
+                slot.digest = None
+                self._report(slot.module_name, e, "".join(traceback.format_exception(e)))
+                continue
+            self._dirty.add(key)
+
+    def _load(self, slot: ScriptSlot) -> None:
+        self._unload(slot)
+        slot.failed = False
+        if slot.code is None:
+            return
+        if not isinstance(slot.code, types.CodeType):
+            self.vm.spawn(slot.key, slot.code)
+            return
+        try:
+            slot.module = self._exec(slot)
+        except Exception as e:
+            self._report(slot.module_name, e, traceback.format_exc())
+            return
+        self._start(slot)
+
+    @staticmethod
+    def _frame_call(func):
+        try:
+            takes_dt = len(inspect.signature(func).parameters) > 0
+        except (TypeError, ValueError):
+            takes_dt = False
+        return func if takes_dt else (lambda dt: func())
+
+    def has_active_scripts(self) -> bool:
+        if len(self.scheduler) > 0 or (self.vm is not None and len(self.vm) > 0):
+            return True
+        return bool(self._framed)
+
+    def _call_frame(self, slot: ScriptSlot, dt: float) -> None:
+        watchdog = self.watchdog
+        for call in slot.frame_calls:
+            try:
+                call(dt)
+            except Exception as e:
+                self._report(slot.module_name, e, traceback.format_exc())
+                slot.frame_calls = []
+                del self._framed[slot.key]
+                return
+            finally:
+                if watchdog is not None and watchdog.fired is not None:
+                    watchdog.settle()
+
+    def tick(self, dt: float | None = None) -> None:
+        try:
+            self._tick(dt)
+        except ScriptTimeout:
+            # Raised just after its script returned; the rest of the frame runs next tick.
+            if self.profiler is not None and self.profiler.enabled:
+                self.profiler.end_frame()
+
+    def _tick(self, dt: float | None) -> None:
+        profiler = self.profiler
+        if profiler is not None and profiler.enabled:
+            profiler.begin_frame()
+            clock = profiler.clock
+            self.scheduler.profile = profiler.record
+        else:
+            profiler = None
+            self.scheduler.profile = None
+        if self.watchdog is not None:
+            self.watchdog.tick()
+        if self.input_state is not None:
+            self.input_state.begin_frame()
+        if self._pending:
+            self._collect_compiled()
+        if self._dirty:
+            dirty, self._dirty = self._dirty, set()
+            for key in dirty:
+                slot = self._slots.get(key)
+                if slot is not None:
+                    if profiler is None:
+                        self._load(slot)
+                    else:
+                        started = clock()
+                        self._load(slot)
+                        profiler.record(slot.module_name, clock() - started)
+        if dt is None:
+            dt = 0.0
+        if profiler is None:
+            for slot in list(self._framed.values()):
+                self._call_frame(slot, dt)
+        else:
+            for slot in list(self._framed.values()):
+                started = clock()
+                self._call_frame(slot, dt)
+                profiler.record(slot.module_name, clock() - started)
+        self.scheduler.step(dt)
+        if self.vm is not None:
+            if profiler is not None:
+                started = clock()
+            self.vm.step(dt)
+            self.vm.flush()
+            if profiler is not None:
+                profiler.record(self.VM_PROFILE_NAME, clock() - started)
+        if profiler is not None:
+            profiler.end_frame()
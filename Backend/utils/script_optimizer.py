@@ -0,0 +1,393 @@
+import ast
+import copy
+import operator
+
+ENGINE_NAME = "CoronaEngine"
+WAIT_UNTIL_NAME = "_blockly_wait_until"
+
+# Engine calls whose effect within a single frame only depends on the sum of their arguments.
+ADDITIVE_METHODS = frozenset({"Xadd", "Yadd", "Zadd", "sizeAdd", "rotateX", "rotateY", "move"})
+# Engine calls where only the last one of a consecutive run is observable.
+SETTER_METHODS = frozenset({"Xset", "Yset", "Zset", "sizeSet", "moveto", "movetoXYZ", "face"})
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+def _is_number(node) -> bool:
+    return isinstance(node, ast.Constant) and type(node.value) in (int, float)
+
+
+def _is_constant(node) -> bool:
+    if isinstance(node, ast.Constant):
+        return True
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return all(_is_constant(elt) for elt in node.elts)
+    return False
+
+
+def _is_vector(node) -> bool:
+    return isinstance(node, (ast.List, ast.Tuple)) and all(_is_number(elt) for elt in node.elts)
+
+
+def _constant(value, like):
+    return ast.copy_location(ast.Constant(value), like)
+
+
+class ConstantFolder(ast.NodeTransformer):
+    """Folds arithmetic, comparisons and boolean logic on literals, and drops dead ``if`` branches."""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        op = _BIN_OPS.get(type(node.op))
+        if op is None or not (_is_number(node.left) and _is_number(node.right)):
+            return node
+        try:
+            return _constant(op(node.left.value, node.right.value), node)
+        except ArithmeticError:
+            return node
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        op = _UNARY_OPS.get(type(node.op))
+        if op is None or not isinstance(node.operand, ast.Constant):
+            return node
+        if not isinstance(node.op, ast.Not) and not _is_number(node.operand):
+            return node
+        return _constant(op(node.operand.value), node)
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        operands = [node.left, *node.comparators]
+        if not all(_is_number(item) for item in operands):
+            return node
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            func = _COMPARE_OPS.get(type(op))
+            if func is None:
+                return node
+            if not func(left.value, right.value):
+                return _constant(False, node)
+        return _constant(True, node)
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        values = list(node.values)
+        # Only leading literals can be dropped without changing which operands get evaluated.
+        while len(values) > 1 and isinstance(values[0], ast.Constant):
+            if bool(values[0].value) == isinstance(node.op, ast.Or):
+                return values[0]
+            values.pop(0)
+        if len(values) == 1:
+            return values[0]
+        node.values = values
+        return node
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+        if not isinstance(node.test, ast.Constant):
+            return node
+        kept, dropped = (node.body, node.orelse) if node.test.value else (node.orelse, node.body)
+        # A dead ``yield`` still makes the function a generator, so that branch has to stay.
+        if _yields(dropped):
+            return node
+        return kept or ast.copy_location(ast.Pass(), node)
+
+
+def _engine_call(stmt):
+    """Return (receiver, method, call) for ``CoronaEngine.method(...)`` expression statements.
+
+    Other receivers are left alone: ``Actor.move`` sets an absolute position, so merging its calls
+    would change the script.
+    """
+    if not isinstance(stmt, ast.Expr) or not isinstance(stmt.value, ast.Call):
+        return None
+    call = stmt.value
+    func = call.func
+    if (call.keywords or not isinstance(func, ast.Attribute) or not isinstance(func.value, ast.Name)
+            or func.value.id != ENGINE_NAME):
+        return None
+    return func.value.id, func.attr, call
+
+
+def _sum_args(method, calls):
+    """Sum the single argument of consecutive additive calls; None if they cannot be combined."""
+    args = [call.args[0] for call in calls if len(call.args) == 1]
+    if len(args) != len(calls):
+        return None
+    if all(_is_number(arg) for arg in args):
+        return _constant(sum(arg.value for arg in args), args[0])
+    if all(_is_vector(arg) for arg in args) and len({len(arg.elts) for arg in args}) == 1:
+        totals = [sum(values) for values in zip(*([elt.value for elt in arg.elts] for arg in args))]
+        vector = type(args[0])(elts=[_constant(value, args[0]) for value in totals], ctx=ast.Load())
+        return ast.copy_location(vector, args[0])
+    return None
+
+
+def _scale_arg(arg, times):
+    if _is_number(arg):
+        return _constant(arg.value * times, arg)
+    if _is_vector(arg):
+        vector = type(arg)(elts=[_constant(elt.value * times, elt) for elt in arg.elts], ctx=ast.Load())
+        return ast.copy_location(vector, arg)
+    return None
+
+
+class TransformMerger(ast.NodeTransformer):
+    """Merges runs of transform calls on the same receiver that no code can observe in between."""
+
+    def generic_visit(self, node):
+        super().generic_visit(node)
+        for field in ("body", "orelse", "finalbody"):
+            stmts = getattr(node, field, None)
+            if isinstance(stmts, list) and stmts and isinstance(stmts[0], ast.stmt):
+                setattr(node, field, self._merge(stmts))
+        return node
+
+    def visit_For(self, node):
+        self.generic_visit(node)
+        folded = self._fold_repeat(node)
+        return node if folded is None else folded
+
+    @staticmethod
+    def _fold_repeat(node):
+        if node.orelse or not isinstance(node.target, ast.Name) or len(node.body) != 1:
+            return None
+        it = node.iter
+        if not (isinstance(it, ast.Call) and isinstance(it.func, ast.Name) and it.func.id == "range"
+                and len(it.args) == 1 and not it.keywords and _is_number(it.args[0])
+                and isinstance(it.args[0].value, int)):
+            return None
+        times = it.args[0].value
+        if times <= 0:
+            return ast.copy_location(ast.Pass(), node)
+        info = _engine_call(node.body[0])
+        if info is None or info[1] not in ADDITIVE_METHODS or len(info[2].args) != 1:
+            return None
+        if node.target.id in {n.id for n in ast.walk(info[2]) if isinstance(n, ast.Name)}:
+            return None
+        scaled = _scale_arg(info[2].args[0], times)
+        if scaled is None:
+            return None
+        info[2].args = [scaled]
+        return ast.copy_location(node.body[0], node)
+
+    @staticmethod
+    def _merge(stmts):
+        merged = []
+        run_key, run = None, []
+
+        def flush():
+            if not run:
+                return
+            method = run_key[1]
+            if len(run) > 1:
+                calls = [_engine_call(stmt)[2] for stmt in run]
+                if method in SETTER_METHODS:
+                    merged.append(run[-1])
+                    return
+                total = _sum_args(method, calls)
+                if total is not None:
+                    calls[0].args = [total]
+                    merged.append(run[0])
+                    return
+            merged.extend(run)
+
+        for stmt in stmts:
+            info = _engine_call(stmt)
+            mergeable = (info is not None and (info[1] in ADDITIVE_METHODS or info[1] in SETTER_METHODS)
+                         and all(_is_constant(arg) for arg in info[2].args))
+            key = info[:2] if mergeable else None
+            if key is not None and key == run_key:
+                run.append(stmt)
+                continue
+            flush()
+            run_key, run = key, []
+            if key is not None:
+                run.append(stmt)
+            else:
+                merged.append(stmt)
+        flush()
+        if len(merged) > 1:
+            merged = [stmt for stmt in merged if not isinstance(stmt, ast.Pass)] or merged[:1]
+        return merged
+
+
+def _busy_wait_condition(node):
+    """Return the condition a ``while`` loop spins on, if its body does nothing but spin."""
+    if node.orelse:
+        return None
+    for stmt in node.body:
+        if isinstance(stmt, ast.Pass):
+            continue
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Yield) and stmt.value.value is None:
+            continue
+        return None
+    test = node.test
+    if isinstance(test, ast.Constant):
+        return None
+    if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+        return test.operand
+    return ast.copy_location(ast.UnaryOp(op=ast.Not(), operand=test), test)
+
+
+class BusyWaitRewriter(ast.NodeTransformer):
+    """Rewrites ``while not (cond): pass`` / ``yield`` spins in generator scripts into
+    ``if not (cond): yield wait_until(lambda: cond)``, so the scheduler parks the task on its
+    waiting list instead of resuming it every frame."""
+
+    def __init__(self):
+        self.rewrote = False
+        self._in_generator = []
+
+    def _visit_function(self, node):
+        is_generator = _yields(node.body)
+        self._in_generator.append(is_generator)
+        self.generic_visit(node)
+        self._in_generator.pop()
+        return node
+
+    visit_FunctionDef = _visit_function
+
+    def visit_AsyncFunctionDef(self, node):
+        return node
+
+    def visit_While(self, node):
+        self.generic_visit(node)
+        if not self._in_generator or not self._in_generator[-1]:
+            return node
+        condition = _busy_wait_condition(node)
+        if condition is None:
+            return node
+        self.rewrote = True
+        predicate = ast.Lambda(
+            args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=condition,
+        )
+        call = ast.Call(func=ast.Name(WAIT_UNTIL_NAME, ast.Load()), args=[predicate], keywords=[])
+        test = ast.UnaryOp(op=ast.Not(), operand=copy.deepcopy(condition))
+        return ast.copy_location(ast.If(test=test, body=[ast.Expr(ast.Yield(call))], orelse=[]), node)
+
+
+def _own_nodes(stmts):
+    """Walk statements without descending into nested functions, lambdas or classes."""
+    stack = list(stmts)
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                stack.append(child)
+
+
+def _yields(stmts) -> bool:
+    return any(isinstance(n, (ast.Yield, ast.YieldFrom)) for n in _own_nodes(stmts))
+
+
+class EngineBinder(ast.NodeTransformer):
+    """Binds ``CoronaEngine.<name>`` lookups used inside a function's loops to locals before the loop."""
+
+    def visit_FunctionDef(self, node):
+        self.generic_visit(node)
+        if _assigns_name(node, ENGINE_NAME):
+            return node
+        node.body = self._bind_block(node.body)
+        return node
+
+    def _bind_block(self, stmts):
+        out = []
+        for stmt in stmts:
+            if isinstance(stmt, (ast.For, ast.While)):
+                names = sorted({n.attr for n in ast.walk(stmt) if _is_engine_attr(n)})
+                for attr in names:
+                    assign = ast.Assign(
+                        targets=[ast.Name(_bound_name(attr), ast.Store())],
+                        value=ast.Attribute(ast.Name(ENGINE_NAME, ast.Load()), attr, ast.Load()),
+                    )
+                    out.append(ast.copy_location(assign, stmt))
+                if names:
+                    stmt = _EngineAttrReplacer().visit(stmt)
+                out.append(stmt)
+                continue
+            for field in ("body", "orelse", "finalbody"):
+                inner = getattr(stmt, field, None)
+                if isinstance(inner, list) and inner and isinstance(inner[0], ast.stmt):
+                    setattr(stmt, field, self._bind_block(inner))
+            for handler in getattr(stmt, "handlers", ()):
+                handler.body = self._bind_block(handler.body)
+            out.append(stmt)
+        return out
+
+
+def _is_engine_attr(node) -> bool:
+    return (isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load)
+            and isinstance(node.value, ast.Name) and node.value.id == ENGINE_NAME)
+
+
+def _bound_name(attr: str) -> str:
+    return f"_{ENGINE_NAME}_{attr}"
+
+
+def _assigns_name(func, name: str) -> bool:
+    for node in ast.walk(func):
+        if isinstance(node, ast.Name) and node.id == name and not isinstance(node.ctx, ast.Load):
+            return True
+        if isinstance(node, (ast.Global, ast.Nonlocal)) and name in node.names:
+            return True
+    return False
+
+
+class _EngineAttrReplacer(ast.NodeTransformer):
+    def visit_Attribute(self, node):
+        if _is_engine_attr(node):
+            return ast.copy_location(ast.Name(_bound_name(node.attr), ast.Load()), node)
+        return self.generic_visit(node)
+
+
+def _insert_wait_until_import(tree: ast.Module) -> None:
+    index = 0
+    body = tree.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        index = 1
+    while index < len(body) and isinstance(body[index], ast.ImportFrom) and body[index].module == "__future__":
+        index += 1
+    node = ast.ImportFrom(module="utils.script_scheduler",
+                          names=[ast.alias(name="wait_until", asname=WAIT_UNTIL_NAME)], level=0)
+    body.insert(index, ast.copy_location(node, body[index] if index < len(body) else tree))
+
+
+def optimize_module(tree: ast.Module, bind_engine: bool = True) -> ast.Module:
+    """Run the optimizer pipeline over a parsed Blockly script and return the rewritten tree."""
+    tree = ConstantFolder().visit(tree)
+    tree = TransformMerger().visit(tree)
+    busy_waits = BusyWaitRewriter()
+    tree = busy_waits.visit(tree)
+    if busy_waits.rewrote:
+        _insert_wait_until_import(tree)
+    if bind_engine:
+        tree = EngineBinder().visit(tree)
+    return ast.fix_missing_locations(tree)
+
+
+def optimize_source(source: str, filename: str = "<blockly>") -> str:
+    """Optimized source for inspection; the script compiler works on the tree directly."""
+    return ast.unparse(optimize_module(ast.parse(source, filename)))
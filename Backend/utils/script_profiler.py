@@ -0,0 +1,155 @@
+import sys
+import time
+from collections import deque
+
+_script_profiler_singleton = None
+
+
+def get_script_profiler():
+    global _script_profiler_singleton
+    if _script_profiler_singleton is None:
+        _script_profiler_singleton = ScriptProfiler()
+    return _script_profiler_singleton
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def _engine_function_name(func):
+    owner = getattr(func, "__self__", None)
+    module = getattr(func, "__module__", None) or getattr(type(owner), "__module__", None)
+    if module is None or not module.startswith("CoronaEngine"):
+        return None
+    return getattr(func, "__qualname__", None) or getattr(func, "__name__", "?")
+
+
+class ScriptProfiler:
+    """Opt-in wall-time profiler for the script host."""
+
+    def __init__(self, capacity: int = 600, sample_every: int = 30, clock=time.perf_counter):
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self.clock = clock
+        self.enabled = False
+        self._frames = deque(maxlen=capacity)
+        self._current = {}
+        self._frame_start = None
+        self._frame_index = 0
+        self._sampling = False
+        self._engine_calls = {}
+        self._engine_stack = []
+        self._fallback_file = None
+
+    def enable(self, enabled: bool = True) -> None:
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if not enabled:
+            self._stop_sampling()
+            self._current = {}
+            self._frame_start = None
+
+    def reset(self) -> None:
+        self._frames.clear()
+        self._current = {}
+        self._engine_calls = {}
+        self._frame_index = 0
+
+    def begin_frame(self) -> None:
+        self._frame_start = self.clock()
+        self._current = {}
+        self._frame_index += 1
+        if self.sample_every and self._frame_index % self.sample_every == 0:
+            self._start_sampling()
+
+    def record(self, name: str, seconds: float) -> None:
+        current = self._current
+        current[name] = current.get(name, 0.0) + seconds
+
+    def end_frame(self) -> None:
+        if self._frame_start is None:
+            return
+        self._stop_sampling()
+        self._frames.append((self.clock() - self._frame_start, self._current))
+        self._current = {}
+        self._frame_start = None
+
+    def _start_sampling(self) -> None:
+        if self._fallback_file is None:
+            fallback = sys.modules.get("corona_engine_fallback")
+            self._fallback_file = getattr(fallback, "__file__", "") or ""
+        self._engine_stack = []
+        self._sampling = True
+        sys.setprofile(self._profile)
+
+    def _stop_sampling(self) -> None:
+        if self._sampling:
+            sys.setprofile(None)
+            self._sampling = False
+            self._engine_stack = []
+
+    def _profile(self, frame, event, arg) -> None:
+        if event == "c_call":
+            name = _engine_function_name(arg)
+            self._engine_stack.append((name, self.clock()) if name else None)
+        elif event in ("c_return", "c_exception"):
+            if self._engine_stack:
+                self._close(self._engine_stack.pop())
+        elif event == "call":
+            code = frame.f_code
+            if (self._fallback_file and code.co_filename == self._fallback_file) \
+                    or frame.f_globals.get("__name__", "").startswith("CoronaEngine"):
+                name = getattr(code, "co_qualname", code.co_name)
+                self._engine_stack.append((f"CoronaEngine.{name}", self.clock()))
+            else:
+                self._engine_stack.append(None)
+        elif event == "return":
+            if self._engine_stack:
+                self._close(self._engine_stack.pop())
+
+    def _close(self, entry) -> None:
+        if entry is None:
+            return
+        name, started = entry
+        stats = self._engine_calls.get(name)
+        if stats is None:
+            stats = self._engine_calls[name] = [0, 0.0]
+        stats[0] += 1
+        stats[1] += self.clock() - started
+
+    def snapshot(self, top: int = 10) -> dict:
+        """Rolling frame and per-script p50/p99 (milliseconds), worst scripts first."""
+        frames = list(self._frames)
+        totals = sorted(total for total, _ in frames)
+        per_script = {}
+        for _, scripts in frames:
+            for name, seconds in scripts.items():
+                per_script.setdefault(name, []).append(seconds)
+        scripts = []
+        for name, samples in per_script.items():
+            samples.sort()
+            scripts.append({
+                "name": name,
+                "frames": len(samples),
+                "p50_ms": _percentile(samples, 0.5) * 1000.0,
+                "p99_ms": _percentile(samples, 0.99) * 1000.0,
+                "total_ms": sum(samples) * 1000.0,
+            })
+        scripts.sort(key=lambda item: item["p99_ms"], reverse=True)
+        engine = [
+            {"name": name, "calls": count, "total_ms": seconds * 1000.0}
+            for name, (count, seconds) in self._engine_calls.items()
+        ]
+        engine.sort(key=lambda item: item["total_ms"], reverse=True)
+        return {
+            "enabled": self.enabled,
+            "frames": len(frames),
+            "frame_p50_ms": _percentile(totals, 0.5) * 1000.0,
+            "frame_p99_ms": _percentile(totals, 0.99) * 1000.0,
+            "scripts": scripts[:top],
+            "engine_calls": engine[:top],
+        }
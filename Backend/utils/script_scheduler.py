@@ -0,0 +1,223 @@
+import heapq
+import time
+import traceback
+import types
+from collections import deque
+
+_script_scheduler_singleton = None
+
+
+def get_script_scheduler():
+    global _script_scheduler_singleton
+    if _script_scheduler_singleton is None:
+        _script_scheduler_singleton = ScriptScheduler()
+    return _script_scheduler_singleton
+
+
+class Wait:
+    __slots__ = ("seconds",)
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+
+class WaitUntil:
+    __slots__ = ("condition",)
+
+    def __init__(self, condition):
+        self.condition = condition
+
+
+def delta_time() -> float:
+    """Seconds covered by the current frame update."""
+    return get_script_scheduler().dt
+
+
+def wait(seconds) -> Wait:
+    """`yield wait(x)` suspends the calling script for x seconds without blocking the frame."""
+    return Wait(float(seconds))
+
+
+def wait_until(condition) -> WaitUntil:
+    """`yield wait_until(lambda: cond)` suspends the calling script until cond() is true (polled once per frame)."""
+    return WaitUntil(condition)
+
+
+class ScriptTask:
+    __slots__ = ("gen", "name", "owner", "condition", "done")
+
+    def __init__(self, gen, name, owner):
+        self.gen = gen
+        self.name = name
+        self.owner = owner
+        self.condition = None
+        self.done = False
+
+
+class ScriptScheduler:
+    """Steps Blockly scripts as generator tasks on the frame thread."""
+
+    BUDGET_CHECK_INTERVAL = 32
+
+    def __init__(self, budget: float = 0.004, clock=time.perf_counter):
+        self.budget = budget
+        self.clock = clock
+        self.on_error = None
+        self.profile = None
+        self.watchdog = None
+        self.time = 0.0
+        self.dt = 0.0
+        self._last_clock = None
+        self._ready: deque[ScriptTask] = deque()
+        self._sleeping: list[tuple[float, int, ScriptTask]] = []
+        self._waiting: list[ScriptTask] = []
+        self._by_owner: dict[object, set[ScriptTask]] = {}
+        self._live = 0
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def spawn(self, target, *args, name=None, owner=None):
+        """Call target(*args); a returned generator is scheduled as a task, anything else is returned as-is."""
+        result = target(*args) if callable(target) else target
+        if not isinstance(result, types.GeneratorType):
+            return result
+        task = ScriptTask(result, name or getattr(target, "__qualname__", repr(target)), owner)
+        self._ready.append(task)
+        self._live += 1
+        if owner is not None:
+            self._by_owner.setdefault(owner, set()).add(task)
+        return task
+
+    def _finish(self, task: ScriptTask) -> None:
+        task.done = True
+        self._live -= 1
+        if task.owner is not None:
+            owned = self._by_owner.get(task.owner)
+            if owned is not None:
+                owned.discard(task)
+                if not owned:
+                    del self._by_owner[task.owner]
+
+    def cancel(self, task: ScriptTask) -> None:
+        """Stop a task; it is dropped lazily the next time the scheduler reaches it."""
+        if task.done:
+            return
+        self._finish(task)
+        try:
+            task.gen.close()
+        except Exception:
+            pass
+
+    def cancel_owner(self, owner) -> int:
+        owned = list(self._by_owner.get(owner, ()))
+        for task in owned:
+            self.cancel(task)
+        return len(owned)
+
+    def clear(self) -> None:
+        for owned in list(self._by_owner.values()):
+            for task in list(owned):
+                self.cancel(task)
+        for task in list(self._ready) + [entry[2] for entry in self._sleeping] + self._waiting:
+            self.cancel(task)
+        self._ready.clear()
+        self._sleeping.clear()
+        self._waiting.clear()
+
+    def _fail(self, task: ScriptTask, error: BaseException) -> None:
+        self._finish(task)
+        print(f"[ScriptScheduler] 脚本任务 {task.name} 出错: {str(error) or type(error).__name__}")
+        if self.on_error is not None:
+            try:
+                self.on_error(task, error, traceback.format_exc())
+            except Exception:
+                pass
+
+    def _wake(self, now: float) -> None:
+        sleeping = self._sleeping
+        ready = self._ready
+        while sleeping and sleeping[0][0] <= now:
+            task = heapq.heappop(sleeping)[2]
+            if not task.done:
+                ready.append(task)
+
+        if self._waiting:
+            still_waiting = []
+            for task in self._waiting:
+                if task.done:
+                    continue
+                try:
+                    satisfied = task.condition()
+                except Exception as e:
+                    self._fail(task, e)
+                    continue
+                finally:
+                    if self.watchdog is not None and self.watchdog.fired is not None:
+                        self.watchdog.settle()
+                if satisfied:
+                    task.condition = None
+                    ready.append(task)
+                else:
+                    still_waiting.append(task)
+            self._waiting = still_waiting
+
+    def _resume(self, task: ScriptTask, now: float) -> None:
+        try:
+            request = next(task.gen)
+        except StopIteration:
+            self._finish(task)
+            return
+        except Exception as e:
+            self._fail(task, e)
+            return
+        finally:
+            if self.watchdog is not None and self.watchdog.fired is not None:
+                self.watchdog.settle()
+
+        if request is None:
+            self._ready.append(task)
+        elif isinstance(request, Wait):
+            if request.seconds <= 0:
+                self._ready.append(task)
+            else:
+                self._seq += 1
+                heapq.heappush(self._sleeping, (now + request.seconds, self._seq, task))
+        elif isinstance(request, WaitUntil):
+            task.condition = request.condition
+            self._waiting.append(task)
+        else:
+            self._ready.append(task)
+
+    def step(self, dt: float | None = None, budget: float | None = None) -> int:
+        """Advance one frame by dt seconds (wall clock when omitted) and return how many tasks were resumed."""
+        clock = self.clock
+        started = clock()
+        if dt is None:
+            dt = 0.0 if self._last_clock is None else started - self._last_clock
+        self._last_clock = started
+        self.dt = dt
+        self.time += dt
+        now = self.time
+        self._wake(now)
+
+        ready = self._ready
+        deadline = started + (self.budget if budget is None else budget)
+        check_interval = self.BUDGET_CHECK_INTERVAL
+        profile = self.profile
+        resumed = 0
+        for _ in range(len(ready)):
+            if resumed % check_interval == 0 and resumed and clock() > deadline:
+                break
+            task = ready.popleft()
+            if task.done:
+                continue
+            if profile is None:
+                self._resume(task, now)
+            else:
+                resume_started = clock()
+                self._resume(task, now)
+                profile(task.owner or task.name, clock() - resume_started)
+            resumed += 1
+        return resumed
@@ -0,0 +1,128 @@
+import ctypes
+import os
+import sys
+import threading
+import time
+
+_script_watchdog_singleton = None
+_get_ident = threading.get_ident
+
+try:
+    _set_async_exc = ctypes.pythonapi.PyThreadState_SetAsyncExc
+    _set_async_exc.restype = ctypes.c_int
+except AttributeError:
+    _set_async_exc = None
+
+
+def get_script_watchdog():
+    global _script_watchdog_singleton
+    if _script_watchdog_singleton is None:
+        budget_ms = float(os.environ.get("CORONA_SCRIPT_BUDGET_MS", "250"))
+        _script_watchdog_singleton = ScriptWatchdog(budget=budget_ms / 1000.0)
+        _script_watchdog_singleton.start()
+    return _script_watchdog_singleton
+
+
+class ScriptTimeout(Exception):
+    """Raised inside a script that ran past its per-call budget."""
+
+
+class ScriptWatchdog:
+    """Interrupts Blockly scripts that overrun their budget (seconds, per module in ``budgets``)."""
+
+    SCRIPT_FILENAME_PREFIX = "<blockly:"
+
+    def __init__(self, budget: float = 0.25, clock=time.perf_counter):
+        self.budget = budget
+        self.budgets: dict[str, float] = {}
+        self.clock = clock
+        self.timeouts = 0
+        self._thread_id = None
+        self._epoch = 0
+        self.fired = None  # frame thread id of a raised timeout, until settle() clears it
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def available(self) -> bool:
+        return _set_async_exc is not None
+
+    def budget_for(self, name: str) -> float:
+        return self.budgets.get(name, self.budget)
+
+    def set_budget(self, name: str, seconds: float | None) -> None:
+        if seconds is None:
+            self.budgets.pop(name, None)
+        else:
+            self.budgets[name] = seconds
+
+    def start(self) -> None:
+        if self._thread is not None or not self.available:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="script-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def tick(self) -> None:
+        """Called by the frame thread at the start of every frame."""
+        self._thread_id = _get_ident()
+        self._epoch += 1
+        if self.fired is not None:
+            self.settle()
+
+    def settle(self) -> None:
+        """Drop a timeout its script outran; callers check ``fired`` after each script call first."""
+        with self._lock:
+            if self.fired is not None:
+                _set_async_exc(ctypes.c_ulong(self.fired), None)
+                self.fired = None
+
+    def _script_frame(self, thread_id):
+        frame = sys._current_frames().get(thread_id)
+        script = None
+        prefix = self.SCRIPT_FILENAME_PREFIX
+        while frame is not None:
+            if frame.f_code.co_filename.startswith(prefix):
+                script = frame
+            frame = frame.f_back
+        return script
+
+    def _poll_interval(self) -> float:
+        return min(0.05, max(0.005, self.budget / 4))
+
+    def _run(self) -> None:
+        seen = None
+        while not self._stop.wait(self._poll_interval()):
+            thread_id = self._thread_id
+            if thread_id is None:
+                continue
+            epoch = self._epoch
+            frame = self._script_frame(thread_id)
+            now = self.clock()
+            if frame is None:
+                seen = None
+                continue
+            if seen is None or seen[0] != epoch or seen[1] is not frame:
+                seen = (epoch, frame, now)
+                continue
+            name = frame.f_globals.get("__name__", "")
+            if now - seen[2] < self.budgets.get(name, self.budget):
+                continue
+            seen = None
+            with self._lock:
+                # Published before the frame check: a script that returns after it sees ``fired``.
+                self.fired = thread_id
+                if self._epoch != epoch or self._script_frame(thread_id) is not frame:
+                    self.fired = None
+                    continue
+                del frame
+                self.timeouts += 1
+                _set_async_exc(ctypes.c_ulong(thread_id), ctypes.py_object(ScriptTimeout))
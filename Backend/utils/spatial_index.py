@@ -0,0 +1,430 @@
+import math
+import sys
+
+import numpy as np
+
+_spatial_index_singleton = None
+
+MAX_SPAN = 64  # cells an actor may cover before it goes on its scene's oversized list instead
+
+
+def get_spatial_index():
+    global _spatial_index_singleton
+    if _spatial_index_singleton is None:
+        from utils.transform_store import get_transform_store
+
+        _spatial_index_singleton = SpatialIndex(get_transform_store())
+    return _spatial_index_singleton
+
+
+def touching(name=""):
+    """``touching('cube.obj')`` in a Blockly script: does its actor overlap that actor (any actor if empty)?"""
+    module_globals = sys._getframe(1).f_globals
+    return get_spatial_index().touching(module_globals["SCENE_NAME"], module_globals["ACTOR_NAME"], name)
+
+
+def distance_to(name=""):
+    """``distance_to('cube.obj')`` in a Blockly script: centre distance to that actor (the nearest if empty)."""
+    module_globals = sys._getframe(1).f_globals
+    return get_spatial_index().distance(module_globals["SCENE_NAME"], module_globals["ACTOR_NAME"], name)
+
+
+class _SceneGrid:
+    __slots__ = ("cells", "oversized", "low", "high")
+
+    def __init__(self):
+        self.cells: dict[tuple[int, int, int], set[int]] = {}
+        self.oversized: set[int] = set()
+        self.low = None  # occupied cell range; it only grows
+        self.high = None
+
+
+class SpatialIndex:
+    """Uniform-grid index of actor bounds for overlap, radius, nearest-neighbour and ray queries."""
+
+    def __init__(self, store, cell_size: float = 2.0, half_extent: float = 0.5):
+        self.store = store
+        self.scenes = store.scenes
+        self.cell_size = float(cell_size)
+        self.half_extent = float(half_extent)
+        self.lo = np.zeros((0, 3))
+        self.hi = np.zeros((0, 3))
+        self.center = np.zeros((0, 3))  # world position of an indexed row
+        self.extent = np.zeros((0, 3))
+        self.scene = np.zeros(0, dtype=np.int64)  # scene handle of an indexed row, 0 when not indexed
+        self.row_handle = np.zeros(0, dtype=np.int64)
+        self.cell_lo = np.zeros((0, 3), dtype=np.int64)
+        self.cell_hi = np.zeros((0, 3), dtype=np.int64)
+        self._grids: dict[int, _SceneGrid] = {}
+        self._memo: dict = {}
+        self.moved_rows = np.zeros(0, dtype=np.intp)  # rows looked at by the last sync
+        self.syncs = 0
+        self.relinked = 0
+        self.queries = 0
+        self.memo_hits = 0
+        self._ensure(len(store.alive))
+
+    def _ensure(self, capacity: int) -> None:
+        if capacity <= len(self.scene):
+            return
+        for name, fill in (("lo", 0.0), ("hi", 0.0), ("center", 0.0), ("extent", self.half_extent), ("scene", 0),
+                           ("row_handle", 0), ("cell_lo", 0), ("cell_hi", 0)):
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def set_extent(self, handle: int, half_extent) -> None:
+        """Half size of an actor's box at scale 1 (a number or an x, y, z triple)."""
+        row = self.store.row(handle)
+        self._ensure(len(self.store.alive))
+        self.extent[row] = half_extent
+        self.store.moved[row] = True
+
+    # Maintenance
+    def sync(self) -> int:
+        """Re-bin the rows moved since the last sync; returns how many rows were looked at."""
+        self._memo.clear()
+        store = self.store
+        self._ensure(len(store.alive))
+        rows = self.moved_rows = store.take_moved()
+        if not rows.size:
+            return 0
+        self.syncs += 1
+        alive = store.alive[rows]
+        for row in rows[~alive].tolist():
+            self._unlink(row)
+        live = rows[alive]
+        if not live.size:
+            return int(rows.size)
+        half = np.abs(store.world_values(live, 2)) * self.extent[live]
+        position = store.world_values(live, 0)
+        lo = position - half
+        hi = position + half
+        self.center[live] = position
+        self.lo[live] = lo
+        self.hi[live] = hi
+        c0 = np.floor(lo / self.cell_size).astype(np.int64)
+        c1 = np.floor(hi / self.cell_size).astype(np.int64)
+        same = ((self.scene[live] != 0) & (self.row_handle[live] == store.handles[live])
+                & (c0 == self.cell_lo[live]).all(axis=1) & (c1 == self.cell_hi[live]).all(axis=1))
+        changed = np.flatnonzero(~same)
+        for i, row in zip(changed.tolist(), live[changed].tolist()):
+            self._unlink(row)
+            record = store.record(row)
+            if record is not None:
+                self._link(row, record.scene.handle, c0[i].tolist(), c1[i].tolist())
+        self.relinked += int(changed.size)
+        return int(rows.size)
+
+    def _link(self, row: int, scene: int, c0, c1) -> None:
+        grid = self._grids.get(scene)
+        if grid is None:
+            grid = self._grids[scene] = _SceneGrid()
+        if (c1[0] - c0[0] + 1) * (c1[1] - c0[1] + 1) * (c1[2] - c0[2] + 1) > MAX_SPAN:
+            grid.oversized.add(row)
+        else:
+            cells = grid.cells
+            for x in range(c0[0], c1[0] + 1):
+                for y in range(c0[1], c1[1] + 1):
+                    for z in range(c0[2], c1[2] + 1):
+                        members = cells.get((x, y, z))
+                        if members is None:
+                            cells[(x, y, z)] = {row}
+                        else:
+                            members.add(row)
+            if grid.low is None:
+                grid.low, grid.high = list(c0), list(c1)
+            else:
+                grid.low = [min(a, b) for a, b in zip(grid.low, c0)]
+                grid.high = [max(a, b) for a, b in zip(grid.high, c1)]
+        self.scene[row] = scene
+        self.row_handle[row] = self.store.handles[row]
+        self.cell_lo[row] = c0
+        self.cell_hi[row] = c1
+
+    def _unlink(self, row: int) -> None:
+        scene = int(self.scene[row])
+        if not scene:
+            return
+        self.scene[row] = 0
+        grid = self._grids[scene]
+        if row in grid.oversized:
+            grid.oversized.discard(row)
+            return
+        c0, c1 = self.cell_lo[row].tolist(), self.cell_hi[row].tolist()
+        cells = grid.cells
+        for x in range(c0[0], c1[0] + 1):
+            for y in range(c0[1], c1[1] + 1):
+                for z in range(c0[2], c1[2] + 1):
+                    members = cells.get((x, y, z))
+                    if members is not None:
+                        members.discard(row)
+                        if not members:
+                            del cells[(x, y, z)]
+
+    # Queries
+    def _memoised(self, key, compute):
+        self.queries += 1
+        result = self._memo.get(key, self)
+        if result is self:
+            result = self._memo[key] = compute()
+        else:
+            self.memo_hits += 1
+        return result
+
+    def _grid(self, scene_name: str) -> tuple[int, _SceneGrid | None]:
+        scene = self.scenes.scene(scene_name)
+        if scene is None:
+            return 0, None
+        return scene.handle, self._grids.get(scene.handle)
+
+    def _row(self, handle) -> int | None:
+        row = self.store._rows.get(handle)
+        return row if row is not None and self.scene[row] else None
+
+    def _candidates(self, grid: _SceneGrid, c0, c1) -> np.ndarray:
+        span = (c1[0] - c0[0] + 1) * (c1[1] - c0[1] + 1) * (c1[2] - c0[2] + 1)
+        found = set(grid.oversized)
+        cells = grid.cells
+        if span > len(cells):
+            for (x, y, z), members in cells.items():
+                if c0[0] <= x <= c1[0] and c0[1] <= y <= c1[1] and c0[2] <= z <= c1[2]:
+                    found.update(members)
+        else:
+            for x in range(c0[0], c1[0] + 1):
+                for y in range(c0[1], c1[1] + 1):
+                    for z in range(c0[2], c1[2] + 1):
+                        members = cells.get((x, y, z))
+                        if members:
+                            found.update(members)
+        return np.fromiter(found, dtype=np.intp, count=len(found))
+
+    def _cell_range(self, lo, hi):
+        size = self.cell_size
+        return ([math.floor(v / size) for v in lo], [math.floor(v / size) for v in hi])
+
+    def overlapping(self, scene_name: str, lo, hi, exclude: int | None = None) -> tuple[int, ...]:
+        """Actors whose box overlaps the box ``lo``..``hi``."""
+        lo, hi = tuple(map(float, lo)), tuple(map(float, hi))
+        return self._memoised(("box", scene_name, lo, hi, exclude),
+                              lambda: self._overlapping(scene_name, lo, hi, exclude))
+
+    def _overlapping(self, scene_name, lo, hi, exclude):
+        _, grid = self._grid(scene_name)
+        if grid is None:
+            return ()
+        rows = self._candidates(grid, *self._cell_range(lo, hi))
+        rows = rows[(self.lo[rows] <= hi).all(axis=1) & (self.hi[rows] >= lo).all(axis=1)]
+        return self._handles(rows, exclude)
+
+    def within(self, scene_name: str, center, radius: float, exclude: int | None = None) -> tuple[int, ...]:
+        """Actors whose box comes within ``radius`` of ``center``."""
+        center, radius = tuple(map(float, center)), float(radius)
+        return self._memoised(("radius", scene_name, center, radius, exclude),
+                              lambda: self._within(scene_name, center, radius, exclude))
+
+    def _within(self, scene_name, center, radius, exclude):
+        _, grid = self._grid(scene_name)
+        if grid is None:
+            return ()
+        c = np.asarray(center)
+        rows = self._candidates(grid, *self._cell_range(c - radius, c + radius))
+        gap = np.maximum(np.maximum(self.lo[rows] - c, c - self.hi[rows]), 0.0)
+        rows = rows[np.einsum("ij,ij->i", gap, gap) <= radius * radius]
+        return self._handles(rows, exclude)
+
+    def _handles(self, rows, exclude) -> tuple[int, ...]:
+        handles = self.store.handles[np.sort(rows)].tolist()
+        if exclude is not None and exclude in handles:
+            handles.remove(exclude)
+        return tuple(handles)
+
+    def nearest(self, scene_name: str, point, exclude: int | None = None,
+                max_distance: float = math.inf) -> tuple[int, float] | None:
+        """``(handle, distance)`` of the actor whose position is closest to ``point``, or None."""
+        point = tuple(map(float, point))
+        return self._memoised(("nearest", scene_name, point, exclude, max_distance),
+                              lambda: self._nearest(scene_name, point, exclude, max_distance))
+
+    def _nearest(self, scene_name, point, exclude, max_distance):
+        scene, grid = self._grid(scene_name)
+        if grid is None:
+            return None
+        p = np.asarray(point)
+        positions = self.center
+        excluded = self._row(exclude) if exclude is not None else None
+        best_row, best = None, max_distance
+
+        def consider(rows):
+            nonlocal best_row, best
+            if excluded is not None:
+                rows = rows[rows != excluded]
+            if rows.size:
+                distances = np.linalg.norm(positions[rows] - p, axis=1)
+                i = int(np.argmin(distances))
+                if distances[i] < best:
+                    best_row, best = int(rows[i]), float(distances[i])
+
+        if grid.oversized:
+            consider(np.fromiter(grid.oversized, dtype=np.intp))
+        if grid.low is not None:
+            size = self.cell_size
+            c = [math.floor(v / size) for v in point]
+            reach = max(max(abs(c[i] - grid.low[i]), abs(grid.high[i] - c[i])) for i in range(3))
+            cells = grid.cells
+            for k in range(reach + 1):
+                # Everything not seen yet lies outside rings 0..k, at least k cells away.
+                if best <= (k - 1) * size:
+                    break
+                if 24 * k * k + 2 > len(cells):
+                    consider(np.flatnonzero(self.scene == scene))
+                    break
+                found = set()
+                for key in _shell(c, k):
+                    members = cells.get(key)
+                    if members:
+                        found.update(members)
+                if found:
+                    consider(np.fromiter(found, dtype=np.intp, count=len(found)))
+        if best_row is None:
+            return None
+        return int(self.store.handles[best_row]), best
+
+    def raycast(self, scene_name: str, origin, direction, max_distance: float = math.inf,
+                exclude: int | None = None) -> tuple[int, float] | None:
+        """``(handle, distance)`` of the first actor box hit by the ray, or None."""
+        origin, direction = tuple(map(float, origin)), tuple(map(float, direction))
+        return self._memoised(("ray", scene_name, origin, direction, max_distance, exclude),
+                              lambda: self._raycast(scene_name, origin, direction, max_distance, exclude))
+
+    def _raycast(self, scene_name, origin, direction, max_distance, exclude):
+        _, grid = self._grid(scene_name)
+        length = math.sqrt(sum(v * v for v in direction))
+        if grid is None or length == 0.0:
+            return None
+        d = [v / length for v in direction]
+        inverse = [1.0 / v if v != 0.0 else math.inf for v in d]
+        excluded = self._row(exclude) if exclude is not None else None
+        lo_table, hi_table = self.lo, self.hi
+        best_row, best = None, max_distance
+        tested = set()
+
+        def test(rows):
+            nonlocal best_row, best
+            for row in rows:
+                if row in tested or row == excluded:
+                    continue
+                tested.add(row)
+                t = _ray_box(origin, inverse, lo_table[row].tolist(), hi_table[row].tolist())
+                if t is not None and t < best:
+                    best_row, best = row, t
+
+        test(grid.oversized)
+        if grid.low is not None:
+            size = self.cell_size
+            box_lo = [v * size for v in grid.low]
+            box_hi = [(v + 1) * size for v in grid.high]
+            span = _ray_span(origin, inverse, box_lo, box_hi)
+            if span is not None:
+                t, t_exit = max(span[0], 0.0), min(span[1], best)
+                cell = [min(max(math.floor((origin[i] + d[i] * t) / size), grid.low[i]), grid.high[i])
+                        for i in range(3)]
+                step = [1 if v > 0 else -1 for v in d]
+                t_next = [((cell[i] + (step[i] > 0)) * size - origin[i]) * inverse[i] if d[i] != 0.0 else math.inf
+                          for i in range(3)]
+                t_delta = [size * abs(inverse[i]) for i in range(3)]
+                cells = grid.cells
+                while t <= min(t_exit, best):
+                    members = cells.get((cell[0], cell[1], cell[2]))
+                    if members:
+                        test(members)
+                    axis = t_next.index(min(t_next))
+                    t = t_next[axis]
+                    cell[axis] += step[axis]
+                    if not grid.low[axis] <= cell[axis] <= grid.high[axis]:
+                        break
+                    t_next[axis] += t_delta[axis]
+        if best_row is None:
+            return None
+        return int(self.store.handles[best_row]), best
+
+    # Script helpers
+    def touching(self, scene_name: str, actor_name: str, other: str = "") -> bool:
+        actor = self.scenes.resolve(scene_name, actor_name)
+        row = self._row(actor.handle) if actor is not None else None
+        if row is None:
+            return False
+        if other:
+            target = self.scenes.resolve(scene_name, other)
+            other_row = self._row(target.handle) if target is not None else None
+            if other_row is None or other_row == row:
+                return False
+            return bool((self.lo[row] <= self.hi[other_row]).all() and (self.hi[row] >= self.lo[other_row]).all())
+        return bool(self.overlapping(scene_name, self.lo[row], self.hi[row], exclude=actor.handle))
+
+    def distance(self, scene_name: str, actor_name: str, other: str = "") -> float:
+        actor = self.scenes.resolve(scene_name, actor_name)
+        row = self._row(actor.handle) if actor is not None else None
+        if row is None:
+            return math.inf
+        position = self.center[row]
+        if other:
+            target = self.scenes.resolve(scene_name, other)
+            other_row = self._row(target.handle) if target is not None else None
+            if other_row is None:
+                return math.inf
+            return float(np.linalg.norm(self.center[other_row] - position))
+        hit = self.nearest(scene_name, position, exclude=actor.handle)
+        return hit[1] if hit is not None else math.inf
+
+    def stats(self) -> dict:
+        return {
+            "indexed": int(np.count_nonzero(self.scene)),
+            "cells": sum(len(grid.cells) for grid in self._grids.values()),
+            "oversized": sum(len(grid.oversized) for grid in self._grids.values()),
+            "relinked": self.relinked,
+            "queries": self.queries,
+            "memo_hits": self.memo_hits,
+        }
+
+
+def _shell(center, k):
+    """Cells at Chebyshev distance exactly ``k`` from ``center``."""
+    cx, cy, cz = center
+    if k == 0:
+        yield (cx, cy, cz)
+        return
+    for x in range(cx - k, cx + k + 1):
+        for y in range(cy - k, cy + k + 1):
+            if abs(x - cx) == k or abs(y - cy) == k:
+                for z in range(cz - k, cz + k + 1):
+                    yield (x, y, z)
+            else:
+                yield (x, y, cz - k)
+                yield (x, y, cz + k)
+
+
+def _ray_span(origin, inverse, lo, hi):
+    """Entry and exit distance of a ray through a box (slab test), or None if it misses."""
+    t0, t1 = -math.inf, math.inf
+    for i in range(3):
+        if inverse[i] == math.inf:
+            if not lo[i] <= origin[i] <= hi[i]:
+                return None
+            continue
+        a = (lo[i] - origin[i]) * inverse[i]
+        b = (hi[i] - origin[i]) * inverse[i]
+        if a > b:
+            a, b = b, a
+        t0, t1 = max(t0, a), min(t1, b)
+        if t0 > t1:
+            return None
+    return t0, t1
+
+
+def _ray_box(origin, inverse, lo, hi):
+    span = _ray_span(origin, inverse, lo, hi)
+    if span is None or span[1] < 0.0:
+        return None
+    return max(span[0], 0.0)
@@ -15,7 +15,3 @@ except ImportError:
         print("[StaticComponents] import CoronaEngineFallback")
     except ImportError:
         print("[StaticComponents] CoronaEngine 未找到 (需要 -DBUILD_CORONA_EDITOR=ON)")
-
-
-scene_dict = {}
-
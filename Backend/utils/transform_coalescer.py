@@ -0,0 +1,105 @@
+from utils.transform_store import CHANNELS
+
+_transform_coalescer_singleton = None
+
+
+def get_transform_coalescer():
+    global _transform_coalescer_singleton
+    if _transform_coalescer_singleton is None:
+        from utils.transform_store import get_transform_store
+
+        _transform_coalescer_singleton = TransformCoalescer(get_transform_store())
+    return _transform_coalescer_singleton
+
+
+class TransformCoalescer:
+    """Collects actor transforms from the UI and applies them once per frame."""
+
+    def __init__(self, store):
+        self.store = store
+        self._pending: dict[int, list] = {}
+        self.submitted = 0
+        self.coalesced = 0
+        self.flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, handle: int, channel: str, value) -> None:
+        index = CHANNELS.index(channel)
+        slot = self._pending.get(handle)
+        if slot is None:
+            slot = self._pending[handle] = [None, None, None]
+        elif slot[index] is not None:
+            self.coalesced += 1
+        slot[index] = value
+        self.submitted += 1
+
+    def offset(self, handle: int, channel: str, delta) -> None:
+        """``submit`` the latest value of the channel plus ``delta``."""
+        current = self.value(handle, channel)
+        if current is not None:
+            delta = [value + step for value, step in zip(current, delta)]
+        self.submit(handle, channel, delta)
+
+    def submit_many(self, handles, channel: str, values) -> None:
+        """``submit`` for parallel lists of actor handles and values."""
+        index = CHANNELS.index(channel)
+        pending = self._pending
+        coalesced = 0
+        for handle, value in zip(handles, values):
+            slot = pending.get(handle)
+            if slot is None:
+                slot = pending[handle] = [None, None, None]
+            elif slot[index] is not None:
+                coalesced += 1
+            slot[index] = value
+        self.submitted += len(handles)
+        self.coalesced += coalesced
+
+    def discard(self, handle: int) -> None:
+        self._pending.pop(handle, None)
+        self.store.remove(handle)
+
+    def value(self, handle: int, channel: str):
+        slot = self._pending.get(handle)
+        if slot is not None and slot[CHANNELS.index(channel)] is not None:
+            return slot[CHANNELS.index(channel)]
+        return self.store.get(handle, channel)
+
+    def flush(self) -> int:
+        """Hand the pending values to the store and push its dirty rows; returns the engine calls."""
+        store = self.store
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            self.flushes += 1
+            lookup = store.scenes.actor
+            row_of = store.row
+            rows = ([], [], [])
+            values = ([], [], [])
+            for handle, slot in pending.items():
+                if lookup(handle) is None:
+                    continue
+                row = row_of(handle)
+                for index, value in enumerate(slot):
+                    if value is not None:
+                        rows[index].append(row)
+                        values[index].append(value)
+            # One array assignment per channel instead of one per value.
+            for index, channel in enumerate(CHANNELS):
+                if rows[index]:
+                    store.set_many(rows[index], channel, values[index])
+        return store.flush()
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "engine_calls": self.store.engine_calls,
+            "flushes": self.flushes,
+            "pending": len(self._pending),
+        }
+
+    def reset_stats(self) -> None:
+        self.submitted = self.coalesced = self.flushes = 0
+        self.store.engine_calls = 0
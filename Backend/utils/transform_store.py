@@ -0,0 +1,259 @@
+from collections import deque
+from operator import length_hint
+
+import numpy as np
+
+try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+
+_transform_store_singleton = None
+
+CHANNELS = ("Move", "Rotate", "Scale")
+
+
+def get_transform_store():
+    global _transform_store_singleton
+    if _transform_store_singleton is None:
+        from utils.scene_registry import get_scene_registry
+
+        _transform_store_singleton = TransformStore(get_scene_registry())
+    return _transform_store_singleton
+
+
+class TransformStore:
+    """Authoritative actor transforms in contiguous arrays, one row per actor handle."""
+
+    def __init__(self, scenes, capacity: int = 256):
+        self.scenes = scenes
+        self.position = np.zeros((capacity, 3))
+        self.rotation = np.zeros((capacity, 3))
+        self.scale = np.ones((capacity, 3))
+        self.dirty = np.zeros((capacity, 3), dtype=bool)
+        self.dirty_rows = np.zeros(capacity, dtype=bool)
+        self.moved = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.handles = np.zeros(capacity, dtype=np.int64)
+        self._rows: dict[int, int] = {}
+        self._records: list = [None] * capacity  # registry Actor per row, resolved on first push
+        self._engines = np.full(capacity, None, dtype=object)  # its engine actor, for fancy indexing
+        self._bound = np.zeros(capacity, dtype=bool)  # rows whose engine actor is resolved
+        self._pushed = [np.full((capacity, 3), np.nan) for _ in CHANNELS]  # last value sent per channel
+        self._free: list[int] = []
+        self._size = 0  # rows ever used; everything past it is unused
+        self.hierarchy = None
+        self.engine_calls = 0
+        self.flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, handle) -> bool:
+        return handle in self._rows
+
+    def _channel(self, channel: str) -> np.ndarray:
+        return (self.position, self.rotation, self.scale)[CHANNELS.index(channel)]
+
+    def add(self, handle: int, position=None, rotation=None, scale=None) -> int:
+        """Take a row for ``handle`` (identity transform unless given) and return it."""
+        row = self._rows.get(handle)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = self._size
+                if row == len(self.alive):
+                    self._grow(len(self.alive) * 2)
+                self._size += 1
+            self._rows[handle] = row
+            self.handles[row] = handle
+            self.alive[row] = True
+            self.position[row] = 0.0
+            self.rotation[row] = 0.0
+            self.scale[row] = 1.0
+            self.dirty[row] = False
+            self.dirty_rows[row] = False
+            self.moved[row] = True
+            for pushed in self._pushed:
+                pushed[row] = np.nan
+            self._bind(row, self.scenes.actor(handle))
+        for column, value in enumerate((position, rotation, scale)):
+            if value is not None:
+                (self.position, self.rotation, self.scale)[column][row] = value
+                self.dirty[row, column] = True
+                self.dirty_rows[row] = True
+                self.moved[row] |= column != 1
+        return row
+
+    def remove(self, handle: int) -> bool:
+        row = self._rows.pop(handle, None)
+        if row is None:
+            return False
+        self.alive[row] = False
+        self.dirty[row] = False
+        self.dirty_rows[row] = False
+        self.moved[row] = True
+        self._bind(row, None)
+        self._free.append(row)
+        return True
+
+    def row(self, handle: int) -> int:
+        row = self._rows.get(handle)
+        return row if row is not None else self.add(handle)
+
+    def rows(self, handles) -> np.ndarray:
+        """Row indices of ``handles`` (taking rows for handles not seen yet)."""
+        rows = self._rows
+        return np.fromiter((rows[h] if h in rows else self.add(h) for h in handles), dtype=np.intp)
+
+    def get(self, handle: int, channel: str) -> list[float] | None:
+        row = self._rows.get(handle)
+        return self._channel(channel)[row].tolist() if row is not None else None
+
+    def set(self, handle: int, channel: str, value) -> None:
+        row = self.row(handle)
+        index = CHANNELS.index(channel)
+        self._channel(channel)[row] = value
+        self.dirty[row, index] = True
+        self.dirty_rows[row] = True
+        if index != 1:
+            self.moved[row] = True
+
+    def set_many(self, rows, channel: str, values) -> None:
+        """Write one value per row (``values`` shaped (len(rows), 3)) in one assignment."""
+        index = CHANNELS.index(channel)
+        self._channel(channel)[rows] = values
+        self.dirty[rows, index] = True
+        self.dirty_rows[rows] = True
+        if index != 1:
+            self.moved[rows] = True
+
+    def select(self, selection=None) -> np.ndarray:
+        """Live row indices for a selection: row indices, a boolean mask over the rows, or None (all)."""
+        if selection is None:
+            return np.flatnonzero(self.alive[:self._size])
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            return np.flatnonzero(selection[:self._size] & self.alive[:self._size])
+        return selection
+
+    def translate(self, delta, selection=None) -> int:
+        return self._offset(self.position, 0, np.add, delta, selection)
+
+    def rotate(self, delta, selection=None) -> int:
+        return self._offset(self.rotation, 1, np.add, delta, selection)
+
+    def scale_by(self, factor, selection=None) -> int:
+        return self._offset(self.scale, 2, np.multiply, factor, selection)
+
+    def _offset(self, array, column, op, delta, selection) -> int:
+        rows = self.select(selection)
+        array[rows] = op(array[rows], delta)
+        self.dirty[rows, column] = True
+        self.dirty_rows[rows] = True
+        if column != 1:
+            self.moved[rows] = True
+        return int(rows.size)
+
+    def take_moved(self) -> np.ndarray:
+        """Rows flagged in ``moved`` since the last call (live or removed); clears the flags."""
+        rows = np.flatnonzero(self.moved[:self._size])
+        self.moved[rows] = False
+        return rows
+
+    def record(self, row: int):
+        """Registry ``Actor`` of a live row, or None."""
+        record = self._records[row]
+        if record is None and self.alive[row]:
+            record = self.scenes.actor(int(self.handles[row]))
+            self._bind(row, record)
+        return record
+
+    def _bind(self, row: int, record) -> None:
+        self._records[row] = record
+        self._engines[row] = record.engine if record is not None else None
+        self._bound[row] = record is not None
+
+    def world_values(self, rows: np.ndarray, column: int) -> np.ndarray:
+        """World position (0), rotation (1) or scale (2) of ``rows``, as a new array."""
+        values = (self.position, self.rotation, self.scale)[column].take(rows, axis=0)
+        if self.hierarchy is not None:
+            self.hierarchy.override(rows, column, values)
+        return values
+
+    def flush(self) -> int:
+        """Push the dirty channels to the engine; returns the number of engine calls."""
+        if self.hierarchy is not None:
+            self.hierarchy.update()
+        rows = np.flatnonzero(self.dirty_rows[:self._size])
+        if not rows.size:
+            return 0
+        self.flushes += 1
+        dirty = self.dirty.take(rows, axis=0)
+        self.dirty[:self._size] = False
+        self.dirty_rows[:self._size] = False
+        unbound = ~self._bound[rows]
+        if unbound.any():
+            for row in rows[unbound].tolist():
+                self.record(row)
+            dirty[~self._bound[rows]] = False
+        actor_api = CoronaEngine.Actor
+        pushed = self._pushed
+        calls = 0
+        # Per actor the engine still sees scale, then move, then rotate.
+        for column, push in ((2, actor_api.scale), (0, actor_api.move), (1, actor_api.rotate)):
+            channel_rows = rows[dirty[:, column]]
+            if not channel_rows.size:
+                continue
+            values = self.world_values(channel_rows, column)
+            # Values the engine already has (written back unchanged) are not sent again.
+            changed = values != pushed[column].take(channel_rows, axis=0)
+            changed = changed[:, 0] | changed[:, 1] | changed[:, 2]
+            if not changed.all():
+                channel_rows, values = channel_rows[changed], values[changed]
+                if not channel_rows.size:
+                    continue
+            pushed[column][channel_rows] = values
+            engines = self._engines.take(channel_rows).tolist()
+            failed = self._push(push, engines, values.tolist())
+            if failed:
+                pushed[column][channel_rows[failed]] = np.nan
+            calls += len(engines) - len(failed)
+        self.engine_calls += calls
+        return calls
+
+    @staticmethod
+    def _push(push, engines, values) -> list[int]:
+        """``push`` each engine actor its value; returns the indices of the calls that raised."""
+        remaining = iter(engines)
+        try:
+            deque(map(push, remaining, values), maxlen=0)
+            return []
+        except Exception as e:
+            print(f"Actor transform error: {str(e)}")
+            failed = [len(engines) - length_hint(remaining) - 1]
+        for index in range(failed[0] + 1, len(engines)):
+            try:
+                push(engines[index], values[index])
+            except Exception as e:
+                print(f"Actor transform error: {str(e)}")
+                failed.append(index)
+        return failed
+
+    def _grow(self, capacity: int) -> None:
+        for name, fill in (("position", 0.0), ("rotation", 0.0), ("scale", 1.0), ("dirty", False),
+                           ("dirty_rows", False), ("moved", False), ("alive", False), ("handles", 0),
+                           ("_engines", None), ("_bound", False)):
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        for column, old in enumerate(self._pushed):
+            self._pushed[column] = np.full((capacity, 3), np.nan)
+            self._pushed[column][:len(old)] = old
+        self._records.extend([None] * (capacity - len(self._records)))
+
+    def stats(self) -> dict:
+        return {"actors": len(self._rows), "capacity": len(self.alive), "engine_calls": self.engine_calls,
+                "flushes": self.flushes}
@@ -120,6 +120,27 @@ export const defineEventBlocks = (actorname, broadcastList, createNewBroadcast)
     }
   };
 
+  // 碰撞事件积木块：由后端碰撞系统在接触开始/持续/结束时回调
+  Blockly.Blocks['event_contact'] = {
+    init: function () {
+      this.appendDummyInput()
+        .appendField('当碰到')
+        .appendField(new Blockly.FieldTextInput(''), 'x')
+        .appendField(new Blockly.FieldDropdown([
+          ['开始', 'begin'], ['持续', 'stay'], ['结束', 'end']
+        ]), 'event')
+        .appendField('时');
+      this.appendStatementInput('DO')
+          .setCheck(null);
+      this.setInputsInline(true);
+      this.setPreviousStatement(false, null);
+      this.setNextStatement(true, null);
+      this.setColour('#FFDE59');
+      this.setHelpUrl('');
+      this.setTooltip('留空表示碰到任意角色');
+    }
+  };
+
   // 键盘组合键事件积木块
   Blockly.Blocks['event_keyboard_combo'] = {
     init: function () {
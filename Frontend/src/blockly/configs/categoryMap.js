@@ -31,6 +31,7 @@ export const BLOCK_CATEGORY_MAP = {
   'event_RB': '事件',
   'event_broadcast': '事件',
   'event_broadcastWait': '事件',
+  'event_contact': '事件',
   'control_wait': '控制',
   'control_for': '控制',
   'control_forX': '控制',
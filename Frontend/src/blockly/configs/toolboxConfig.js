@@ -55,6 +55,7 @@ export const TOOLBOX_CONFIG = {
         { kind: 'block', type: 'event_broadcast'},
         { kind: 'block', type: 'event_broadcastWait'},
         { kind: 'block', type: 'event_keyboard_combo'},
+        { kind: 'block', type: 'event_contact'},
         { kind: 'block', type: 'event_mouse_click'},
         { kind: 'block', type: 'event_mouse_move'},
         { kind: 'block', type: 'event_mouse_wheel'},
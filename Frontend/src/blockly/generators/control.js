@@ -3,7 +3,8 @@ import { pythonGenerator } from "blockly/python";
 export const defineControlGenerators = () => {
     pythonGenerator.forBlock['control_wait'] = function (block) {
         const x = block.getFieldValue('x');
-        return `CoronaEngine.wait(${x})\n`;
+        // 挂起当前脚本，由后端调度器在 x 秒后恢复，不阻塞帧循环
+        return `yield wait(${x})\n`;
     };
 
     pythonGenerator.forBlock['control_for'] = function (block) {
@@ -13,9 +14,8 @@ export const defineControlGenerators = () => {
                 pythonGenerator.STATEMENT_PREFIX.replace(/%1/g, '\'' + block.id + '\''),
                 pythonGenerator.INDENT) + branch;
         }
-        // Use branch as-is (already indented by Blockly). If empty, insert a pass.
-        if (!branch) branch = pythonGenerator.INDENT + 'pass\n';
-        return `while True:\n` + branch;
+        // Use branch as-is (already indented by Blockly). Each iteration yields back to the scheduler.
+        return `while True:\n` + branch + pythonGenerator.INDENT + 'yield\n';
     };
 
     // 定义重复执行 x 次积木块的 Python 代码生成器
@@ -51,15 +51,14 @@ export const defineControlGenerators = () => {
     // 定义等待直到条件满足积木块的 Python 代码生成器
     pythonGenerator.forBlock['control_wait2'] = function (block) {
         const condition = pythonGenerator.valueToCode(block, 'CONDITION', pythonGenerator.ORDER_NONE) || 'False';
-        return `while not (${condition}):\n` + pythonGenerator.INDENT + 'pass\n';
+        return `yield wait_until(lambda: ${condition})\n`;
     };
 
     // 定义重复执行直到积木块的 Python 代码生成器
     pythonGenerator.forBlock['control_until'] = function (block) {
         const condition = pythonGenerator.valueToCode(block, 'CONDITION', pythonGenerator.ORDER_NONE) || 'False';
         let branch = pythonGenerator.statementToCode(block, 'DO');
-        if (!branch) branch = pythonGenerator.INDENT + 'pass\n';
-        return `while not (${condition}):\n` + branch;
+        return `while not (${condition}):\n` + branch + pythonGenerator.INDENT + 'yield\n';
     };
 
     // 定义停止积木块的 Python 代码生成器
@@ -1,14 +1,18 @@
-import { pythonGenerator } from "blockly/python";
+import { pythonGenerator, Order } from "blockly/python";
+import { need } from "./prelude";
 
 export const defineDetectGenerators = () => {
+  // 碰撞/距离侦测：查询后端的空间索引（utils.spatial_index），每帧同一查询只算一次
   pythonGenerator.forBlock['detect_touch'] = function (block) {
-    const x = block.getFieldValue('x');
-    return `CoronaEngine.touch(${x})`;
+    need('spatial')
+    const x = block.getFieldValue('x') || '';
+    return [`touching(${pythonGenerator.quote_(x)})`, Order.FUNCTION_CALL];
   };
 
   pythonGenerator.forBlock['detect_distance'] = function (block) {
-    const x = block.getFieldValue('x');
-    return `CoronaEngine.distance(${x})\n`;
+    need('spatial')
+    const x = block.getFieldValue('x') || '';
+    return [`distance_to(${pythonGenerator.quote_(x)})`, Order.FUNCTION_CALL];
   };
 
   pythonGenerator.forBlock['detect_ask'] = function (block) {
@@ -16,22 +20,27 @@ export const defineDetectGenerators = () => {
     return `CoronaEngine.ask(${x})\n`;
   };
 
+  // 按键/鼠标侦测：查询后端每帧合并的输入状态表（utils.input_state）
   pythonGenerator.forBlock['detect_keyboard1'] = function (block) {
-    const x = block.getFieldValue('x');
-    return `CoronaEngine.keyboard(${x})`;
+    need('input')
+    const x = block.getFieldValue('x') || '';
+    return [`_input.key_down(${pythonGenerator.quote_(x)})`, Order.FUNCTION_CALL];
   };
 
   pythonGenerator.forBlock['detect_keyboard0'] = function (block) {
-    const x = block.getFieldValue('x');
-    return `CoronaEngine.keyboard0(${x})`;
+    need('input')
+    const x = block.getFieldValue('x') || '';
+    return [`_input.key_up(${pythonGenerator.quote_(x)})`, Order.FUNCTION_CALL];
   };
 
   pythonGenerator.forBlock['detect_mouse1'] = function (block) {
-    return `CoronaEngine.mouse1()`;
+    need('input')
+    return [`_input.mouse_down()`, Order.FUNCTION_CALL];
   };
 
   pythonGenerator.forBlock['detect_mouse0'] = function (block) {
-    return `CoronaEngine.mouse0()`;
+    need('input')
+    return [`_input.mouse_up()`, Order.FUNCTION_CALL];
   };
 
   pythonGenerator.forBlock['detect_attribute'] = function (block) {
@@ -1,4 +1,5 @@
 import { pythonGenerator } from 'blockly/python';
+import { need } from './prelude';
 
 export const defineEngineGenerators = () => {
     pythonGenerator.forBlock['engine_move'] = function(block) {
@@ -36,7 +37,9 @@ export const defineEngineGenerators = () => {
       const x1 = block.getFieldValue('x1');
       const x2 = block.getFieldValue('x2');
       const x3 = block.getFieldValue('x3');
-      return `CoronaEngine.movetoXYZtime(${t},${x1}, ${x2}, ${x3})\n`;
+      // 由后端动画轨道插值，脚本等待滑行结束
+      need('animation');
+      return `yield glide(${t}, ${x1}, ${x2}, ${x3})\n`;
     };
     
     pythonGenerator.forBlock['engine_Xset'] = function(block) {
@@ -81,6 +84,6 @@ export const defineEngineGenerators = () => {
     
     pythonGenerator.forBlock['engine_Z'] = function(block) {
       const x = block.getFieldValue('x');
-      return  `CoronaEngine.X(${x})\n`;
+      return  `CoronaEngine.Z(${x})\n`;
     };
 };
\ No newline at end of file
@@ -9,20 +9,43 @@ function indent(s) {
   return s.split('\n').map(l => (l ? '  ' + l : '')).join('\n') + (s ? '\n' : '')
 }
 
+// 按键事件积木 -> 模块级处理函数：@on_key('A') 在脚本加载时注册到后端按键表
+// 函数体 = DO 分支 + 串联在本块之后的语句，因此 index.js 以 thisOnly 方式调用本生成器
+function keyHandler(block, key) {
+  need('keyboard')
+  const name = pythonGenerator.nameDB_.getDistinctName('on_key_' + key, Blockly.Names.NameType.PROCEDURE)
+  let body = block.getInput('DO') ? pythonGenerator.statementToCode(block, 'DO') : ''
+  const next = block.getNextBlock()
+  if (next) {
+    const tail = pythonGenerator.blockToCode(next)
+    body += pythonGenerator.prefixLines(String((Array.isArray(tail) ? tail[0] : tail) || ''), pythonGenerator.INDENT)
+  }
+  if (!body.trim()) body = pythonGenerator.INDENT + 'pass\n'
+  return `@on_key(${pythonGenerator.quote_(key)})\ndef ${name}():\n` + body
+}
+
+// 碰撞事件积木 -> 模块级处理函数：@on_contact('begin', 'cube.obj') 在脚本加载时登记到后端碰撞系统
+// 处理函数参数 other 为另一个角色的名称；函数体的收集方式与按键事件相同
+function contactHandler(block, event, other) {
+  need('contact')
+  const name = pythonGenerator.nameDB_.getDistinctName('on_contact_' + event, Blockly.Names.NameType.PROCEDURE)
+  let body = pythonGenerator.statementToCode(block, 'DO')
+  const next = block.getNextBlock()
+  if (next) {
+    const tail = pythonGenerator.blockToCode(next)
+    body += pythonGenerator.prefixLines(String((Array.isArray(tail) ? tail[0] : tail) || ''), pythonGenerator.INDENT)
+  }
+  if (!body.trim()) body = pythonGenerator.INDENT + 'pass\n'
+  return `@on_contact(${pythonGenerator.quote_(event)}, ${pythonGenerator.quote_(other)})\ndef ${name}(other):\n` + body
+}
+
 export const defineEventGenerators = () => {
   pythonGenerator.forBlock['event_gameStart'] = function(block) {
     return `CoronaEngine.gameStart()\n`;
   };
   
   pythonGenerator.forBlock['event_keyboard'] = function(block) {
-    // 当使用键盘事件积木时，需要键盘前置片段
-    need('keyboard')
-    const key = block.getFieldValue('x') || ''
-    let branch = pythonGenerator.statementToCode(block, 'DO');
-    if (!branch) branch = pythonGenerator.INDENT + 'pass\n';
-    // 将该事件标记行输出到 handler 中（由 index.js 负责路由到 def handle）
-    // 后续串联的语句将自动附加在本块之后，属于 handler 函数体
-    return `if key == '${key}':\n` + indent(branch);
+    return keyHandler(block, block.getFieldValue('x') || '');
   };
   
   pythonGenerator.forBlock['event_RB'] = function(block) {
@@ -41,10 +64,11 @@ export const defineEventGenerators = () => {
   };
   
   pythonGenerator.forBlock['event_keyboard_combo'] = function(block) {
-    // 组合键事件：同样路由到 handler
-    need('keyboard')
-    var combo = block.getFieldValue('combo') || '';
-    return `# 组合键事件: ${combo}\n`;
+    return keyHandler(block, block.getFieldValue('combo') || '');
+  };
+
+  pythonGenerator.forBlock['event_contact'] = function(block) {
+    return contactHandler(block, block.getFieldValue('event') || 'begin', block.getFieldValue('x') || '');
   };
 
 // 鼠标点击事件
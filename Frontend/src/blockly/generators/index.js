@@ -51,14 +51,15 @@ pythonGenerator.workspaceToCode = function customWorkspaceToCode(workspace) {
     return aXY.y - bXY.y || aXY.x - bXY.x
   })
 
-  // 将按键相关的顶层积木输出到 handler，其余输出到 run
-  const KEYBOARD_BLOCK_TYPES = new Set(['event_keyboard', 'event_keyboard_combo'])
+  // 将按键/碰撞事件的顶层积木输出为模块级 @on_key/@on_contact 处理函数，其余输出到 update/run
+  const KEYBOARD_BLOCK_TYPES = new Set(['event_keyboard', 'event_keyboard_combo', 'event_contact'])
   let mainCode = ''
   let handlerCode = ''
 
   for (const block of topBlocks) {
     if (block.disabled) continue
-    let blockCode = pythonGenerator.blockToCode(block)
+    // 事件积木自行收集后续串联的语句作为函数体，这里只生成本块
+    let blockCode = pythonGenerator.blockToCode(block, KEYBOARD_BLOCK_TYPES.has(block.type))
     let chunk = normalizeCode(blockCode)
     if (chunk && !chunk.endsWith('\n')) chunk += '\n'
     if (KEYBOARD_BLOCK_TYPES.has(block.type)) {
@@ -82,31 +83,39 @@ pythonGenerator.workspaceToCode = function customWorkspaceToCode(workspace) {
     '    import CoronaEngine',
     'except ImportError:',
     '    from corona_engine_fallback import CoronaEngine',
+    'from utils.script_scheduler import wait, wait_until',
   ].join('\n')
 
   // 各位置前置片段（已去除尾部多余换行；此处不再额外添加空行）
-  const preludeGlobal = renderPreludeAt('global')   // 顶部（def run 之前）
-  const preludeRunPrologue = renderPreludeAt('runPrologue') // def run(): 后，函数体开头
-  const preludeRunEpilogue = renderPreludeAt('runEpilogue') // 函数体末尾
+  const preludeGlobal = renderPreludeAt('global')   // 顶部（函数定义之前）
+  const preludeInit = renderPreludeAt('init')       // def init(): 加载时执行一次
+  const preludeDispose = renderPreludeAt('dispose') // def dispose(): 热重载/角色删除时执行一次
+  const preludeRunPrologue = renderPreludeAt('runPrologue') // 主函数体开头（每帧）
+  const preludeRunEpilogue = renderPreludeAt('runEpilogue') // 主函数体末尾（每帧）
 
   // 组装输出（严格控制空行）
   const parts = []
   parts.push(header)
   if (preludeGlobal) parts.push(preludeGlobal.trimEnd())
 
-  // 如果有 handler 代码，则输出 def handle
+  // 事件处理函数（模块级，加载脚本时由 @on_key/@on_contact 登记）
   if (handlerCode.trim()) {
     parts.push('') // 空行分隔
-    parts.push('@pyqtSlot(str)\n' +
-        'def handle(key):' +
-              '\n    print("key:", key)')
-    const indentedHandlers = indentBlock(handlerCode)
-    if (indentedHandlers) parts.push(indentedHandlers)
+    parts.push(handlerCode.replace(/\n+$/, ''))
   }
 
-  // 输出 def run
+  // 生命周期：init() 加载时执行一次
+  const indentedInit = indentBlock(preludeInit)
+  if (indentedInit) {
+    parts.push('')
+    parts.push('def init():')
+    parts.push(indentedInit)
+  }
+
+  // 主体：包含 yield（循环/等待）时输出 def run() 作为调度任务，否则输出每帧调用的 def update(dt)
+  const isTask = /\byield\b/.test(mainCode)
   parts.push('')
-  parts.push('def run():')
+  parts.push(isTask ? 'def run():' : 'def update(dt):')
   const runBody = []
   const indentedPrologue = indentBlock(preludeRunPrologue)
   if (indentedPrologue) runBody.push(indentedPrologue)
@@ -121,6 +130,14 @@ pythonGenerator.workspaceToCode = function customWorkspaceToCode(workspace) {
     parts.push('    pass')
   }
 
+  // 生命周期：dispose() 热重载或角色删除时执行一次
+  const indentedDispose = indentBlock(preludeDispose)
+  if (indentedDispose) {
+    parts.push('')
+    parts.push('def dispose():')
+    parts.push(indentedDispose)
+  }
+
   // 末尾统一加一个换行
   return parts.join('\n') + '\n'
 }
@@ -1,7 +1,7 @@
 // 生成器前置代码（Prelude）注册表（支持多插入点）
 // 用法：
 // - 在某个积木的生成器中：import { need } from './prelude'; need('keyboard')
-// - 生成流程中：resetPrelude()；然后在不同位置 renderPreludeAt('global'|'runPrologue'|'runEpilogue')
+// - 生成流程中：resetPrelude()；然后在不同位置 renderPreludeAt('global'|'init'|'dispose'|'runPrologue'|'runEpilogue')
 
 // 已请求的前置段集合
 const _required = new Set()
@@ -9,36 +9,25 @@ const _required = new Set()
 // 预设的前置片段清单（可按需扩展/修改）
 // 每个键支持：
 // - 字符串：仅用于 global 位置；
-// - 或对象：{ global?: string, runPrologue?: string, runEpilogue?: string }
+// - 或对象：{ global?: string, init?: string, dispose?: string, runPrologue?: string, runEpilogue?: string }
+//   init/dispose 分别在脚本加载时、热重载或角色删除时由后端调用一次；runPrologue/runEpilogue 每帧执行
 const PRELUDE_SNIPPETS = {
   // 键盘事件支持：当使用键盘事件积木时加入
-  keyboard: {
-    global: [
-      '# 键盘/事件桥接初始化',
-      'from PyQt6.QtCore import pyqtSlot',
-      'from utils.bridge import get_bridge',
-    ].join('\n'),
-    runPrologue: [
-      '# 连接前端事件到后端处理函数',
-      'bridge = get_bridge()',
-      'try:',
-      '    # 如果之前已连接过旧的 handle，则先断开旧的，再连接新的，确保仅保留一次有效连接',
-      '    prev = getattr(bridge, "_blockly_handle_slot", None)',
-      '    if prev is not None:',
-      '        try:',
-      '            bridge.key_event.disconnect(prev)',
-      '        except Exception:',
-      '            pass',
-      '    bridge.key_event.connect(handle)',
-      '    bridge._blockly_handle_slot = handle',
-      'except Exception:',
-      '    # 某些环境下可能尚未初始化 UI 桥接，忽略连接错误',
-      '    pass',
-    ].join('\n'),
-    runEpilogue: [
-      '# 键盘事件已就绪（如需，可在此处添加收尾逻辑）',
-    ].join('\n')
-  }
+  keyboard: [
+    '# 按键事件：@on_key 在加载时把处理函数登记到后端按键表，热重载/角色删除时自动注销',
+    'from utils.key_bindings import on_key',
+  ].join('\n'),
+  // 按键/鼠标侦测积木：每帧合并的输入状态表
+  input: [
+    'from utils.input_state import get_input_state',
+    '_input = get_input_state()',
+  ].join('\n'),
+  // 定时移动积木：后端动画轨道
+  animation: 'from utils.animation import glide',
+  // 碰撞/距离侦测积木：后端空间索引
+  spatial: 'from utils.spatial_index import touching, distance_to',
+  // 碰撞事件积木：后端碰撞系统
+  contact: 'from utils.contacts import on_contact',
 }
 
 // 标记需要某个前置片段
@@ -57,7 +46,7 @@ export function renderPrelude() {
 }
 
 // 渲染指定插入点的片段并返回文本（以单个换行结尾，或空串）
-export function renderPreludeAt(where /* 'global' | 'runPrologue' | 'runEpilogue' */) {
+export function renderPreludeAt(where /* 'global' | 'init' | 'dispose' | 'runPrologue' | 'runEpilogue' */) {
   const parts = []
   for (const name of _required) {
     const entry = PRELUDE_SNIPPETS[name]
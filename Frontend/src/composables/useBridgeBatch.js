@@ -0,0 +1,60 @@
+// 批量桥接调用：同一微任务内的多次操作合并为一次 pyBridge.apply_batch 调用
+// 用法：
+//   const { batchCall } = useBridgeBatch()
+//   batchCall('actor_operation', { Operation: 'Move', sceneName, actorName, x, y, z })
+//   batchCall('create_actor', { sceneName, path }).then(status => { if (!status.ok) ... })
+// 支持的 op 与后端 Bridge.BATCH_OPERATIONS 一致：
+//   actor_operation / actor_delete / camera_move / create_actor / create_scene / sun_direction
+
+// 模块级队列：同一页面内的所有组件共享，保证调用顺序
+let queue = []
+let scheduled = false
+
+function flush() {
+  scheduled = false
+  const items = queue
+  queue = []
+  if (!items.length) return
+  const bridge = window.pyBridge
+  if (!bridge || typeof bridge.apply_batch !== 'function') {
+    items.forEach(({ resolve }) => resolve({ ok: false, error: 'Python 桥接未连接' }))
+    return
+  }
+  const operations = items.map(({ op, payload }) => ({ ...payload, op }))
+  const settle = (results) => {
+    items.forEach(({ op, resolve }, index) => {
+      const status = results[index] || { ok: false, error: '批处理无返回结果' }
+      if (!status.ok) console.error(`批处理操作 ${op} 失败:`, status.error)
+      resolve(status)
+    })
+  }
+  // 结构化槽：对象数组直接过 QWebChannel，无需两端 JSON 编解码
+  if (typeof bridge.apply_batch_items === 'function') {
+    bridge.apply_batch_items(operations, (results) => settle(results || []))
+    return
+  }
+  bridge.apply_batch(JSON.stringify(operations), (reply) => {
+    let results = []
+    try {
+      results = JSON.parse(reply)
+    } catch (error) {
+      console.error('解析批处理结果失败:', error)
+    }
+    settle(results)
+  })
+}
+
+// 入队一个操作，返回 Promise<{ ok, error? }>
+export function batchCall(op, payload = {}) {
+  return new Promise((resolve) => {
+    queue.push({ op, payload, resolve })
+    if (!scheduled) {
+      scheduled = true
+      queueMicrotask(flush)
+    }
+  })
+}
+
+export function useBridgeBatch() {
+  return { batchCall, flush }
+}
@@ -0,0 +1,24 @@
+import { onMounted, onUnmounted } from 'vue';
+
+// 订阅本 Dock 的后端事件：后端 DockRouter 只把已订阅的事件类型推送到本页面
+// 用法：useDockEvents(['actorCreated', 'sceneLoaded'], (eventType, eventData) => { ... })
+export function useDockEvents(eventTypes, handler) {
+  const listener = (eventType, eventData) => {
+    if (eventTypes.includes(eventType)) handler(eventType, eventData);
+  };
+  let bridge = null;
+
+  onMounted(() => {
+    bridge = window.dockBridge;
+    if (!bridge) return;
+    eventTypes.forEach((eventType) => bridge.subscribe(eventType));
+    bridge.dock_event.connect(listener);
+  });
+
+  onUnmounted(() => {
+    if (!bridge) return;
+    bridge.dock_event.disconnect(listener);
+    eventTypes.forEach((eventType) => bridge.unsubscribe(eventType));
+    bridge = null;
+  });
+}
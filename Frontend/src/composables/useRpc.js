@@ -0,0 +1,80 @@
+// 请求/响应式桥接调用：每次调用带请求 id，后端只把结果回复给发起调用的页面
+// 用法：
+//   const { rpcCall } = useRpc()
+//   const result = await rpcCall('load_scene', { sceneName })            // 成功时为后端返回值
+//   const controller = new AbortController()
+//   rpcCall('ask_ai', { message }, { timeout: 120000, signal: controller.signal })
+//   controller.abort()                                                     // 取消：后端丢弃该请求
+//   rpcCall('import_model', { sceneName }, { timeout: 0 })                 // 0 表示不设超时（如文件对话框）
+// 后端方法在 Bridge.__init__ 中通过 rpc.register 登记
+
+const DEFAULT_TIMEOUT = 30000
+
+// 模块级：同一页面共享一个请求表
+const pending = new Map()
+let nextId = 1
+let connectedBridge = null
+
+function onReply(response) {
+  const entry = pending.get(response.id)
+  if (!entry) return
+  settle(response.id)
+  if (response.ok) {
+    entry.resolve(response.result)
+  } else {
+    entry.reject(new Error(response.error || 'RPC 调用失败'))
+  }
+}
+
+function settle(id) {
+  const entry = pending.get(id)
+  if (!entry) return
+  pending.delete(id)
+  clearTimeout(entry.timer)
+  if (entry.signal) entry.signal.removeEventListener('abort', entry.onAbort)
+}
+
+function connect(bridge) {
+  if (connectedBridge === bridge) return
+  if (connectedBridge) connectedBridge.rpc_reply.disconnect(onReply)
+  bridge.rpc_reply.connect(onReply)
+  connectedBridge = bridge
+}
+
+// 发起调用，返回 Promise；超时或取消时 reject，并通知后端取消；timeout 为 0 时只能被取消
+export function rpcCall(method, params = {}, { timeout = DEFAULT_TIMEOUT, signal } = {}) {
+  return new Promise((resolve, reject) => {
+    const bridge = window.dockBridge
+    if (!bridge || typeof bridge.rpc_call !== 'function') {
+      reject(new Error('Python 桥接未连接'))
+      return
+    }
+    if (signal?.aborted) {
+      reject(new Error('RPC 调用已取消'))
+      return
+    }
+    connect(bridge)
+    const id = nextId++
+    const cancel = (reason) => {
+      if (!pending.has(id)) return
+      settle(id)
+      bridge.rpc_cancel(id)
+      reject(new Error(reason))
+    }
+    const entry = {
+      resolve,
+      reject,
+      signal,
+      onAbort: () => cancel('RPC 调用已取消'),
+      // 前端计时比后端多留一点余量，正常情况下由后端先回复超时错误
+      timer: timeout > 0 ? setTimeout(() => cancel(`RPC ${method} 超时`), timeout + 1000) : null,
+    }
+    pending.set(id, entry)
+    if (signal) signal.addEventListener('abort', entry.onAbort)
+    bridge.rpc_call(id, method, params, timeout)
+  })
+}
+
+export function useRpc() {
+  return { rpcCall }
+}
@@ -10,6 +10,8 @@ if (typeof QWebChannel !== 'undefined' && typeof qt !== 'undefined') {
     new QWebChannel(qt.webChannelTransport, (channel) => {
         pyBridge = channel.objects.pybridge
         window.pyBridge = pyBridge
+        // Dock 页面专用：只推送本 Dock 订阅的事件（见 composables/useDockEvents.js）
+        window.dockBridge = channel.objects.dockbridge
     })
 }
 
@@ -38,6 +38,11 @@ const routes = [
       name: 'SetUp',
       component: () => import('../views/SetUp.vue')
     },
+    {
+      path: '/Profiler',
+      name: 'Profiler',
+      component: () => import('../views/Profiler.vue')
+    },
 ]
 
 const router = createRouter({
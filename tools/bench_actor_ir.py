@@ -0,0 +1,89 @@
+import contextlib
+import os
+import statistics
+import sys
+import time
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+BLOCKLY_CODE = '''# -*- coding: utf-8 -*-
+try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+from utils.script_scheduler import wait, wait_until
+
+def run():
+    while True:
+        for _ in range(30):
+            CoronaEngine.Xadd(0.1)
+            CoronaEngine.rotateY(2)
+            yield
+        CoronaEngine.movetoXYZtime(0.5, 0, 1, 0)
+        yield wait(0.25)
+        if CoronaEngine.touch("wall"):
+            CoronaEngine.Zadd(-1)
+        else:
+            CoronaEngine.Zadd(1)
+        yield
+'''
+
+
+def stub_engine():
+    engine = types.ModuleType('CoronaEngine')
+
+    def call(*args):
+        return False
+
+    for name in ('Xadd', 'Zadd', 'rotateY', 'movetoXYZtime', 'touch'):
+        setattr(engine, name, call)
+    return engine
+
+
+def measure(host, actors, frames):
+    for i in range(actors):
+        host.publish('bench', f'actor{i}', BLOCKLY_CODE)
+    for _, future in list(host._pending.values()):
+        future.result()
+    host.tick(1 / 60)
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        host.tick(1 / 60)
+        samples.append((time.perf_counter() - start) * 1e3)
+    host.compiler.shutdown()
+    samples.sort()
+    return statistics.fmean(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    sys.path.insert(0, BACKEND_DIR)
+    sys.modules['CoronaEngine'] = stub_engine()
+    from utils.actor_ir import ActorVM, compile_ir
+    from utils.script_compiler import ScriptCompiler
+    from utils.script_host import ScriptHost
+    from utils.script_scheduler import ScriptScheduler
+
+    program = compile_ir(BLOCKLY_CODE)
+    results = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for actors in (100, 1000, 5000):
+            python = measure(ScriptHost(scheduler=ScriptScheduler(budget=1.0), compiler=ScriptCompiler()),
+                             actors, frames)
+            ir = measure(ScriptHost(scheduler=ScriptScheduler(budget=1.0), compiler=ScriptCompiler(),
+                                    vm=ActorVM()), actors, frames)
+            results[actors] = (python, ir)
+
+    print(f"IR program ({len(program)} instructions):")
+    print(program.dump())
+    print(f"Tick time over {frames} frames (stub engine):")
+    print(f"{'actors':>7}{'python ms':>12}{'p99':>9}{'ir ms':>10}{'p99':>9}{'speedup':>9}")
+    for actors, ((python, python_p99), (ir, ir_p99)) in results.items():
+        print(f"{actors:>7}{python:12.3f}{python_p99:9.3f}{ir:10.3f}{ir_p99:9.3f}{python / ir:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import bisect
+import math
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+
+def make_tracks(count, keys=4):
+    tracks = []
+    for i in range(count):
+        times = [k * (1.0 + (i % 5) * 0.25) for k in range(keys)]
+        values = [[i + k, math.sin(i + k), k * 0.5] for k in range(keys)]
+        tracks.append((times, values, ('linear', 'easeInOut')[i % 2], ('once', 'repeat', 'pingpong')[i % 3]))
+    return tracks
+
+
+def per_track_python(tracks, now):
+    """One Python evaluation per track, as a per-actor tween loop would do it."""
+    out = []
+    for times, values, easing, loop in tracks:
+        duration = times[-1]
+        local = now
+        if loop == 'repeat':
+            local = now % duration
+        elif loop == 'pingpong':
+            local = now % (2 * duration)
+            if local > duration:
+                local = 2 * duration - local
+        local = min(max(local, 0.0), duration)
+        seg = min(max(bisect.bisect_right(times, local) - 1, 0), len(times) - 2)
+        u = (local - times[seg]) / (times[seg + 1] - times[seg])
+        if easing == 'easeInOut':
+            u = u * u * (3.0 - 2.0 * u)
+        a, b = values[seg], values[seg + 1]
+        out.append([a[j] + (b[j] - a[j]) * u for j in range(3)])
+    return out
+
+
+def main():
+    rounds = 15
+    sys.path.insert(0, BACKEND_DIR)
+    from utils.animation import Animator
+    from utils.scene_registry import SceneRegistry
+    from utils.transform_coalescer import TransformCoalescer
+    from utils.transform_store import TransformStore
+
+    print(f"Track evaluation per frame, best of {rounds}:")
+    for count in (100, 1000, 5000, 20000):
+        tracks = make_tracks(count)
+        scenes = SceneRegistry()
+        scenes.add_scene('scene1')
+        for i in range(count):
+            scenes.add_actor('scene1', 'cube.obj', object(), name=f'actor{i}')
+        transforms = TransformCoalescer(TransformStore(scenes))
+        animator = Animator(scenes, transforms)
+        for i, (times, values, easing, loop) in enumerate(tracks):
+            animator.add('actor', 'scene1', times, values, actor_name=f'actor{i}', easing=easing, loop=loop)
+        animator.time = 1.3
+
+        python_best = min(_timed(lambda: per_track_python(tracks, 1.3)) for _ in range(rounds))
+        evaluate_best = min(_timed(animator.evaluate) for _ in range(rounds))
+
+        def frame():
+            animator.flush()
+            transforms.store.dirty[:] = False
+            transforms.store.dirty_rows[:] = False
+        flush_best = min(_timed(frame) for _ in range(rounds))
+
+        reference = per_track_python(tracks, 1.3)
+        _, values, _ = animator.evaluate()
+        error = max(abs(values[i][j] - reference[i][j]) for i in range(count) for j in range(3))
+        assert error < 1e-9, error
+        print(f"  {count:>6} tracks   python loop {python_best * 1e3:7.3f} ms   numpy evaluate "
+              f"{evaluate_best * 1e3:7.3f} ms ({python_best / evaluate_best:5.1f}x)   "
+              f"evaluate + write into store {flush_best * 1e3:7.3f} ms")
+
+
+def _timed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
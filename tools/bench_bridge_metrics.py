@@ -0,0 +1,70 @@
+import contextlib
+import json
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rounds = 7
+    sys.path.insert(0, BACKEND_DIR)
+    from corona_engine_fallback import CoronaEngine
+    from utils.bridge_metrics import BridgeMetrics
+
+    CoronaEngine.Scene.setCamera = lambda *args: True  # the fallback prints; keep the engine call itself
+    scene = CoronaEngine.Scene()
+    payload = json.dumps({'sceneName': 'scene1', 'position': [1.0, 2.0, 3.0], 'forward': [0.0, 0.0, -1.0]})
+
+    def make(metrics):
+        # Stands in for bridge.py's module globals, which BridgeMetrics.install rebinds.
+        module = types.ModuleType('bridge')
+        module.CoronaEngine, module.json = CoronaEngine, json
+        if metrics:
+            metrics.install(vars(module), 'CoronaEngine', 'engine')
+            metrics.install(vars(module), 'json', 'json')
+
+        class Bridge:
+            def camera_move(self, data):
+                move = module.json.loads(data)
+                module.CoronaEngine.Scene.setCamera(scene, move['position'], move['forward'],
+                                                    [0.0, -1.0, 0.0], 45.0)
+
+        if metrics:
+            Bridge.camera_move = metrics.instrument(Bridge.camera_move)
+        return Bridge()
+
+    disabled = BridgeMetrics(enabled=False)
+    enabled = BridgeMetrics(enabled=True)
+    toggled = BridgeMetrics(enabled=True)
+    toggled_bridge = make(toggled)
+    toggled.enable(False)
+    variants = (('plain slot', make(None)), ('instrumented, disabled', make(disabled)),
+                ('enabled, then disabled', toggled_bridge), ('instrumented, enabled', make(enabled)))
+    results = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for label, bridge in variants:
+            call = bridge.camera_move
+            best = float('inf')
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(calls):
+                    call(payload)
+                best = min(best, time.perf_counter() - start)
+            results[label] = best / calls * 1e9
+
+    base = results['plain slot']
+    print(f"camera_move-shaped slot body (json.loads + setCamera), best of {rounds} x {calls}:")
+    for label, ns in results.items():
+        print(f"  {label:<24} {ns:7.0f} ns/call   overhead {ns - base:+6.0f} ns")
+    stats = enabled.snapshot()['slots']['camera_move']
+    print(f"  recorded: p50 {stats['p50_ms'] * 1000:.2f} us  p99 {stats['p99_ms'] * 1000:.2f} us  "
+          f"engine {stats['engine_ms']:.1f} ms  json {stats['json_ms']:.1f} ms  of {stats['total_ms']:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
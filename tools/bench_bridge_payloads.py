@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+# QWebChannel carries every call as a JSON envelope; this models both ends of the transport in
+# Python (json.dumps for the sender, json.loads for the receiver) around the slot body.
+ENVELOPE = {'type': 6, 'object': 'pybridge', 'method': 42, 'id': 7}
+
+
+def transport(args):
+    return json.loads(json.dumps({**ENVELOPE, 'args': args}))['args']
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rounds = 7
+    sys.path.insert(0, BACKEND_DIR)
+    from utils.scene_registry import SceneRegistry
+    from utils.transform_coalescer import TransformCoalescer
+    from utils.transform_store import TransformStore
+
+    scenes = SceneRegistry()
+    scenes.add_scene('scene1')
+    scenes.add_actor('scene1', '', object(), name='actor')
+    coalescer = TransformCoalescer(TransformStore(scenes))
+    operations = ('Move', 'Rotate', 'Scale')
+    payloads = [{'Operation': operations[i % 3], 'sceneName': 'scene1', 'actorName': 'actor',
+                 'x': i * 0.5, 'y': 1.25, 'z': -i * 0.25} for i in range(messages)]
+
+    def actor_operation(data):
+        # Bridge._actor_operation after validation: one coalescer write.
+        actor = scenes.require(data.get('sceneName'), data.get('actorName'))
+        coalescer.submit(actor.handle, data.get('Operation'),
+                         [float(data.get('x', 0.0)), float(data.get('y', 0.0)), float(data.get('z', 0.0))])
+
+    def string_path():
+        for payload in payloads:
+            (data,) = transport([json.dumps(payload)])  # JSON.stringify in JS, string argument
+            actor_operation(json.loads(data))
+
+    def structured_path():
+        for payload in payloads:
+            (data,) = transport([payload])  # QVariantMap argument
+            actor_operation(data)
+
+    def packed_path():
+        for payload in payloads:
+            (values,) = transport([['scene1', 'actor', operations.index(payload['Operation']),
+                                    payload['x'], payload['y'], payload['z']]])
+            coalescer.submit(scenes.require(values[0], values[1]).handle, operations[int(values[2])],
+                             [float(values[3]), float(values[4]), float(values[5])])
+
+    results = {}
+    for label, run in (('string (JSON in JSON)', string_path), ('structured (QVariantMap)', structured_path),
+                       ('packed (QVariantList)', packed_path)):
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            run()
+            coalescer.flush()
+            best = min(best, time.perf_counter() - start)
+        results[label] = messages / best
+
+    base = results['string (JSON in JSON)']
+    print(f"actor_operation messages/second through a modelled QWebChannel transport, best of {rounds}:")
+    for label, rate in results.items():
+        print(f"  {label:<26} {rate:12,.0f} msg/s   {rate / base:4.2f}x")
+
+
+if __name__ == '__main__':
+    main()
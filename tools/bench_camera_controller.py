@@ -0,0 +1,100 @@
+import contextlib
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+FPS = 60
+KEY_REPEAT_HZ = 30
+
+
+def navigation(seconds):
+    """Held keys per frame for a scripted navigation: forward, strafe+turn, then wheel zoom."""
+    frames = []
+    for frame in range(int(seconds * FPS)):
+        t = frame / FPS
+        if t < seconds / 3:
+            held, wheel = {'w'}, 0
+        elif t < 2 * seconds / 3:
+            held, wheel = {'d', 'e'}, 0
+        else:
+            held, wheel = set(), 1 if frame % 6 == 0 else 0
+        frames.append((held, wheel))
+    return frames
+
+
+def old_path(frames, scene):
+    """Previous MainPage: every key repeat and wheel notch sent a full camera state, applied immediately."""
+    from corona_engine_fallback import CoronaEngine
+
+    position, forward, up, fov = [0.0, 5.0, 10.0], [0.0, 1.5, 0.0], [0.0, -1.0, 0.0], 45.0
+    messages = payload_bytes = calls = 0
+    repeat_every = FPS // KEY_REPEAT_HZ
+    for frame, (held, wheel) in enumerate(frames):
+        events = len(held) if frame % repeat_every == 0 else 0
+        for _ in range(events + wheel):
+            position[1] += 0.2
+            args = ['scene1', *position, *forward, *up, fov]
+            payload_bytes += len(json.dumps(args))
+            messages += 1
+            CoronaEngine.Scene.setCamera(scene, position, forward, up, fov)
+            calls += 1
+    return messages, payload_bytes, calls
+
+
+def new_path(frames, scene):
+    from utils.camera_controller import CameraController
+    from utils.scene_registry import SceneRegistry
+
+    scenes = SceneRegistry()
+    scenes.add_scene('scene1', scene)
+    controller = CameraController(scenes)
+    keys = {'w': (0, 1, 0, 0), 'd': (1, 0, 0, 0), 'e': (0, 0, 0, 1)}
+    messages = payload_bytes = 0
+    previous = set()
+    start = time.perf_counter()
+    for held, wheel in frames:
+        if held != previous:
+            axes = [sum(keys[k][i] for k in held) for i in range(4)]
+            args = ['scene1', *axes]
+            payload_bytes += len(json.dumps(args))
+            messages += 1
+            controller.set_intent(*args)
+            previous = held
+        if wheel:
+            args = ['scene1', 2, 1]
+            payload_bytes += len(json.dumps(args))
+            messages += 1
+            controller.add_delta('scene1', 'zoom', 1)
+        controller.update(1.0 / FPS)
+        controller.flush()
+    elapsed = time.perf_counter() - start
+    return messages, payload_bytes, controller.engine_calls, elapsed / len(frames)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 6.0
+    rounds = 7
+    sys.path.insert(0, BACKEND_DIR)
+    from corona_engine_fallback import CoronaEngine
+
+    scene = CoronaEngine.Scene()
+    frames = navigation(seconds)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        old = old_path(frames, scene)
+        runs = [new_path(frames, scene) for _ in range(rounds)]
+    new = min(runs, key=lambda run: run[3])
+
+    print(f"{seconds:.0f} s of keyboard/wheel navigation at {FPS} fps ({len(frames)} frames), "
+          f"key repeat {KEY_REPEAT_HZ} Hz:")
+    print(f"  full camera state per event   {old[0]:5d} messages {old[1]:7d} bytes {old[2]:5d} setCamera")
+    print(f"  controller deltas             {new[0]:5d} messages {new[1]:7d} bytes {new[2]:5d} setCamera "
+          f"(<= 1 per frame)")
+    print(f"  controller update+flush       {new[3] * 1e6:6.2f} us/frame (best of {rounds})")
+
+
+if __name__ == '__main__':
+    main()
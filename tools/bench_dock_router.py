@@ -0,0 +1,79 @@
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+
+def broadcast_docks(count):
+    """Previous wiring: every RouteDockWidget got every dock_event and parsed it to find routename."""
+    handled = [0]
+
+    def make(name):
+        def dock_event(event_type, event_data):
+            data_obj = json.loads(event_data)
+            target = data_obj.get('routename')
+            if target is not None and target != name:
+                return
+            if event_type == 'drag':
+                handled[0] += 1 if 'deltaX' in data_obj else 0
+        return dock_event
+
+    return [make(f'dock{i}') for i in range(count)], handled
+
+
+def routed_docks(count):
+    from utils.dock_router import DockRouter
+
+    router = DockRouter()
+    handled = [0]
+    for i in range(count):
+        def dock_event(event_type, event_data, data_obj):
+            handled[0] += 1 if 'deltaX' in data_obj else 0
+        for event_type in ('drag', 'close', 'float', 'resize'):
+            router.subscribe(f'dock{i}', event_type, dock_event, parsed=True)
+    return router, handled
+
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rounds = 7
+    sys.path.insert(0, BACKEND_DIR)
+    results = []
+    for docks in (3, 10, 20):
+        messages = [json.dumps({'deltaX': i % 7, 'deltaY': 1, 'routename': f'dock{i % docks}'})
+                    for i in range(events)]
+        listeners, broadcast_handled = broadcast_docks(docks)
+        router, routed_handled = routed_docks(docks)
+
+        def broadcast():
+            for data in messages:
+                for listener in listeners:
+                    listener('drag', data)
+
+        def routed():
+            for data in messages:
+                router.publish('drag', data)
+
+        best = {}
+        for label, run in (('broadcast', broadcast), ('routed', routed)):
+            best[label] = min(_timed(run) for _ in range(rounds)) / events * 1e6
+        assert broadcast_handled[0] == routed_handled[0]
+        results.append((docks, best['broadcast'], best['routed'], router.parsed / router.published))
+
+    print(f"Targeted drag messages, best of {rounds} x {events}:")
+    for docks, broadcast, routed, parses in results:
+        print(f"  {docks:>3} docks   broadcast {broadcast:6.2f} us/msg ({docks} parses)   "
+              f"routed {routed:6.2f} us/msg ({parses:.0f} parse)   speedup {broadcast / routed:4.1f}x")
+
+
+def _timed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
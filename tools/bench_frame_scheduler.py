@@ -0,0 +1,91 @@
+import contextlib
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+BLOCKLY_CODE = '''# -*- coding: utf-8 -*-
+try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+
+scene = CoronaEngine.Scene()
+actor = CoronaEngine.Actor(scene, "bench.obj")
+
+def run():
+    actor.move([0.0, 1.0, 0.0])
+'''
+
+
+def busy_spin(host, seconds):
+    frame_times = []
+    cpu_start = time.process_time()
+    start = last = time.perf_counter()
+    while last - start < seconds:
+        host.tick()
+        now = time.perf_counter()
+        frame_times.append(now - last)
+        last = now
+    wall = last - start
+    return {
+        'frames': len(frame_times),
+        'fps': len(frame_times) / wall,
+        'jitter_ms': statistics.pstdev(frame_times) * 1000.0,
+        'cpu_percent': 100.0 * (time.process_time() - cpu_start) / wall,
+    }
+
+
+def paced(frame_scheduler, seconds):
+    deadline = time.perf_counter() + seconds
+
+    def stop_when_done():
+        if time.perf_counter() >= deadline:
+            frame_scheduler.stop()
+
+    frame_scheduler.add_frame_end(stop_when_done)
+    frame_scheduler.run_forever()
+    return frame_scheduler.stats()
+
+
+def report(name, stats):
+    print(f"{name:<12} frames {stats['frames']:>9}   fps {stats['fps']:10.1f}   "
+          f"jitter {stats['jitter_ms']:7.3f} ms   cpu {stats['cpu_percent']:5.1f} %")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    sys.path.insert(0, BACKEND_DIR)
+    from utils.frame_scheduler import FrameScheduler
+    from utils.script_host import ScriptHost
+    from utils.script_scheduler import ScriptScheduler
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        host = ScriptHost(scheduler=ScriptScheduler())
+        host.publish('bench', 'actor', BLOCKLY_CODE)
+        spin = busy_spin(host, seconds)
+
+        host = ScriptHost(scheduler=ScriptScheduler())
+        host.publish('bench', 'actor', BLOCKLY_CODE)
+        active = FrameScheduler()
+        active.has_active_scripts = host.has_active_scripts
+        active.add_update(host.tick)
+        active_stats = paced(active, seconds)
+
+        idle_host = ScriptHost(scheduler=ScriptScheduler())
+        idle = FrameScheduler(idle_after=0.0)
+        idle.has_active_scripts = idle_host.has_active_scripts
+        idle.add_update(idle_host.tick)
+        idle_stats = paced(idle, seconds)
+
+    print(f"Main loop over {seconds:.1f}s (fallback engine):")
+    report('busy-spin', spin)
+    report('paced', active_stats)
+    report('paced idle', idle_stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import contextlib
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+
+def frame_events(moves):
+    """One frame of input as InputEventBridge sends it: a burst of mouse moves and a key press."""
+    events = [json.dumps({'kind': 'mouse', 'type': 'mousemove', 'buttons': 0, 'clientX': i, 'clientY': i,
+                          'movementX': 1, 'movementY': 1, 'dragging': False, 'altKey': False,
+                          'ctrlKey': False, 'metaKey': False, 'shiftKey': False, 'sceneName': 'scene1'})
+              for i in range(moves)]
+    events.append(json.dumps({'kind': 'keyboard', 'type': 'keydown', 'key': 'w', 'code': 'KeyW',
+                              'repeat': False, 'altKey': False, 'ctrlKey': False, 'metaKey': False,
+                              'shiftKey': False, 'sceneName': 'scene1'}))
+    return events
+
+
+def legacy_frame(events, listeners):
+    # command_to_main fan-out: every listener parses every event; key_event probe parses it again.
+    for data in events:
+        for _ in range(listeners):
+            json.loads(data)
+        payload = json.loads(data.strip())
+        for k in ('key', 'code', 'combo', 'text', 'name', 'key_text'):
+            v = payload.get(k)
+            if isinstance(v, str) and v.strip():
+                break
+
+
+def state_frame(state, events):
+    for data in events:
+        state.feed(data)
+    state.begin_frame()
+
+
+def timed(func, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rounds = 11
+    sys.path.insert(0, BACKEND_DIR)
+    from utils.input_state import InputState
+
+    state = InputState()
+    results = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for moves in (1, 60):
+            events = frame_events(moves)
+            legacy = min(timed(lambda: legacy_frame(events, 1), frames) for _ in range(rounds))
+            folded = min(timed(lambda: state_frame(state, events), frames) for _ in range(rounds))
+            results.append((moves, legacy, folded))
+        queries = 1000
+        start = time.perf_counter()
+        for _ in range(queries):
+            state.key_down('W')
+            state.mouse_down()
+        query = (time.perf_counter() - start) / (2 * queries) * 1e9
+
+    print(f"Per-frame input cost, best of {rounds} x {frames} frames:")
+    for moves, legacy, folded in results:
+        print(f"  {moves:>3} mousemoves + 1 key   fan-out {legacy:8.2f} us   input state {folded:8.2f} us   "
+              f"speedup {legacy / folded:4.1f}x")
+    print(f"Query cost (key_down / mouse_down): {query:.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+import contextlib
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+KEYS = [chr(c) for c in range(ord('a'), ord('z') + 1)]
+
+
+def keyboard_event(kind, key, **modifiers):
+    payload = {'kind': 'keyboard', 'type': kind, 'key': key, 'code': f'Key{key.upper()}', 'repeat': False,
+               'altKey': False, 'ctrlKey': False, 'metaKey': False, 'shiftKey': False, 'sceneName': 'scene1'}
+    payload.update(modifiers)
+    return json.dumps(payload)
+
+
+def mouse_event(x, y):
+    return json.dumps({'kind': 'mouse', 'type': 'mousemove', 'x': x, 'y': y, 'button': 0, 'buttons': 0,
+                       'altKey': False, 'ctrlKey': False, 'metaKey': False, 'shiftKey': False,
+                       'sceneName': 'scene1'})
+
+
+def event_stream(count):
+    """Mostly mouse moves, with keydown/keyup pairs mixed in, as InputEventBridge sends them."""
+    events = []
+    for i in range(count):
+        if i % 10 == 0:
+            key = KEYS[(i // 10) % len(KEYS)]
+            events.append(keyboard_event('keydown' if i % 20 == 0 else 'keyup', key))
+        else:
+            events.append(mouse_event(i % 800, i % 600))
+    return events
+
+
+def legacy_extract(command_data):
+    # Previous Bridge._extract_key_text probe, reduced to the branches an input_event takes.
+    s = command_data.strip()
+    try:
+        payload = json.loads(s)
+    except Exception:
+        return s
+    if isinstance(payload, dict):
+        for k in ('key', 'code', 'combo', 'text', 'name', 'key_text'):
+            v = payload.get(k)
+            if isinstance(v, str) and v.strip():
+                return v.strip()
+        for container in ('event', 'data', 'payload', 'value', 'detail'):
+            sub = payload.get(container)
+            if isinstance(sub, dict):
+                return None
+    return None
+
+
+def make_legacy(scripts, hits):
+    from utils.script_scheduler import get_script_scheduler
+
+    # Each script used to generate ``def handle(key)`` with an ``if key == 'x':`` chain and spawn it
+    # on every key event, pressed or released.
+    chain = '\n'.join(f"    if key == '{key}':\n        hits[0] += 1" for key in KEYS[:8])
+    handlers = []
+    for _ in range(scripts):
+        namespace = {'hits': hits}
+        exec(f"def handle(key):\n{chain}\n", namespace)
+        handlers.append(namespace['handle'])
+    scheduler = get_script_scheduler()
+
+    def send(command_data):
+        key_text = legacy_extract(command_data)
+        if key_text:
+            for handle in handlers:
+                scheduler.spawn(handle, key_text, owner='bench')
+
+    return send
+
+
+def make_registry(scripts, hits):
+    from utils.key_bindings import KeyBindings
+
+    bindings = KeyBindings()
+    for i in range(scripts):
+        for key in KEYS[:8]:
+            def handler():
+                hits[0] += 1
+            bindings.bind(key.upper(), handler, owner=f'script{i}')
+
+    def send(command_data):
+        # Bridge.send_message_to_main / _dispatch_key_binding
+        if not bindings.active or '"keydown"' not in command_data:
+            return
+        payload = json.loads(command_data)
+        if payload.get('kind') == 'keyboard' and payload.get('type') == 'keydown':
+            bindings.dispatch_key(payload['key'], ctrl=payload.get('ctrlKey'), alt=payload.get('altKey'),
+                                  shift=payload.get('shiftKey'), meta=payload.get('metaKey'))
+
+    return send, bindings
+
+
+def per_event(send, events):
+    start = time.perf_counter()
+    for data in events:
+        send(data)
+    return (time.perf_counter() - start) / len(events) * 1e9
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rounds = 11
+    sys.path.insert(0, BACKEND_DIR)
+    from utils.script_scheduler import get_script_scheduler
+
+    events = event_stream(count)
+    scheduler = get_script_scheduler()
+    results = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for scripts in (1, 20):
+            legacy_hits, registry_hits = [0], [0]
+            legacy = make_legacy(scripts, legacy_hits)
+            registry, bindings = make_registry(scripts, registry_hits)
+            best = {'legacy': float('inf'), 'registry': float('inf')}
+            for _ in range(rounds):
+                best['legacy'] = min(best['legacy'], per_event(legacy, events))
+                scheduler.step(0.0, budget=10.0)
+                best['registry'] = min(best['registry'], per_event(registry, events))
+            assert registry_hits[0] and legacy_hits[0] >= registry_hits[0], (legacy_hits, registry_hits)
+            bindings.clear()
+            idle = min(per_event(registry, events) for _ in range(rounds))
+            results.append((scripts, best['legacy'], best['registry'], idle))
+
+    print(f"Per input_event cost over {count} events (90% mousemove), best of {rounds}:")
+    for scripts, legacy, registry, idle in results:
+        print(f"  {scripts:>3} scripts x 8 keys   legacy {legacy:8.1f} ns   registry {registry:8.1f} ns   "
+              f"speedup {legacy / registry:5.1f}x   no bindings {idle:6.1f} ns")
+
+
+if __name__ == '__main__':
+    main()
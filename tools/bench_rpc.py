@@ -0,0 +1,110 @@
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rounds = 5
+    pages = 8
+    sys.path.insert(0, BACKEND_DIR)
+    from utils.dock_router import DockRouter
+    from utils.rpc import RpcServer
+
+    # GUI-thread calls: correlated reply to the calling page vs. publishing the result to every page
+    def echo(params, token):
+        return {'name': params['name'], 'path': params['path']}
+
+    server = RpcServer()
+    server.register('import_model', echo)
+    received = [0] * pages
+    owners = [object() for _ in range(pages)]
+    replies = [lambda request_id, response, i=i: received.__setitem__(i, received[i] + 1) for i in range(pages)]
+    params = {'name': 'cube.obj', 'path': '/models/cube.obj'}
+
+    rpc_best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for n in range(calls):
+            page = n % pages
+            server.call(owners[page], n, 'import_model', params, replies[page])
+        rpc_best = min(rpc_best, time.perf_counter() - start)
+    assert not len(server) and sum(received) == rounds * calls
+
+    router = DockRouter()
+    delivered = [0]
+
+    def handler(event_type, event_data, payload):
+        json.loads(event_data)  # every page parses the event to find out whether it was the one that asked
+        delivered[0] += 1
+
+    for i in range(pages):
+        router.subscribe(f'page{i}', 'actorCreated', handler)
+    broadcast_best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for n in range(calls):
+            router.publish('actorCreated', json.dumps(echo(params, None)))
+        broadcast_best = min(broadcast_best, time.perf_counter() - start)
+
+    print(f"GUI-thread calls answered to {pages} open pages, best of {rounds} x {calls}:")
+    print(f"  rpc reply to caller      {calls / rpc_best:>10,.0f} calls/s   1 delivery per call")
+    print(f"  broadcast dock event     {calls / broadcast_best:>10,.0f} calls/s   {pages} deliveries per call")
+
+    # Threaded calls with random latency: replies arrive out of order, each matched to its request
+    threaded = RpcServer(max_workers=8)
+
+    def slow(params, token):
+        time.sleep(params['delay'])
+        return params['index']
+
+    threaded.register('slow', slow, threaded=True)
+    results = {}
+    order = []
+
+    def reply(request_id, response):
+        results[request_id] = response
+        order.append(request_id)
+
+    count = 400
+    rng = random.Random(7)
+    start = time.perf_counter()
+    for i in range(count):
+        # every tenth call gets a deadline it cannot meet
+        timeout = 0.005 if i % 10 == 0 else None
+        threaded.call('page', i, 'slow', {'delay': rng.uniform(0.0, 0.02), 'index': i}, reply, timeout)
+    for i in range(5, count, 50):
+        threaded.cancel('page', i)
+    while len(threaded):
+        threaded.pump()
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    threaded.shutdown()
+
+    matched = sum(1 for request_id, response in results.items() if response['ok'] and response['result'] == request_id)
+    stats = threaded.stats()
+    inversions = sum(1 for a, b in zip(order, order[1:]) if b < a)
+    print(f"\n{count} threaded calls, 0-20 ms each on 8 workers, {elapsed * 1e3:.0f} ms wall clock:")
+    print(f"  completed {stats['completed']}  timed out {stats['timeouts']}  cancelled {stats['cancelled']}  "
+          f"replies {len(results)}  matched by id {matched}")
+    print(f"  replies delivered out of request order: {inversions}")
+    assert matched == stats['completed'] and len(results) == stats['completed'] + stats['timeouts']
+
+    # timeout 0 means no deadline: a call slower than the server default still completes (file dialogs)
+    patient = RpcServer(default_timeout=0.001)
+    patient.register('slow', slow, threaded=True)
+    patient.call('page', 1, 'slow', {'delay': 0.02, 'index': 1}, reply, 0)
+    while len(patient):
+        patient.pump()
+        time.sleep(0.001)
+    patient.shutdown()
+    assert results[1] == {'id': 1, 'ok': True, 'result': 1}, results[1]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import types
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+
+def stub_engine(calls):
+    engine = types.ModuleType('CoronaEngine')
+
+    class Actor:
+        @staticmethod
+        def move(actor, value):
+            calls[0] += 1
+
+        rotate = scale = move
+
+    engine.Actor = Actor
+    return engine
+
+
+def best(run, rounds):
+    result = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        result = min(result, time.perf_counter() - start)
+    return result
+
+
+def build(groups, parts):
+    """``groups`` vehicles, each a body with ``parts`` children; every fifth part has 4 children (bolts)."""
+    from utils.scene_hierarchy import SceneHierarchy
+    from utils.scene_registry import SceneRegistry
+    from utils.transform_store import TransformStore
+
+    scenes = SceneRegistry()
+    scenes.add_scene('scene1')
+    store = TransformStore(scenes)
+    hierarchy = SceneHierarchy(store)
+    store.hierarchy = hierarchy
+    bodies, members = [], []
+    for g in range(groups):
+        body = scenes.add_actor('scene1', '/assets/body.obj', object())
+        store.add(body.handle, position=[g * 10.0, 0.0, 0.0])
+        bodies.append(body.handle)
+        group = []
+        for p in range(parts):
+            part = scenes.add_actor('scene1', '/assets/part.obj', object())
+            store.add(part.handle, position=[g * 10.0 + p * 0.01, 1.0, 0.0], rotation=[0.0, 0.1 * p, 0.0])
+            hierarchy.attach(part.handle, body.handle)
+            group.append(part.handle)
+            if p % 5 == 0:
+                for b in range(4):
+                    bolt = scenes.add_actor('scene1', '/assets/bolt.obj', object())
+                    store.add(bolt.handle, position=[g * 10.0 + p * 0.01, 1.0, b * 0.1])
+                    hierarchy.attach(bolt.handle, part.handle)
+                    group.append(bolt.handle)
+        members.append(group)
+    store.flush()
+    return scenes, store, hierarchy, bodies, members
+
+
+def main():
+    rounds = 7
+    sys.path.insert(0, BACKEND_DIR)
+    calls = [0]
+    sys.modules['CoronaEngine'] = stub_engine(calls)
+    from utils.scene_hierarchy import _compose
+
+    print(f"Moving grouped actors, best of {rounds} (stub engine call counts only):")
+    for groups, parts in ((1, 500), (20, 500), (200, 50)):
+        scenes, store, hierarchy, bodies, members = build(groups, parts)
+        size = sum(len(group) for group in members)
+
+        def flat():
+            # Without links: one read-modify-write per member, as N separate actor_operation calls do.
+            for body, group in zip(bodies, members):
+                for handle in [body] + group:
+                    position = store.get(handle, 'Move')
+                    position[2] += 0.1
+                    store.set(handle, 'Move', position)
+            store.flush()
+
+        def linked():
+            store.translate([0.0, 0.0, 0.1], store.rows(bodies))
+            store.flush()
+
+        def turn():
+            store.rotate([0.0, 0.05, 0.0], store.rows(bodies))
+            store.flush()
+
+        def quiet():
+            store.flush()
+
+        depth = len(hierarchy._tree_levels())
+        calls[0] = 0
+        linked_time = best(linked, rounds)
+        linked_calls = calls[0] // rounds
+        turn_time = best(turn, rounds)
+        update_ops = []
+        for _ in range(3):
+            store.translate([0.0, 0.0, 0.1], store.rows(bodies))
+            start = time.perf_counter()
+            hierarchy.update()
+            update_ops.append(time.perf_counter() - start)
+            store.flush()
+        quiet_time = best(quiet, rounds)
+
+        probe = members[-1][-1]
+        world = hierarchy.world_matrix(probe)
+        row = store.row(probe)
+        assert np.allclose(world[:3, 3], hierarchy.world_position[row])
+        assert np.allclose(world, _compose(hierarchy.world_position[[row]], hierarchy.world_rotation[[row]],
+                                           hierarchy.world_scale[[row]])[0])
+
+        # Not linked: detach everything to time the flat version on the same rows.
+        for group in members:
+            for handle in group:
+                hierarchy.detach(handle)
+        store.flush()
+        calls[0] = 0
+        flat_time = best(flat, rounds)
+        flat_calls = calls[0] // rounds
+        print(f"  {groups:>3} groups x {size // groups} members ({size:,} children, {depth} levels):")
+        print(f"    move every member        {flat_time * 1e3:8.2f} ms   ({flat_calls:,} engine calls)")
+        print(f"    move the parents         {linked_time * 1e3:8.2f} ms   ({linked_calls:,} engine calls; "
+              f"subtree recompute {min(update_ops) * 1e3:.2f} ms)")
+        print(f"    turn the parents         {turn_time * 1e3:8.2f} ms")
+        print(f"    flush, nothing dirty     {quiet_time * 1e6:8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+MODELS = 200
+TAGS = ('static', 'dynamic', 'light', 'prop', 'enemy', 'pickup', 'trigger', 'ui')
+
+
+def build_nested(count, engine):
+    """The former layout: scene_dict[scene]['actor_dict'][name] = {'actor', 'path'} (no tags, no path index)."""
+    scene_dict = {'scene1': {'scene': None, 'actor_dict': {}}}
+    actor_dict = scene_dict['scene1']['actor_dict']
+    for i in range(count):
+        actor_dict[f'model{i % MODELS}_{i}.obj'] = {'actor': engine[i], 'path': f'/assets/model{i % MODELS}.obj'}
+    return scene_dict
+
+
+def build_registry(count, engine):
+    from utils.scene_registry import SceneRegistry
+
+    registry = SceneRegistry()
+    registry.add_scene('scene1')
+    for i in range(count):
+        # same model imported many times: the registry names the copies model7.obj, model7_2.obj, ...
+        registry.add_actor('scene1', f'/assets/model{i % MODELS}.obj', engine[i], tags=(TAGS[i % len(TAGS)],))
+    return registry
+
+
+def measured(build, count, engine):
+    gc.collect()
+    start = time.perf_counter()
+    build(count, engine)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = build(count, engine)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def best(run, rounds):
+    result = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        result = min(result, time.perf_counter() - start)
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rounds = 5
+    lookups = 200000
+    sys.path.insert(0, BACKEND_DIR)
+    engine = [object() for _ in range(count)]
+
+    nested, nested_bytes, nested_build = measured(build_nested, count, engine)
+    registry, registry_bytes, registry_build = measured(build_registry, count, engine)
+    print(f"{count:,} actors in one scene ({MODELS} distinct models, one tag each):")
+    print(f"  nested scene_dict     {nested_bytes / count:6.0f} B/actor   build {nested_build * 1e3:6.1f} ms")
+    print(f"  SceneRegistry         {registry_bytes / count:6.0f} B/actor   build {registry_build * 1e3:6.1f} ms   "
+          f"(handle table + name, path and tag indexes)")
+
+    rng = random.Random(3)
+    names = list(nested['scene1']['actor_dict'])
+    picks = [rng.randrange(count) for _ in range(lookups)]
+    nested_names = [names[i] for i in picks]
+    actors = registry.actors('scene1')
+    registry_names = [actors[i].name for i in picks]
+    handles = [actors[i].handle for i in picks]
+    resolve = registry.resolve
+    lookup = registry.actor
+
+    def nested_by_name():
+        for name in nested_names:
+            nested['scene1']['actor_dict'][name]['actor']
+
+    def registry_by_name():
+        for name in registry_names:
+            resolve('scene1', name).engine
+
+    def registry_by_handle():
+        for handle in handles:
+            lookup(handle).engine
+
+    print(f"\nPoint lookups, best of {rounds} x {lookups:,} (ns/lookup):")
+    for label, run in (('nested dict by name', nested_by_name), ('registry by name', registry_by_name),
+                       ('registry by handle', registry_by_handle)):
+        print(f"  {label:<22} {best(run, rounds) / lookups * 1e9:7.0f}")
+
+    path = '/assets/model7.obj'
+    queries = 200
+
+    def nested_by_path():
+        for _ in range(queries):
+            [info['actor'] for info in nested['scene1']['actor_dict'].values() if info['path'] == path]
+
+    def registry_by_path():
+        for _ in range(queries):
+            registry.find_by_path(path)
+
+    def registry_by_tag():
+        for _ in range(queries):
+            registry.find_by_tag('light')
+
+    matches = len(registry.find_by_path(path))
+    assert matches == len([1 for info in nested['scene1']['actor_dict'].values() if info['path'] == path])
+    print(f"\nSecondary queries, best of {rounds} x {queries} (us/query):")
+    print(f"  {'scan nested by path':<22} {best(nested_by_path, rounds) / queries * 1e6:9.1f}   ({matches} matches)")
+    print(f"  {'registry by path':<22} {best(registry_by_path, rounds) / queries * 1e6:9.1f}")
+    print(f"  {'registry by tag':<22} {best(registry_by_tag, rounds) / queries * 1e6:9.1f}   "
+          f"({len(registry.find_by_tag('light')):,} matches)")
+
+
+if __name__ == '__main__':
+    main()
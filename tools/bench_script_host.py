@@ -0,0 +1,124 @@
+import contextlib
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+BLOCKLY_CODE = '''# -*- coding: utf-8 -*-
+try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+
+scene = CoronaEngine.Scene()
+actor = CoronaEngine.Actor(scene, "bench.obj")
+
+def run():
+    actor.move([0.0, 1.0, 0.0])
+    actor.rotate([0.0, 0.1, 0.0])
+'''
+
+RUN_SCRIPT = '''import script.blockly_code
+
+def run():
+    script.blockly_code.run()
+'''
+
+
+def legacy_frame():
+    runscript_spec = importlib.util.find_spec("runScript")
+    if runscript_spec is not None:
+        runScript = importlib.util.module_from_spec(runscript_spec)
+        runscript_spec.loader.exec_module(runScript)
+        runScript.run()
+
+
+def measure(frame, frames):
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        frame()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        'mean': statistics.fmean(samples),
+        'p50': samples[len(samples) // 2],
+        'p99': samples[int(len(samples) * 0.99) - 1],
+    }
+
+
+def report(name, stats):
+    print(f"{name:<10} mean {stats['mean']:9.2f} us   p50 {stats['p50']:9.2f} us   p99 {stats['p99']:9.2f} us")
+
+
+def write(path, content):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def wait_compiled(host):
+    for _, future in list(host._pending.values()):
+        future.result()
+
+
+def reload_cost(host_cls, scheduler_cls, actors, repeats=50):
+    host = host_cls(scheduler=scheduler_cls())
+    for i in range(actors):
+        host.publish('bench', f'actor{i}', BLOCKLY_CODE)
+    wait_compiled(host)
+    host.tick(0.0)
+    steady, reload, unchanged = [], [], []
+    for i in range(repeats):
+        start = time.perf_counter()
+        host.tick(0.0)
+        steady.append((time.perf_counter() - start) * 1e6)
+        source = f'{BLOCKLY_CODE}# revision {actors}-{i}\n'
+        start = time.perf_counter()
+        host.publish('bench', 'actor0', source)
+        publish = time.perf_counter() - start
+        wait_compiled(host)
+        start = time.perf_counter()
+        host.tick(0.0)
+        reload.append((time.perf_counter() - start + publish) * 1e6)
+        start = time.perf_counter()
+        host.publish('bench', 'actor0', source)
+        unchanged.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(reload) - statistics.median(steady), statistics.median(unchanged)
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sys.path.insert(0, BACKEND_DIR)
+    from utils.script_host import ScriptHost
+    from utils.script_scheduler import ScriptScheduler
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.makedirs(os.path.join(work_dir, 'script'))
+        write(os.path.join(work_dir, 'script', 'blockly_code.py'), BLOCKLY_CODE)
+        write(os.path.join(work_dir, 'runScript.py'), RUN_SCRIPT)
+        sys.path.insert(0, work_dir)
+
+        host = ScriptHost(scheduler=ScriptScheduler())
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            legacy = measure(legacy_frame, frames)
+            host.publish('bench', 'actor', BLOCKLY_CODE)
+            wait_compiled(host)
+            cached = measure(host.tick, frames)
+            reloads = {n: reload_cost(ScriptHost, ScriptScheduler, n) for n in (1, 10, 100, 500)}
+
+    print(f"Frame time over {frames} frames (fallback engine):")
+    report('legacy', legacy)
+    report('ScriptHost', cached)
+    print(f"speedup    {legacy['mean'] / cached['mean']:.1f}x")
+    print("Republishing one actor's script (frame-thread cost over a steady frame; unchanged resubmit):")
+    for actors, (cost, unchanged) in reloads.items():
+        print(f"  {actors:>4} scripted actors: {cost:9.2f} us   unchanged {unchanged:7.2f} us")
+
+
+if __name__ == '__main__':
+    main()
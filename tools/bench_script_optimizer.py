@@ -0,0 +1,135 @@
+import ast
+import contextlib
+import inspect
+import os
+import statistics
+import sys
+import time
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+HEADER = '''# -*- coding: utf-8 -*-
+try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+from utils.script_scheduler import wait, wait_until
+'''
+
+# Shapes produced by Frontend/src/blockly/generators for common workspaces.
+CORPUS = {
+    'repeat': HEADER + '''
+def run():
+    while True:
+        for _ in range(20):
+            CoronaEngine.Xadd(1)
+        for _ in range(10):
+            CoronaEngine.rotateY(3)
+        yield
+''',
+    'transforms': HEADER + '''
+def update(dt):
+    CoronaEngine.Xadd(1)
+    CoronaEngine.Xadd(2)
+    CoronaEngine.Yadd(0.5)
+    CoronaEngine.Yadd(0.5)
+    CoronaEngine.Yadd(0.5)
+    CoronaEngine.sizeSet(100)
+    CoronaEngine.sizeSet(120)
+    CoronaEngine.move(10 * 2)
+    CoronaEngine.move(5)
+''',
+    'busy-wait': HEADER + '''
+def run():
+    while not (CoronaEngine.touch("goal")):
+        yield
+    CoronaEngine.show()
+''',
+    'lookups': HEADER + '''
+def run():
+    while True:
+        if CoronaEngine.keyboard("w"):
+            CoronaEngine.move(1)
+        if CoronaEngine.keyboard("s"):
+            CoronaEngine.move(-1)
+        if CoronaEngine.keyboard("a"):
+            CoronaEngine.rotateY(-5)
+        if CoronaEngine.keyboard("d"):
+            CoronaEngine.rotateY(5)
+        if 1 < 2 and CoronaEngine.mouse1():
+            CoronaEngine.Xset(0)
+        yield
+''',
+}
+
+
+def stub_engine(counter):
+    engine = types.ModuleType('CoronaEngine')
+
+    def call(*args):
+        counter[0] += 1
+        return False
+
+    for name in ('Xadd', 'Yadd', 'Xset', 'sizeSet', 'move', 'rotateY', 'touch', 'show', 'keyboard', 'mouse1'):
+        setattr(engine, name, call)
+    return engine
+
+
+def run_frames(source, optimizer, actors, frames):
+    from utils.script_compiler import ScriptCompiler
+    from utils.script_host import ScriptHost
+    from utils.script_scheduler import ScriptScheduler
+
+    counter = [0]
+    sys.modules['CoronaEngine'] = stub_engine(counter)
+    host = ScriptHost(scheduler=ScriptScheduler(budget=1.0), compiler=ScriptCompiler(optimizer=optimizer))
+    for i in range(actors):
+        host.publish('bench', f'actor{i}', source)
+    for _, future in list(host._pending.values()):
+        future.result()
+    host.tick(0.0)
+    counter[0] = 0
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        host.tick(1 / 60)
+        samples.append((time.perf_counter() - start) * 1e6)
+    host.compiler.shutdown()
+    return statistics.fmean(samples), counter[0] / frames
+
+
+def check_semantics(optimize_module):
+    """Rewrites the optimizer must not make: merging a non-engine receiver, dropping a dead yield."""
+    source = 'def update(dt):\n    actor.move([1, 0, 0])\n    actor.move([2, 0, 0])\n'
+    optimized = ast.unparse(optimize_module(ast.parse(source)))
+    assert optimized.count('actor.move(') == 2, optimized
+    namespace = {}
+    exec(compile(optimize_module(ast.parse('def run():\n    if False:\n        yield\n')), '<check>', 'exec'),
+         namespace)
+    assert inspect.isgeneratorfunction(namespace['run'])
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    actors = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    sys.path.insert(0, BACKEND_DIR)
+    from utils.script_optimizer import optimize_module
+
+    check_semantics(optimize_module)
+    results = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for name, source in CORPUS.items():
+            results[name] = (run_frames(source, None, actors, frames),
+                             run_frames(source, optimize_module, actors, frames))
+
+    print(f"Tick time with {actors} actors per script over {frames} frames (stub engine):")
+    print(f"{'script':<12}{'plain us':>12}{'optimized us':>14}{'speedup':>9}{'calls/frame':>22}")
+    for name, ((plain, plain_calls), (optimized, optimized_calls)) in results.items():
+        print(f"{name:<12}{plain:12.2f}{optimized:14.2f}{plain / optimized:8.1f}x"
+              f"{plain_calls:12.0f} -> {optimized_calls:<8.0f}")
+
+
+if __name__ == '__main__':
+    main()
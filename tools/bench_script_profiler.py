@@ -0,0 +1,96 @@
+import contextlib
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+UPDATE_CODE = '''try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+
+def update(dt):
+    CoronaEngine.Xadd(dt)
+    if CoronaEngine.keyboard("w"):
+        CoronaEngine.Yadd(1)
+'''
+
+TASK_CODE = '''try:
+    import CoronaEngine
+except ImportError:
+    from corona_engine_fallback import CoronaEngine
+
+def run():
+    while True:
+        CoronaEngine.rotateY(2)
+        yield
+'''
+
+
+def stub_engine():
+    engine = types.ModuleType('CoronaEngine')
+    exec(''.join(f'def {name}(*args):\n    return False\n' for name in ('Xadd', 'Yadd', 'rotateY', 'keyboard')),
+         engine.__dict__)
+    return engine
+
+
+def make_host(actors, profiler):
+    from utils.script_host import ScriptHost
+    from utils.script_scheduler import ScriptScheduler
+
+    host = ScriptHost(scheduler=ScriptScheduler(budget=1.0), profiler=profiler)
+    for i in range(actors):
+        host.publish('bench', f'actor{i}', UPDATE_CODE if i % 2 else TASK_CODE)
+    for _, future in list(host._pending.values()):
+        future.result()
+    host.tick(1 / 60)
+    return host
+
+
+def frame_time(host, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        host.tick(1 / 60)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    actors = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rounds = 21
+    sys.path.insert(0, BACKEND_DIR)
+    sys.modules['CoronaEngine'] = stub_engine()
+    from utils.script_profiler import ScriptProfiler
+
+    disabled = ScriptProfiler()
+    enabled = ScriptProfiler()
+    enabled.enable()
+    hosts = {
+        'no profiler': make_host(actors, None),
+        'disabled': make_host(actors, disabled),
+        'enabled': make_host(actors, enabled),
+    }
+    samples = {name: [] for name in hosts}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(rounds):
+            for name, host in (hosts.items() if i % 2 else reversed(hosts.items())):
+                samples[name].append(frame_time(host, frames))
+
+    baseline = min(samples['no profiler'])
+    print(f"Tick time with {actors} scripted actors, best of {rounds} x {frames} frames (stub engine):")
+    for name, values in samples.items():
+        best = min(values)
+        print(f"{name:<12} {best:9.2f} us   overhead {100.0 * (best - baseline) / baseline:+6.1f} %")
+    snapshot = enabled.snapshot(top=3)
+    print(f"enabled profiler: frame p50 {snapshot['frame_p50_ms']:.3f} ms, p99 {snapshot['frame_p99_ms']:.3f} ms")
+    for script in snapshot['scripts']:
+        print(f"  {script['name']:<48} p50 {script['p50_ms']:.4f} ms   p99 {script['p99_ms']:.4f} ms")
+    for call in snapshot['engine_calls']:
+        print(f"  {call['name']:<48} {call['calls']:>7} calls {call['total_ms']:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
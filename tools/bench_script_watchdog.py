@@ -0,0 +1,101 @@
+import contextlib
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+UPDATE_CODE = '''import CoronaEngine
+
+def update(dt):
+    CoronaEngine.Xadd(dt)
+'''
+
+TASK_CODE = '''import CoronaEngine
+
+def run():
+    while True:
+        CoronaEngine.rotateY(2)
+        yield
+'''
+
+RUNAWAY_CODE = '''flag = False
+
+def update(dt):
+    while not (flag):
+        pass
+'''
+
+
+def stub_engine():
+    engine = types.ModuleType('CoronaEngine')
+    exec('def Xadd(*args):\n    return False\ndef rotateY(*args):\n    return False\n', engine.__dict__)
+    return engine
+
+
+def make_host(actors, watchdog):
+    from utils.script_host import ScriptHost
+    from utils.script_scheduler import ScriptScheduler
+
+    host = ScriptHost(scheduler=ScriptScheduler(budget=1.0), watchdog=watchdog)
+    for i in range(actors):
+        host.publish('bench', f'actor{i}', UPDATE_CODE if i % 2 else TASK_CODE)
+    wait_compiled(host)
+    host.tick(1 / 60)
+    return host
+
+
+def wait_compiled(host):
+    for _, future in list(host._pending.values()):
+        future.result()
+
+
+def frame_time(host, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        host.tick(1 / 60)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rounds = 21
+    sys.path.insert(0, BACKEND_DIR)
+    sys.modules['CoronaEngine'] = stub_engine()
+    from utils.script_watchdog import ScriptWatchdog
+
+    watchdog = ScriptWatchdog(budget=0.1)
+    watchdog.start()
+    results = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for actors in (100, 500):
+            hosts = {'no watchdog': make_host(actors, None), 'watchdog': make_host(actors, watchdog)}
+            samples = {name: [] for name in hosts}
+            for i in range(rounds):
+                for name, host in (hosts.items() if i % 2 else reversed(hosts.items())):
+                    samples[name].append(frame_time(host, frames))
+            results[actors] = {name: min(values) for name, values in samples.items()}
+
+        host = make_host(10, watchdog)
+        host.publish('bench', 'runaway', RUNAWAY_CODE)
+        wait_compiled(host)
+        start = time.perf_counter()
+        host.tick(1 / 60)
+        recovered = time.perf_counter() - start
+        host.tick(1 / 60)
+    watchdog.stop()
+
+    print(f"Tick time for well-behaved scripts, best of {rounds} x {frames} frames (stub engine):")
+    for actors, times in results.items():
+        base, guarded = times['no watchdog'], times['watchdog']
+        print(f"  {actors:>4} actors   no watchdog {base:8.2f} us   watchdog {guarded:8.2f} us   "
+              f"overhead {100.0 * (guarded - base) / base:+5.1f} %")
+    print(f"Runaway 'while not (flag): pass' with a {watchdog.budget * 1000:.0f} ms budget: "
+          f"frame returned after {recovered * 1000:.1f} ms, {watchdog.timeouts} timeout(s), "
+          f"scripts still active: {host.has_active_scripts()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import contextlib
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BACKEND_DIR = os.path.join(ROOT, 'Backend')
+
+
+def stub_engine(calls):
+    engine = types.ModuleType('CoronaEngine')
+
+    class Actor:
+        @staticmethod
+        def move(actor, value):
+            calls[0] += 1
+            # Stand-in for the native call: a few microseconds of work.
+            sum(range(200))
+
+        rotate = scale = move
+
+    engine.Actor = Actor
+    return engine
+
+
+def drag_messages(actors, per_frame, offset=0.0):
+    """Slider drags: every frame each dragged actor receives ``per_frame`` Move/Rotate values."""
+    messages = []
+    for i in range(per_frame):
+        for a in range(actors):
+            messages.append((f'actor{a}', 'Move' if i % 2 else 'Rotate', [i * 0.1 + offset, 0.0, 0.0]))
+    return messages
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rounds = 7
+    sys.path.insert(0, BACKEND_DIR)
+    calls = [0]
+    sys.modules['CoronaEngine'] = stub_engine(calls)
+    from utils.scene_registry import SceneRegistry
+    from utils.transform_coalescer import TransformCoalescer
+    from utils.transform_store import CoronaEngine, TransformStore
+
+    results = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for actors, per_frame in ((1, 40), (10, 40)):
+            scenes = SceneRegistry()
+            scenes.add_scene('scene1')
+            handles = {f'actor{a}': scenes.add_actor('scene1', '', object(), name=f'actor{a}').handle
+                       for a in range(actors)}
+            # Two frames of messages, alternated so the slider keeps moving between frames.
+            frame_messages = [drag_messages(actors, per_frame, offset) for offset in (0.0, 0.05)]
+            messages = frame_messages[0]
+            coalescer = TransformCoalescer(TransformStore(scenes))
+            actor_api = CoronaEngine.Actor
+
+            def direct():
+                for name, channel, value in messages:
+                    actor = scenes.resolve('scene1', name).engine
+                    getattr(actor_api, {'Move': 'move', 'Rotate': 'rotate', 'Scale': 'scale'}[channel])(actor, value)
+
+            def coalesced():
+                frame_messages.reverse()
+                for name, channel, value in frame_messages[0]:
+                    coalescer.submit(handles[name], channel, value)
+                coalescer.flush()
+
+            timings = {}
+            engine_calls = {}
+            for label, frame in (('direct', direct), ('coalesced', coalesced)):
+                best = float('inf')
+                for _ in range(rounds):
+                    calls[0] = 0
+                    start = time.perf_counter()
+                    for _ in range(frames):
+                        frame()
+                    best = min(best, (time.perf_counter() - start) / frames * 1e6)
+                    engine_calls[label] = calls[0] / frames
+                timings[label] = best
+            results.append((actors, per_frame, timings, engine_calls, coalescer.stats()))
+
+    print(f"Slider drag, best of {rounds} x {frames} frames (stub engine call ~ few us):")
+    for actors, per_frame, timings, engine_calls, stats in results:
+        print(f"  {actors:>3} actors x {per_frame} msgs/frame   direct {timings['direct']:8.1f} us "
+              f"({engine_calls['direct']:.0f} calls)   coalesced {timings['coalesced']:8.1f} us "
+              f"({engine_calls['coalesced']:.0f} calls)   coalesced ops {stats['coalesced']}")
+
+
+if __name__ == '__main__':
+    main()